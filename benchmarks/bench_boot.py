@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+"""Boot time of RoomLoader with and without the world snapshot.
+
+Writes a synthetic world of room files laid out like lib/rooms (one
+load() per file, with description items and exits) and times
+load_all_rooms in a fresh interpreter for each case:
+
+    source     no snapshot, every file exec'd (compiled .pyc already cached)
+    first      no snapshot yet, load from source and write it
+    snapshot   everything unchanged, rooms come from the snapshot
+    one edit   a single room file changed since the snapshot was written
+    pool       no snapshot, files loaded across 'workers' processes
+    json       no snapshot, the same rooms in JSON area files of 100 rooms
+
+    python benchmarks/bench_boot.py [rooms] [workers]
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+ROOM_TEMPLATE = '''"""Synthetic room {n}"""
+
+from lib.models.entity import Room, Exit, DescriptionItem
+from lib.models.enums import ExitType
+
+def load():
+    return Room(
+        name='synthetic_{n}',
+        description="""A Featureless Corridor
+
+Grey walls run off in both directions. Scratched into the stone at
+about head height is the number {n}.""",
+        description_items=[
+            DescriptionItem(
+                name='walls',
+                aliases=['wall', 'grey walls', 'stone'],
+                description='Plain grey stone.'
+            ),
+            DescriptionItem(
+                name='number',
+                aliases=['scratches', 'scratch'],
+                description='Someone has scratched {n} into the wall.'
+            )
+        ],
+        exits=[
+            Exit(
+                name='east',
+                description='Further along the corridor.',
+                destination='synthetic_{next}',
+                exit_type=ExitType.PATH
+            ),
+            Exit(
+                name='west',
+                description='Back along the corridor.',
+                destination='synthetic_{previous}',
+                exit_type=ExitType.PATH
+            )
+        ]
+    )
+'''
+
+# rooms per JSON area file
+AREA_SIZE = 100
+
+# run in a fresh interpreter so every case pays for its own imports
+BOOT = '''
+import sys, time
+sys.path.insert(0, {root!r})
+from lib.room_loader import RoomLoader
+loader = RoomLoader({snapshot!r}, workers={workers})
+loader.room_dirs = [{world!r}]
+start = time.perf_counter()
+rooms = loader.load_all_rooms()
+print(time.perf_counter() - start, len(rooms))
+'''
+
+
+def write_world(directory, count):
+    for n in range(count):
+        with open(os.path.join(directory, f'room_{n}.py'), 'w') as f:
+            f.write(ROOM_TEMPLATE.format(n=n, next=(n + 1) % count,
+                                         previous=(n - 1) % count))
+
+
+def write_json_world(directory, count):
+    for first in range(0, count, AREA_SIZE):
+        rooms = []
+        for n in range(first, min(first + AREA_SIZE, count)):
+            rooms.append({
+                'name': f'synthetic_{n}',
+                'description': "A Featureless Corridor\n\nGrey walls run off in both "
+                               "directions. Scratched into the stone at\nabout head "
+                               f"height is the number {n}.",
+                'description_items': [
+                    {'name': 'walls', 'aliases': ['wall', 'grey walls', 'stone'],
+                     'description': 'Plain grey stone.'},
+                    {'name': 'number', 'aliases': ['scratches', 'scratch'],
+                     'description': f'Someone has scratched {n} into the wall.'},
+                ],
+                'exits': [
+                    {'name': 'east', 'description': 'Further along the corridor.',
+                     'destination': f'synthetic_{(n + 1) % count}', 'exit_type': 'PATH'},
+                    {'name': 'west', 'description': 'Back along the corridor.',
+                     'destination': f'synthetic_{(n - 1) % count}', 'exit_type': 'PATH'},
+                ],
+            })
+        with open(os.path.join(directory, f'area_{first // AREA_SIZE}.json'), 'w') as f:
+            json.dump({'rooms': rooms}, f, indent=4)
+
+
+def boot(world, snapshot, rounds=3, workers=0):
+    best = None
+    for _ in range(rounds):
+        output = subprocess.run(
+            [sys.executable, '-c', BOOT.format(root=ROOT, snapshot=snapshot, world=world,
+                                                 workers=workers)],
+            cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        seconds, rooms = output.split()
+        best = float(seconds) if best is None else min(best, float(seconds))
+    return best, int(rooms)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    temp = tempfile.mkdtemp(prefix='pkmud_boot_')
+    try:
+        world = os.path.join(temp, 'world')
+        os.mkdir(world)
+        snapshot = os.path.join(temp, 'world.snapshot')
+        write_world(world, count)
+
+        # the first exec of each file writes its .pyc, keep that out of
+        # the numbers
+        boot(world, None, rounds=1)
+
+        print(f"{count} room files")
+        source, rooms = boot(world, None)
+        print(f"  source    {source * 1000:8.1f} ms  ({rooms} rooms)")
+        first, _ = boot(world, snapshot, rounds=1)
+        print(f"  first     {first * 1000:8.1f} ms  (snapshot {os.path.getsize(snapshot) // 1024} KB)")
+        cached, _ = boot(world, snapshot)
+        print(f"  snapshot  {cached * 1000:8.1f} ms  {source / cached:5.1f}x")
+
+        with open(os.path.join(world, 'room_0.py'), 'a') as f:
+            f.write('\n# edited\n')
+        edited, _ = boot(world, snapshot, rounds=1)
+        print(f"  one edit  {edited * 1000:8.1f} ms")
+        pooled, _ = boot(world, None, workers=workers)
+        print(f"  pool      {pooled * 1000:8.1f} ms  {source / pooled:5.1f}x  ({workers} workers)")
+
+        json_world = os.path.join(temp, 'json_world')
+        os.mkdir(json_world)
+        write_json_world(json_world, count)
+        parsed, rooms = boot(json_world, None)
+        print(f"  json      {parsed * 1000:8.1f} ms  {source / parsed:5.1f}x  ({rooms} rooms)")
+    finally:
+        shutil.rmtree(temp)
+
+
+if __name__ == '__main__':
+    main()
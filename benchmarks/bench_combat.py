@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""Cost of one combat round.
+
+Sets up 'fights' pairs of players fighting each other, spread over the
+arena rooms a few pairs to a room with a few spectators in each, runs
+combat rounds and reports how long a round takes and how many messages
+it sends. Everyone has ANSI on, the spectators split between two colour
+schemes. A few more players watch from the observation room, half of
+them the whole war and half one fighter each, and each round is
+followed by a frame of the spectator feed. Nobody is allowed to die, so
+every round has the same fights in it.
+
+    python benchmarks/bench_combat.py [fights ...]
+"""
+
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.ansi import AnsiManager
+from lib.combat import CombatManager
+from lib.models.client import Client
+from lib.models.entity import Room
+from lib.models.game_state import GameState
+from lib.models.player import Player
+from lib.war_system import WarSystem
+
+# pairs of players fighting in each room, and players watching them
+PAIRS_PER_ROOM = 4
+SPECTATORS_PER_ROOM = 12
+# players watching from the observation room
+OBSERVERS = 20
+ROUNDS = 50
+
+
+class CountingServer(object):
+    """Counts what would have been sent instead of sending it."""
+
+    def __init__(self):
+        self.sends = 0
+
+    def send_message(self, client_id, message, priority=None):
+        self.sends += 1
+
+    def broadcast(self, client_ids, message, priority=None):
+        self.sends += len(client_ids)
+
+
+def make_game(fights):
+    server = CountingServer()
+    game = GameState(server)
+    game.war_system = WarSystem(game)
+    game.war_system.state = game.war_system.WarState.ACTIVE
+    combat = CombatManager(game)
+    
+    def add_player(name, location):
+        if location not in game.rooms:
+            game.rooms[location] = Room(location, "The arena.")
+        client = Client(None)
+        player = Player(name=name, client_id=client.uuid)
+        player.client, player.server = client, server
+        player.ansi_enabled = True
+        player.ansi_manager = AnsiManager(player)
+        player.is_ghost = False
+        player.wimpy_percent = 0
+        player._location = location
+        game.rooms[location].inventory.add_item(player)
+        game.add_player(player)
+        return player
+    
+    players = [add_player(f"Fighter{n}", f"arena_{n // (PAIRS_PER_ROOM * 2)}")
+               for n in range(fights * 2)]
+    for n in range(len(game.rooms) * SPECTATORS_PER_ROOM):
+        spectator = add_player(f"Spectator{n}", f"arena_{n // SPECTATORS_PER_ROOM}")
+        if n % 2:
+            spectator.ansi_manager.variables['melee'] = 'cyan'
+    for n in range(OBSERVERS):
+        observer = add_player(f"Observer{n}", 'observation_room')
+        game.war_system.spectators.subscribe(
+            observer, name=players[n % len(players)].name if n % 2 else None)
+    for attacker, target in zip(players[::2], players[1::2]):
+        combat.engage(attacker, target)
+    return game, combat, server, players
+
+
+def run(fights):
+    game, combat, server, players = make_game(fights)
+    feed = game.war_system.spectators
+    elapsed = 0.0
+    for _ in range(ROUNDS):
+        for player in players:
+            player.current_hp = player.max_hp = 10 ** 9
+        start = time.perf_counter()
+        combat.combat_round()
+        # a frame a round, rather than waiting for the scheduler
+        feed._frame_timer.cancel()
+        feed.send_frame()
+        elapsed += time.perf_counter() - start
+    combat._round_timer.cancel()
+    return elapsed * 1000 / ROUNDS, server.sends / ROUNDS
+
+
+def main():
+    logging.basicConfig(level=logging.ERROR)
+    counts = [int(arg) for arg in sys.argv[1:]] or [10, 100, 200]
+    print(f"{'fights':>8} {'ms/round':>10} {'sends/round':>12}")
+    for fights in counts:
+        ms, sends = run(fights)
+        print(f"{fights:8d} {ms:10.2f} {sends:12.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""Memory used per room and per item.
+
+Builds a world of 'count' rooms shaped like the arena (one description
+item, two exits) and 'count' items of the kinds a war leaves lying
+around (blood, heals, wands, weapons, armour and corpses), and reports
+what tracemalloc sees allocated for each. Items made from object
+templates are measured both built directly and made from their
+prototypes, along with how long each takes to make. Strings shared between
+instances, like the descriptions, are made once up front so only the
+per-instance cost is counted.
+
+    python benchmarks/bench_memory.py [count]
+"""
+
+import gc
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.models.entity import Room, Exit, DescriptionItem
+from lib.models.enums import ExitType
+from lib.models.objects import ArmorSlot, Armor, Blood, Heal, Wand, Weapon
+from lib.object_loader import ObjectLoader
+from lib.objects.special.corpse import Corpse
+
+DESCRIPTION = "The Arena\n\nYou are in the mystical arena. The walls shimmer."
+ALIASES = ['arena walls', 'energy', 'wall']
+NAMES = [f'room_{n}' for n in range(200000)]
+TEMPLATES = ['heal_50', 'wand_10', 'iron_sword', 'basic_helmet', 'torch']
+
+
+def make_rooms(count):
+    rooms = []
+    for n in range(count):
+        room = Room(
+            name=NAMES[n],
+            description=DESCRIPTION,
+            description_items=[
+                DescriptionItem(name='walls', aliases=ALIASES,
+                                description='The walls pulse with energy.')
+            ]
+        )
+        room.add_exit(Exit('east', 'East in the arena.', NAMES[n + 1], ExitType.PATH))
+        room.add_exit(Exit('west', 'West in the arena.', NAMES[n - 1], ExitType.PATH))
+        room.special_type = 'arena'
+        rooms.append(room)
+    return rooms
+
+
+def make_items(count):
+    kinds = [
+        lambda: Blood('Bob'),
+        lambda: Heal(50),
+        lambda: Wand(10),
+        lambda: Weapon('sword', 'A sword.', 10),
+        lambda: Armor('helmet', 'A helmet.', 2, ArmorSlot.HEAD),
+        lambda: Corpse('Bob', 5),
+    ]
+    return [kinds[n % len(kinds)]() for n in range(count)]
+
+
+def template_builders():
+    """Makers for the same template objects, by calling the template and
+    from the prototype.
+    """
+    loader = ObjectLoader()
+    templates = loader.load_all_objects()
+    
+    def direct(count):
+        return [templates[TEMPLATES[n % len(TEMPLATES)]]() for n in range(count)]
+    
+    def prototyped(count):
+        return [loader.create_object(TEMPLATES[n % len(TEMPLATES)]) for n in range(count)]
+    
+    return direct, prototyped
+
+
+def timed(build, count):
+    start = time.perf_counter()
+    build(count)
+    return (time.perf_counter() - start) * 1e6 / count
+
+
+def measure(build, count):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    things = build(count)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del things
+    return used / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    # warm up anything built lazily on first use
+    make_rooms(10)
+    make_items(10)
+    logging.basicConfig(level=logging.ERROR)
+    direct, prototyped = template_builders()
+
+    print(f"{count} rooms, {count} items")
+    print(f"  bytes per room  {measure(make_rooms, count):8.0f}")
+    print(f"  bytes per item  {measure(make_items, count):8.0f}")
+    print(f"template items ({', '.join(TEMPLATES)})")
+    print(f"  bytes per item, from the template   {measure(direct, count):8.0f}"
+          f"  {timed(direct, count):6.2f}us")
+    print(f"  bytes per item, from the prototype  {measure(prototyped, count):8.0f}"
+          f"  {timed(prototyped, count):6.2f}us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""Measure command round-trip latency against a running PKMUD.
+
+Opens a number of idle connections to simulate a populated server, then
+has a few probe connections press Enter at the "Name:" prompt over and
+over, timing how long the server takes to answer with the next prompt.
+
+    python pkwar.py --engine select &
+    python benchmarks/latency.py --port 2222 --idle 200 --samples 300
+"""
+
+import argparse
+import socket
+import statistics
+import time
+
+
+def connect(host, port):
+    sock = socket.create_connection((host, port))
+    sock.settimeout(5.0)
+    return sock
+
+
+def read_until(sock, needle):
+    data = b''
+    while needle not in data:
+        chunk = sock.recv(4096)
+        if not chunk:
+            raise ConnectionError("server closed the connection")
+        data += chunk
+    return data
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=2222)
+    parser.add_argument('--idle', type=int, default=100,
+                        help="idle connections held open during the run")
+    parser.add_argument('--probes', type=int, default=4)
+    parser.add_argument('--samples', type=int, default=200,
+                        help="round trips measured per probe")
+    args = parser.parse_args()
+
+    idle = [connect(args.host, args.port) for _ in range(args.idle)]
+    probes = [connect(args.host, args.port) for _ in range(args.probes)]
+    for sock in probes:
+        read_until(sock, b'Name: ')
+
+    # pace the probes out so they do not all land in the same tick
+    samples = []
+    for _ in range(args.samples):
+        for sock in probes:
+            start = time.perf_counter()
+            sock.sendall(b'\r\n')
+            read_until(sock, b'Name: ')
+            samples.append((time.perf_counter() - start) * 1000.0)
+
+    for sock in idle + probes:
+        sock.close()
+
+    print(f"{len(samples)} round trips with {args.idle} idle connections")
+    print(f"  p50  {percentile(samples, 50):7.2f} ms")
+    print(f"  p99  {percentile(samples, 99):7.2f} ms")
+    print(f"  mean {statistics.mean(samples):7.2f} ms")
+    print(f"  max  {max(samples):7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
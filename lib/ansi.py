@@ -1,5 +1,7 @@
 """ANSI color support for PKMUD"""
 
+from typing import Dict, Iterable, List, Optional
+
 class AnsiColors:
     """ANSI color codes and utilities."""
     
@@ -77,6 +79,32 @@ class AnsiColors:
         ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
         return ansi_escape.sub('', text)
 
+# colour settings -> a small number standing for them, so players with the
+# same settings can be told apart from the rest with one comparison
+_PROFILES: Dict[tuple, int] = {}
+
+
+def profile_of(player) -> Optional[int]:
+    """The colour profile 'player' sees messages in. Players with the same
+    profile see the same text for the same message. None for players who
+    get plain text.
+    """
+    manager = getattr(player, 'ansi_manager', None)
+    if manager is None or not player.ansi_enabled:
+        return None
+    return manager.profile
+
+
+def group_by_profile(players: Iterable) -> Dict[Optional[int], List]:
+    """'players' by the colour profile they see messages in, so a message
+    can be rendered once for each profile and sent to the whole group.
+    """
+    groups = {}
+    for player in players:
+        groups.setdefault(profile_of(player), []).append(player)
+    return groups
+
+
 class AnsiManager:
     """Manages ANSI settings for a player."""
     
@@ -86,6 +114,16 @@ class AnsiManager:
         self.full_line = False
         self.custom_colors = {}
         self.variables = AnsiColors.DEFAULT_VARS.copy()
+        # worked out when first needed, and again after any change
+        self._profile = None
+    
+    @property
+    def profile(self) -> int:
+        """The number standing for these settings, see profile_of."""
+        if self._profile is None:
+            settings = (self.enabled, self.full_line, tuple(sorted(self.variables.items())))
+            self._profile = _PROFILES.setdefault(settings, len(_PROFILES))
+        return self._profile
     
     # Color properties that movement commands expect
     @property
@@ -177,12 +215,14 @@ class AnsiManager:
         """Enable ANSI colors."""
         self.enabled = True
         self.full_line = full
+        self._profile = None
         self.player.ansi_enabled = True  # Update player setting
         self.player.message("ANSI colors enabled." + (" (full line mode)" if full else ""))
     
     def disable(self):
         """Disable ANSI colors."""
         self.enabled = False
+        self._profile = None
         self.player.ansi_enabled = False  # Update player setting
         self.player.message("ANSI colors disabled.")
     
@@ -190,6 +230,7 @@ class AnsiManager:
         """Set default color scheme."""
         self.variables = AnsiColors.DEFAULT_VARS.copy()
         self.custom_colors = {}
+        self._profile = None
         self.player.message("Default color scheme installed.")
     
     def wipe(self):
@@ -198,6 +239,7 @@ class AnsiManager:
         self.full_line = False
         self.custom_colors = {}
         self.variables = {}
+        self._profile = None
         self.player.ansi_enabled = False
         self.player.message("All ANSI settings wiped.")
     
@@ -205,6 +247,7 @@ class AnsiManager:
         """Set a specific variable's color."""
         if color in AnsiColors.COLORS:
             self.variables[var] = color
+            self._profile = None
             self.player.message(f"{var} color set to {color}")
             return True
         return False
@@ -113,16 +113,16 @@ class Authentication:
                     room.inventory.add_item(player)
                     
                     # Announce ghost return
-                    for uuid, item in room.inventory.get_items():
-                        if hasattr(item, 'is_player') and item.is_player and item != player:
+                    for item in room.inventory.get_players():
+                        if item != player:
                             item.message(f"{player.get_display_name()} shimmers back into existence.")
                 
                 # If alive (statue), they just animate
                 elif not player.is_ghost and player._location and player._location in self.game_state.rooms:
                     room = self.game_state.rooms[player._location]
                     # Announce statue coming back to life
-                    for uuid, item in room.inventory.get_items():
-                        if hasattr(item, 'is_player') and item.is_player and item != player:
+                    for item in room.inventory.get_players():
+                        if item != player:
                             item.message(f"The statue of {player.name} comes back to life!")
                 
                 # Remove from linkdead list
@@ -138,14 +138,14 @@ class Authentication:
                 return player
             else:
                 # Check if player is already connected
-                for existing_player in self.game_state.players.values():
-                    if existing_player.name.lower() == name.lower():
-                        # Player is already connected!
-                        self.pending_logins[client.uuid]['existing_player'] = existing_player
-                        self.pending_logins[client.uuid]['state'] = 'ASK_REPLACE'
-                        self.game_state.server.send_message(client.uuid,
-                            f"{name} is already connected. Replace connection? [Y/n]: ")
-                        return None
+                existing_player = self.game_state.find_player_by_name(name)
+                if existing_player:
+                    # Player is already connected!
+                    self.pending_logins[client.uuid]['existing_player'] = existing_player
+                    self.pending_logins[client.uuid]['state'] = 'ASK_REPLACE'
+                    self.game_state.server.send_message(client.uuid,
+                        f"{name} is already connected. Replace connection? [Y/n]: ")
+                    return None
                 
                 # Not currently connected, existing player - ask for password
                 self.pending_logins[client.uuid]['state'] = 'CHECK_PASSWORD'
@@ -413,12 +413,12 @@ class Authentication:
                 
             # Remove the old player from game state
             if existing_player.uuid in self.game_state.players:
-                del self.game_state.players[existing_player.uuid]
+                self.game_state.remove_player(existing_player)
                 
             # Remove from room if they're in one
             if existing_player._location and existing_player._location in self.game_state.rooms:
                 room = self.game_state.rooms[existing_player._location]
-                room.inventory.remove_item(existing_player.uuid)
+                room.inventory.remove_item(existing_player)
         
         # Create player object from saved data
         # Remove name and location from player_data since we're passing them separately
@@ -4,13 +4,19 @@ from typing import List, Dict, Optional
 from collections import deque
 import time
 
+from lib.ansi import group_by_profile
+from server.server_enums import MessagePriority
+
 class Channel:
     """Base class for communication channels."""
     
-    def __init__(self, name: str, description: str, color_var: str = None):
+    def __init__(self, name: str, description: str, color_var: str = None,
+                 priority: MessagePriority = MessagePriority.NORMAL):
         self.name = name
         self.description = description
         self.color_var = color_var or name
+        # chatter channels are LOW so they are dropped for lagging players
+        self.priority = priority
         self.history = deque(maxlen=100)  # Last 100 messages
         self.blocked_by = set()  # Players who have blocked this channel
     
@@ -175,9 +181,11 @@ class ChannelManager:
             'ghost': GhostChannel(),
             'wiz': WizChannel(),
             'team': TeamChannel(),
-            'gossip': Channel('gossip', 'General chat channel', 'gossip'),
+            'gossip': Channel('gossip', 'General chat channel', 'gossip',
+                              MessagePriority.LOW),
             'newbie': Channel('newbie', 'Help channel for new players', 'newbie'),
-            'ooc': Channel('ooc', 'Out of character chat', 'ooc')
+            'ooc': Channel('ooc', 'Out of character chat', 'ooc',
+                           MessagePriority.LOW)
         }
     
     def send_to_channel(self, channel_name: str, sender, message: str, target=None) -> bool:
@@ -222,24 +230,21 @@ class ChannelManager:
         else:
             listeners = channel.get_listeners(self.game_state)
         
-        # Send to all listeners
-        for player in listeners:
-            if player.ansi_enabled and hasattr(player, 'ansi_manager'):
-                msg = player.ansi_manager.format_channel(channel_name, sender.name, message)
-            else:
+        # Send to all listeners. Everyone with the same colour settings sees
+        # the same text, so each version is rendered and encoded once
+        for profile, players in group_by_profile(listeners).items():
+            if profile is None:
                 msg = formatted
-            player.message(msg)
+            else:
+                msg = players[0].ansi_manager.format_channel(channel_name, sender.name, message)
+            self.game_state.tell_players(players, msg, channel.priority)
         
         return True
     
     def _handle_tell(self, sender, target_name: str, message: str) -> bool:
         """Handle private tell messages."""
         # Find target player
-        target = None
-        for player in self.game_state.list_players():
-            if player.name.lower() == target_name.lower():
-                target = player
-                break
+        target = self.game_state.find_player_by_name(target_name)
         
         if not target:
             sender.message(f"Player '{target_name}' not found.")
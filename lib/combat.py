@@ -1,13 +1,22 @@
 """Combat system for PKMUD"""
 
 import random
-import time
 from typing import Optional, Tuple, List
+from lib.ansi import group_by_profile
 from lib.models.player import Player
 from lib.models.creature import Creature
 
 class CombatManager:
-    """Manages combat between creatures."""
+    """Manages combat between creatures.
+    
+    Fights run on a heartbeat, LPMud style. 'kill' engages the attacker
+    with their target (and the target with them, if they aren't fighting
+    anyone yet), and every combat round each engaged creature gets one
+    attack in. The whole round is resolved in one pass, with the messages
+    for each player gathered and sent once at the end of it. An
+    engagement ends when it can't go on - the target has left, died or the
+    war is over - and the rounds stop when no one is fighting.
+    """
     
     # Damage emotes from the requirements
     DAMAGE_EMOTES = [
@@ -28,9 +37,13 @@ class CombatManager:
         (390, float('inf'), "destroyed"),
     ]
     
+    # seconds between combat rounds
+    ROUND_INTERVAL = 2.0
+    
     def __init__(self, game_state):
         self.game_state = game_state
-        self.active_combats = {}  # attacker_id: (target, last_attack_time)
+        self.active_combats = {}  # attacker_id: (attacker, target)
+        self._round_timer = None
     
     def can_attack(self, attacker: Creature, target: Creature) -> Tuple[bool, str]:
         """Check if attacker can attack target."""
@@ -97,103 +110,181 @@ class CombatManager:
     
     def apply_damage(self, target: Creature, damage: int) -> bool:
         """Apply damage to target. Returns True if target dies."""
+        if self._hit(target, damage):
+            return True
+        
+        # Check wimpy
+        self._check_wimpy(target)
+        return False
+    
+    def _hit(self, target: Creature, damage: int) -> bool:
         target.current_hp -= damage
         
         if target.current_hp <= 0:
             target.current_hp = 0
             return True
-        
-        # Check wimpy
+        return False
+    
+    def _check_wimpy(self, target: Creature):
         if hasattr(target, 'check_wimpy') and target.check_wimpy():
             self.flee_combat(target)
-        
-        return False
     
     def attack(self, attacker: Player, target_name: str) -> Tuple[bool, str]:
-        """Execute an attack."""
+        """Start fighting someone. The blows come with the combat rounds."""
         # Find target
-        target = None
-        from pkwar import rooms
-        
-        for uuid, entity in rooms[attacker._location].inventory.get_items():
-            if hasattr(entity, 'name') and entity.name.lower() == target_name.lower():
-                if isinstance(entity, (Player, Creature)):
-                    target = entity
-                    break
+        rooms = self.game_state.rooms
+        target = rooms[attacker._location].inventory.find_living(target_name)
         
         if not target:
             return False, f"You don't see '{target_name}' here."
         
+        if target is attacker:
+            return False, "You can't attack yourself!"
+        
         # Check if can attack
         can_atk, reason = self.can_attack(attacker, target)
         if not can_atk:
             return False, reason
         
-        # Calculate damage
-        damage = self.calculate_damage(attacker, target)
-        
-        # Get emote
-        emote = self.get_damage_emote(damage)
+        # Typing kill again doesn't get anyone an extra blow
+        engaged = self.active_combats.get(attacker.id)
+        if engaged and engaged[1] is target:
+            return False, f"You are already fighting {target.name}!"
         
-        # Format messages
-        if "%s" in emote:
-            attacker_msg = f"You {emote % target.name}."
-            target_msg = f"{attacker.name} {emote % 'you'}."
-            room_msg = f"{attacker.name} {emote % target.name}."
-        else:
-            attacker_msg = f"You {emote} {target.name}."
-            target_msg = f"{attacker.name} {emote} you."
-            room_msg = f"{attacker.name} {emote} {target.name}."
+        self.engage(attacker, target)
         
-        # Apply ANSI colors if enabled
-        if attacker.ansi_enabled and hasattr(attacker, 'ansi_manager'):
-            attacker_msg = attacker.ansi_manager.format_combat(
-                "You", target.name, damage, emote
-            )
-        
-        if target.ansi_enabled and hasattr(target, 'ansi_manager'):
-            target_msg = target.ansi_manager.format_combat(
-                attacker.name, "you", damage, emote
-            )
-        
-        # Send messages
-        attacker.message(attacker_msg)
+        attacker.message(f"You attack {target.name}!")
         if hasattr(target, 'message'):
-            target.message(target_msg)
-        
-        # Room message
-        for uuid, entity in rooms[attacker._location].inventory.get_items():
-            if hasattr(entity, 'message') and entity != attacker and entity != target:
-                if entity.ansi_enabled and hasattr(entity, 'ansi_manager'):
-                    msg = entity.ansi_manager.format_combat(
-                        attacker.name, target.name, damage, emote
-                    )
-                else:
-                    msg = room_msg
-                entity.message(msg)
-        
-        # Send to war observers
-        if hasattr(self.game_state, 'war_system') and self.game_state.war_system.state == self.game_state.war_system.WarState.ACTIVE:
-            observer_msg = f"[{attacker._location}] {room_msg}"
-            for player in self.game_state.list_players():
-                if getattr(player, 'watching_war', False) and player._location == 'observation_room':
-                    player.message(observer_msg)
+            target.message(f"{attacker.name} attacks you!")
+        for entity in rooms[attacker._location].inventory.get_players():
+            if entity is not attacker and entity is not target:
+                entity.message(f"{attacker.name} attacks {target.name}!")
         
-        # Apply damage
-        killed = self.apply_damage(target, damage)
-        
-        # Handle death
-        if killed:
-            self.handle_death(attacker, target)
+        return True, ""
+    
+    def engage(self, attacker: Creature, target: Creature):
+        """Have 'attacker' fight 'target' from the next combat round on.
+        A target that isn't fighting anyone fights back.
+        """
+        self.active_combats[attacker.id] = (attacker, target)
+        if target.id not in self.active_combats:
+            self.active_combats[target.id] = (target, attacker)
+        
+        if self._round_timer is None:
+            self._round_timer = self.game_state.scheduler.schedule(
+                self.ROUND_INTERVAL, self.combat_round)
+    
+    def disengage(self, creature: Creature):
+        """Stop 'creature' fighting. Anyone fighting them stops at the next
+        round if they can't reach them any more.
+        """
+        self.active_combats.pop(creature.id, None)
+    
+    def combat_round(self):
+        """Resolve one round of every fight going on."""
+        # rescheduled first, so one bad round doesn't stop every fight
+        self._round_timer.reschedule(self.ROUND_INTERVAL)
+        
+        # room name -> the blows struck there this round
+        blows = {}
+        killed = []
+        hurt = {}
+        
+        for attacker_id, (attacker, target) in list(self.active_combats.items()):
+            # dead this round already, or gone since
+            if attacker.current_hp <= 0 or target.current_hp <= 0:
+                if target.current_hp <= 0:
+                    del self.active_combats[attacker_id]
+                continue
+            if not self.can_attack(attacker, target)[0]:
+                del self.active_combats[attacker_id]
+                continue
+            
+            damage = self.calculate_damage(attacker, target)
+            blows.setdefault(attacker._location, []).append(
+                (attacker, target, damage, self.get_damage_emote(damage)))
+            if self._hit(target, damage):
+                killed.append((attacker, target))
+            else:
+                hurt[target.id] = target
+        
+        self._send_round(blows)
+        
+        # deaths and fleeing move creatures and send messages of their own,
+        # so they wait until everyone has seen the blows that caused them.
+        # A death can end the war, and nothing after it counts
+        war = getattr(self.game_state, 'war_system', None)
+        for killer, victim in killed:
+            if war and not war.war_active:
+                break
+            self.active_combats.pop(victim.id, None)
+            self.handle_death(killer, victim)
+        if not war or war.war_active:
+            for target in hurt.values():
+                if target.current_hp > 0:
+                    self._check_wimpy(target)
+        
+        if not self.active_combats:
+            self._round_timer.cancel()
+            self._round_timer = None
+    
+    def _send_round(self, blows):
+        """Send everyone in a room with fighting in it the round's blows,
+        one message per player.
+        """
+        rooms = self.game_state.rooms
+        war = getattr(self.game_state, 'war_system', None)
+        spectators = war.spectators if war else None
+        
+        for location, room_blows in blows.items():
+            fighters = set()
+            for attacker, target, damage, emote in room_blows:
+                fighters.add(attacker.id)
+                fighters.add(target.id)
+            bystanders = []
+            for player in rooms[location].inventory.get_players():
+                if player.id in fighters:
+                    lines = [self._describe(blow, player) for blow in room_blows]
+                    player.message("\n".join(lines))
+                else:
+                    bystanders.append(player)
+            
+            # bystanders see the same round as everyone else with their
+            # colour settings, so it's rendered and encoded once for each
+            for profile, players in group_by_profile(bystanders).items():
+                lines = [self._describe(blow, players[0]) for blow in room_blows]
+                self.game_state.tell_players(players, "\n".join(lines))
+            
+            # the observation room gets them with the next frame of the feed
+            if spectators:
+                for blow in room_blows:
+                    spectators.post(location, f"[{location}] {self._describe(blow)}",
+                                    blow[0].name, blow[1].name)
+    
+    def _describe(self, blow, viewer=None) -> str:
+        """One blow as 'viewer' sees it, as a bystander without colour if
+        there is no viewer.
+        """
+        attacker, target, damage, emote = blow
+        if viewer is attacker:
+            attacker_name, target_name = "You", target.name
+        elif viewer is target:
+            attacker_name, target_name = attacker.name, "you"
+        else:
+            attacker_name, target_name = attacker.name, target.name
         
-        # Update combat tracking
-        self.active_combats[attacker.uuid] = (target, time.time())
+        # Apply ANSI colors if enabled
+        ansi_manager = getattr(viewer, 'ansi_manager', None)
+        if ansi_manager and viewer.ansi_enabled:
+            return ansi_manager.format_combat(attacker_name, target_name, damage, emote)
         
-        return True, ""
+        if "%s" in emote:
+            return f"{attacker_name} {emote % target_name}."
+        return f"{attacker_name} {emote} {target_name}."
     
     def handle_death(self, killer: Player, victim: Creature):
         """Handle creature death."""
-        from pkwar import rooms, game
+        game = self.game_state
         
         # Announce death
         death_msg = f"{killer.name} just killed {victim.name}!"
@@ -224,15 +315,17 @@ class CombatManager:
     
     def kamikaze_explosion(self, kamikaze: Creature):
         """Handle kamikaze death explosion."""
-        from pkwar import rooms, game
+        game = self.game_state
+        room = game.rooms[kamikaze._location]
         
         game.broadcast(f"{kamikaze.name} EXPLODES in a fiery blast!")
         
         # Damage everyone in room
         explosion_damage = 100
         
-        for uuid, entity in rooms[kamikaze._location].inventory.get_items():
-            if isinstance(entity, (Player, Creature)) and entity != kamikaze:
+        # dying moves players out of the room, so work from a copy
+        for entity in [*room.inventory.get_players(), *room.inventory.get_creatures()]:
+            if entity != kamikaze:
                 if not entity.is_ghost:
                     entity.message("The explosion tears through you!")
                     killed = self.apply_damage(entity, explosion_damage)
@@ -242,8 +335,8 @@ class CombatManager:
     
     def create_corpse(self, creature: Creature):
         """Create a corpse with creature's items."""
-        from pkwar import rooms
         from lib.objects.special.corpse import Corpse
+        rooms = self.game_state.rooms
         
         # Create corpse
         corpse = Corpse(creature.name, getattr(creature, 'level', 1))
@@ -253,18 +346,14 @@ class CombatManager:
             # Get all items including equipment
             all_items = []
             
-            # Add carried items
-            all_items.extend(creature.inventory.items)
+            # Add carried items, clearing creature's inventory
+            all_items.extend(creature.inventory.take_all())
             
             # Add equipped items
             for slot, item in creature.inventory.equipment.items():
                 if item:
                     all_items.append(item)
-            
-            # Clear creature's inventory
-            creature.inventory.items = []
             creature.inventory.equipment = {slot: None for slot in creature.inventory.equipment}
-            creature.inventory.current_weight = 0
             
             # Add items to corpse
             for item in all_items:
@@ -294,45 +383,33 @@ class CombatManager:
 
     def flee_combat(self, creature: Creature):
         """Make creature flee in random direction."""
-        from pkwar import rooms
-        
-        current_room = rooms[creature._location]
-        
-        # Get available exits
-        exits = [exit.name for exit in current_room.exits]
+        current_room = self.game_state.rooms[creature._location]
         
-        if not exits:
+        if not current_room.exits:
             creature.message("There's nowhere to flee!")
             return
         
         # Choose random exit
-        flee_dir = random.choice(exits)
+        exit_obj = random.choice(current_room.exits)
+        flee_dir = exit_obj.name
         
         # Announce fleeing
         creature.message(f"You flee {flee_dir} in panic!")
         
-        for uuid, entity in current_room.inventory.get_items():
-            if hasattr(entity, 'message') and entity != creature:
+        for entity in current_room.inventory.get_players():
+            if entity != creature:
                 entity.message(f"{creature.name} flees {flee_dir}!")
         
         # Move creature
-        exit_obj = current_room.get_exit(flee_dir)
         creature.move(exit_obj.destination)
         
         # Clear combat
-        if creature.uuid in self.active_combats:
-            del self.active_combats[creature.uuid]
+        self.disengage(creature)
     
     def get_combat_status(self, creature: Creature) -> Optional[str]:
         """Get current combat status for creature."""
-        if creature.uuid in self.active_combats:
-            target, last_time = self.active_combats[creature.uuid]
-            
-            # Combat expires after 10 seconds of no attacks
-            if time.time() - last_time > 10:
-                del self.active_combats[creature.uuid]
-                return None
-            
+        if creature.id in self.active_combats:
+            attacker, target = self.active_combats[creature.id]
             return f"Fighting: {target.name}"
         
         return None
\ No newline at end of file
@@ -8,7 +8,6 @@ from lib.shop_system import ShopInventory, GerkinNPC
 from lib.mail_system import MailSystem, MailComposer
 from lib.ansi import AnsiManager
 import time
-import threading
 import os
 import json
 
@@ -34,7 +33,7 @@ class Commands(object):
         self.game_state = game_state
         
         # Initialize managers that are used across multiple modules
-        self.soul_manager = SoulManager()
+        self.soul_manager = SoulManager(game_state)
         self.combat_manager = CombatManager(game_state)
         self.shop_inventory = ShopInventory(game_state)
         self.gerkin_npc = GerkinNPC()
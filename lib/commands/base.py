@@ -18,12 +18,8 @@ class BaseCommand:
         if not room:
             return []
         
-        players = []
-        for uuid, entity in room.inventory.get_items():
-            if hasattr(entity, 'is_player') and entity.is_player:
-                if include_self or entity != player:
-                    players.append(entity)
-        return players
+        return [p for p in room.inventory.get_players()
+                if include_self or p != player]
     
     def broadcast_to_room(self, player, message, include_self=False):
         """Send a message to all players in the room."""
@@ -31,8 +27,8 @@ class BaseCommand:
         if not room:
             return
             
-        for uuid, entity in room.inventory.get_items():
-            if hasattr(entity, 'message') and entity != player:
+        for entity in room.inventory.get_players():
+            if entity != player:
                 entity.message(message)
         
         if include_self:
@@ -40,10 +36,7 @@ class BaseCommand:
     
     def find_player_by_name(self, name):
         """Find an online player by name."""
-        for p in self.game_state.list_players():
-            if p.name.lower() == name.lower():
-                return p
-        return None
+        return self.game_state.find_player_by_name(name)
     
     def find_target_in_room(self, player, target_name):
         """Find a target player in the same room."""
@@ -51,9 +44,4 @@ class BaseCommand:
         if not room:
             return None
             
-        for uuid, entity in room.inventory.get_items():
-            if (hasattr(entity, 'name') and 
-                entity.name.lower() == target_name.lower() and
-                hasattr(entity, 'is_player') and entity.is_player):
-                return entity
-        return None
\ No newline at end of file
+        return room.inventory.find_player(target_name)
\ No newline at end of file
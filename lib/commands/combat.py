@@ -2,7 +2,6 @@
 
 from .base import BaseCommand
 import random
-import threading
 import time
 
 class CombatCommands(BaseCommand):
@@ -43,8 +42,8 @@ class CombatCommands(BaseCommand):
         player.current_hp = player.max_hp
         player.sp_current = player.sp_max
         
-        # Remove blood
-        player.inventory.remove_item(blood_item)
+        # Remove blood, one of a stack
+        player.inventory.take(blood_item)
         
         # Message with proper formatting
         if player.ansi_enabled and hasattr(player, 'ansi_manager'):
@@ -148,11 +147,9 @@ class CombatCommands(BaseCommand):
         target_name = params[5:].strip()
         
         # Find target
-        target = None
-        for p in self.game_state.list_players():
-            if p.name.lower() == target_name.lower() and not p.is_ghost:
-                target = p
-                break
+        target = self.game_state.find_player_by_name(target_name)
+        if target and target.is_ghost:
+            target = None
         
         if not target:
             player.message("That player is not alive in the war.")
@@ -200,13 +197,11 @@ class CombatCommands(BaseCommand):
                     msg = "Gerkin grows bored and stops helping you!"
                 player.message(msg)
         
-        timer = threading.Timer(30.0, stop_gerkin_help)
-        timer.start()
-        
         # Store timer to cancel if needed
         if player.client.uuid in self.gerkin_timers:
             self.gerkin_timers[player.client.uuid].cancel()
-        self.gerkin_timers[player.client.uuid] = timer
+        self.gerkin_timers[player.client.uuid] = \
+            self.game_state.scheduler.schedule(30.0, stop_gerkin_help)
     
     def gate(self, player, params=None):
         """gate <teammate> - Teleport to teammate (mage only)"""
@@ -225,13 +220,9 @@ class CombatCommands(BaseCommand):
             return
         
         # Find teammate
-        target = None
-        for p in self.game_state.list_players():
-            if (p.name.lower() == params.lower() and 
-                not p.is_ghost and 
-                p.team == player.team):
-                target = p
-                break
+        target = self.game_state.find_player_by_name(params)
+        if target and (target.is_ghost or target.team != player.team):
+            target = None
         
         if not target:
             player.message("That teammate is not alive in the war.")
@@ -293,6 +284,8 @@ class CombatCommands(BaseCommand):
         self.broadcast_to_room(player, 
             f"{player.name} blasts {target.name} with a fireball!")
         
-        # Handle death
+        # Handle death, or carry on the fight in the combat rounds
         if killed:
-            self.combat_manager.handle_death(player, target)
\ No newline at end of file
+            self.combat_manager.handle_death(player, target)
+        elif player.id not in self.combat_manager.active_combats:
+            self.combat_manager.engage(player, target)
\ No newline at end of file
@@ -62,7 +62,7 @@ class ExplorerCommands(BaseCommand):
                 if filename.endswith('.json'):
                     name = filename[:-5]  # Remove .json extension
                     # Skip online players
-                    if any(p.name and p.name.lower() == name for p in self.game_state.list_players()):
+                    if self.game_state.find_player_by_name(name):
                         continue
                     
                     # Load player data
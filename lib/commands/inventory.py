@@ -29,11 +29,10 @@ class InventoryCommands(BaseCommand):
             items_to_get = []
             
             # Get list of items first (avoid modifying while iterating)
-            for uuid, item in current_room.inventory.get_items():
+            for item in current_room.inventory.get_objects():
                 if hasattr(item, 'takeable') and not item.takeable:
                     continue  # Can't take this (like corpses)
-                if not isinstance(item, player.__class__):  # Don't pick up players!
-                    items_to_get.append(item)
+                items_to_get.append(item)
             
             # Now get the items
             for item in items_to_get:
@@ -57,12 +56,9 @@ class InventoryCommands(BaseCommand):
             container_name = parts[1].strip()
             
             # Find container
-            container = None
-            for uuid, obj in current_room.inventory.get_items():
-                if hasattr(obj, 'name') and container_name.lower() in obj.name.lower():
-                    if hasattr(obj, 'contents'):  # It's a container
-                        container = obj
-                        break
+            container = current_room.inventory.find_object(container_name)
+            if not hasattr(container, 'contents'):  # It's not a container
+                container = None
             
             if not container:
                 player.message(f"You don't see any '{container_name}' here.")
@@ -87,13 +83,8 @@ class InventoryCommands(BaseCommand):
                 player.message("You can't carry that much weight.")
             return
         
-        # Normal get
-        target_item = None
-        for uuid, item in current_room.inventory.get_items():
-            if hasattr(item, 'name') and params.lower() in item.name.lower():
-                if not isinstance(item, player.__class__):  # Don't pick up players!
-                    target_item = item
-                    break
+        # Normal get - players and creatures are never in the running
+        target_item = current_room.inventory.find_object(params)
         
         if not target_item:
             player.message(f"You don't see '{params}' here.")
@@ -161,10 +152,10 @@ class InventoryCommands(BaseCommand):
             player.message("You don't have that.")
             return
         
-        # Drop it
+        # Drop it, one of a stack
         current_room = self.get_player_room(player)
         
-        player.inventory.remove_item(item)
+        item = player.inventory.take(item)
         current_room.inventory.add_item(item)
         player.message(f"You drop {item.name}.")
         
@@ -206,9 +197,9 @@ class InventoryCommands(BaseCommand):
             player.message("You can't give items to yourself!")
             return
         
-        # Try to give
+        # Try to give, one of a stack
+        item = player.inventory.take(item)
         if target_player.inventory.add_item(item):
-            player.inventory.remove_item(item)
             player.message(f"You give {item.name} to {target_player.name}.")
             target_player.message(f"{player.name} gives you {item.name}.")
             
@@ -216,6 +207,7 @@ class InventoryCommands(BaseCommand):
             self.broadcast_to_room(player, 
                 f"{player.name} gives {item.name} to {target_player.name}.")
         else:
+            player.inventory.add_item(item)
             player.message(f"{target_player.name} can't carry that much weight.")
 
     def wear(self, player, params=None):
@@ -290,10 +282,12 @@ class InventoryCommands(BaseCommand):
             return
         
         if hasattr(item, 'use'):
+            # use one of a stack, the rest stay as they are
+            item = player.inventory.take(item)
             success, message = item.use(player)
             player.message(message)
-            if success and hasattr(item, 'charges') and item.charges <= 0:
-                player.inventory.remove_item(item)
+            if not (success and item.used_up()):
+                player.inventory.add_item(item)
         else:
             player.message("You can't use that.")
     
@@ -335,8 +329,8 @@ class InventoryCommands(BaseCommand):
             player.sp_current += sp_healed
             player.message(f"You drink the heal and recover {hp_healed} HP and {sp_healed} SP.")
         
-        # Remove the heal
-        player.inventory.remove_item(heal)
+        # Remove the heal, one of a stack
+        player.inventory.take(heal)
 
     def keep(self, player, params=None):
         """keep <item> - Mark item to keep"""
@@ -26,31 +26,26 @@ class MovementCommands(BaseCommand):
         player.message(brief_output)
         
         # Show players in room (excluding self)
-        for uuid, item in current_location.inventory.get_items():
-            if hasattr(item, 'is_player') and item.is_player:
-                # Skip self - compare multiple ways to be sure
-                if (item == player or 
-                    (hasattr(item, 'uuid') and hasattr(player, 'uuid') and item.uuid == player.uuid) or
-                    (hasattr(item, 'client_id') and hasattr(player, 'client_id') and item.client_id == player.client_id) or
-                    (hasattr(item, 'name') and hasattr(player, 'name') and item.name == player.name and item is player)):
-                    continue
-                    
-                display_name = item.get_display_name() if hasattr(item, 'get_display_name') else str(item.name)
-                if display_name and display_name != 'None':
-                    player.message(f"{display_name}.")
+        for item in current_location.inventory.get_players():
+            # Skip self
+            if item is player or item.uuid == player.uuid:
+                continue
+                
+            display_name = item.get_display_name() if hasattr(item, 'get_display_name') else str(item.name)
+            if display_name and display_name != 'None':
+                player.message(f"{display_name}.")
         
         # Show items in room
-        for uuid, item in current_location.inventory.get_items():
-            if not hasattr(item, 'is_player') or not item.is_player:
-                if hasattr(item, 'get_display_name'):
-                    item_name = item.get_display_name()
-                elif hasattr(item, 'name'):
-                    item_name = str(item.name)
-                else:
-                    item_name = None
-                    
-                if item_name and item_name != 'None':
-                    player.message(f"{item_name}.")
+        for item in current_location.inventory.get_things():
+            if hasattr(item, 'get_display_name'):
+                item_name = item.get_display_name()
+            elif hasattr(item, 'name'):
+                item_name = str(item.name)
+            else:
+                item_name = None
+                
+            if item_name and item_name != 'None':
+                player.message(f"{item_name}.")
     
     def look(self, player, params=None):
         """look - Examine your surroundings"""
@@ -68,6 +63,11 @@ class MovementCommands(BaseCommand):
                 player.message("Error: Cannot find the entrance room. Please contact an admin.")
                 return
         
+        # look <thing>
+        if params and params.strip():
+            self.look_at(player, current_location, params.strip())
+            return
+        
         # Format room data for ANSI
         room_data = {
             'name': current_location.name.upper(),
@@ -78,33 +78,28 @@ class MovementCommands(BaseCommand):
         }
         
         # Get players in room (excluding self)
-        for uuid, item in current_location.inventory.get_items():
-            if hasattr(item, 'is_player') and item.is_player:
-                # Skip self - compare multiple ways to be sure
-                if (item == player or 
-                    (hasattr(item, 'uuid') and hasattr(player, 'uuid') and item.uuid == player.uuid) or
-                    (hasattr(item, 'client_id') and hasattr(player, 'client_id') and item.client_id == player.client_id) or
-                    (hasattr(item, 'name') and hasattr(player, 'name') and item.name == player.name and item is player)):
-                    continue
-                    
-                display_name = item.get_display_name() if hasattr(item, 'get_display_name') else str(item.name)
-                if display_name and display_name != 'None':
-                    room_data['players'].append(display_name)
+        for item in current_location.inventory.get_players():
+            # Skip self
+            if item is player or item.uuid == player.uuid:
+                continue
+                
+            display_name = item.get_display_name() if hasattr(item, 'get_display_name') else str(item.name)
+            if display_name and display_name != 'None':
+                room_data['players'].append(display_name)
         
         # Get items in room
         room_items = []
-        for uuid, item in current_location.inventory.get_items():
-            if not hasattr(item, 'is_player') or not item.is_player:
-                if hasattr(item, 'get_display_name'):
-                    item_name = item.get_display_name()
-                elif hasattr(item, 'name'):
-                    item_name = str(item.name)
-                else:
-                    item_name = None
-                    
-                # Only add non-None items
-                if item_name and item_name != 'None':
-                    room_items.append(item_name)
+        for item in current_location.inventory.get_things():
+            if hasattr(item, 'get_display_name'):
+                item_name = item.get_display_name()
+            elif hasattr(item, 'name'):
+                item_name = str(item.name)
+            else:
+                item_name = None
+                
+            # Only add non-None items
+            if item_name and item_name != 'None':
+                room_items.append(item_name)
         
         if room_items:
             room_data['objects'] = room_items
@@ -126,6 +121,32 @@ class MovementCommands(BaseCommand):
                 for obj in room_data['objects']:
                     player.message(obj)
     
+    def look_at(self, player, room, name):
+        """Describe one thing in the room or being carried."""
+        if name.lower().startswith('at '):
+            name = name[3:].strip()
+        
+        target = room.inventory.find(name)
+        if target is None and player.inventory:
+            target = player.inventory.get_item(name)
+        if target is not None:
+            if hasattr(target, 'examine'):
+                player.message(target.examine())
+            elif target.description:
+                player.message(target.description)
+            else:
+                player.message(f"You see nothing special about {target.name}.")
+            return
+        
+        # Flavour items from the room description
+        name = name.lower()
+        for item in room.description_items or []:
+            if name == item.name.lower() or name in item.aliases:
+                player.message(item.description)
+                return
+        
+        player.message(f"You don't see '{name}' here.")
+    
     def glance(self, player, params=None):
         """glance - Quick look at the room"""
         # Glance always shows brief format regardless of brief mode setting
@@ -146,11 +167,11 @@ class MovementCommands(BaseCommand):
             return
         
         # Check if exit exists
-        if not current_location.has_exit(direction):
+        exit_obj = current_location.get_exit(direction)
+        if not exit_obj:
             player.message(f"You can't go '{direction}'")
             return
-        
-        exit_obj = current_location.get_exit(direction)
+        direction = exit_obj.name
         
         # Check if player can move through (ghosts can go through locked doors)
         if not player.can_move_through_door(exit_obj):
@@ -163,8 +184,8 @@ class MovementCommands(BaseCommand):
             player.message("You stop following.")
         
         # Announce departure
-        for uuid, item in current_location.inventory.get_items():
-            if hasattr(item, 'is_player') and item.is_player and item != player:
+        for item in current_location.inventory.get_players():
+            if item != player:
                 if player.is_ghost:
                     item.message(f"{player.get_display_name()} drifts {direction}.")
                 else:
@@ -176,8 +197,8 @@ class MovementCommands(BaseCommand):
         
         # Announce arrival
         new_location = self.rooms[destination]
-        for uuid, item in new_location.inventory.get_items():
-            if hasattr(item, 'is_player') and item.is_player and item != player:
+        for item in new_location.inventory.get_players():
+            if item != player:
                 if player.is_ghost:
                     item.message(f"{player.get_display_name()} drifts in.")
                 else:
@@ -43,4 +43,9 @@ class SystemCommands(BaseCommand):
         output.append("")
         output.append("The mud is currently running PyMUD Version: 1.0")
         output.append("Based on the LPMud look and feel")
+        if player.implementor_level > 0:
+            server = self.game_state.server
+            output.append("")
+            output.append(f"Output batching saved {server.total_sends_saved} sends "
+                          f"({server.sends_saved} last tick)")
         player.message("\n".join(output))
\ No newline at end of file
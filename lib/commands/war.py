@@ -117,26 +117,46 @@ class WarCommands(BaseCommand):
         return {'select_class': params}  # Signal to handle in main Commands
 
     def watch_war(self, player, params=None):
-        """watch - Watch the war from observation room"""
+        """watch [<player>|room <room>] - Watch the war from observation room"""
         if player._location != 'observation_room':
             player.message("You can only watch wars from the observation room.")
             return
         
-        if self.war_system.state != self.war_system.WarState.ACTIVE:
+        if self.war_system.state not in [
+            self.war_system.WarState.ACTIVE,
+            self.war_system.WarState.ARENA_SHRINKING
+        ]:
             player.message("There is no war in progress to watch.")
             return
         
-        player.watching_war = True
+        room = name = None
+        if params:
+            words = params.split()
+            if words[0].lower() == 'room':
+                if len(words) != 2:
+                    player.message("Usage: watch room <room>")
+                    return
+                room = words[1]
+                if room not in self.game_state.rooms:
+                    player.message(f"The screens show no room called '{room}'.")
+                    return
+            else:
+                target = self.game_state.find_player_by_name(params)
+                if not target:
+                    player.message(f"The screens can't find '{params}'.")
+                    return
+                name = target.name
+        
+        subscription = self.war_system.spectators.subscribe(player, room=room, name=name)
         player.message("You begin watching the war on the crystal screens.")
-        player.message("All combat in the war will be displayed here.")
+        player.message(f"The screens will show you {subscription.describe()}.")
     
     def stop_watching(self, player, params=None):
         """stop - Stop watching the war"""
-        if not getattr(player, 'watching_war', False):
+        if not self.war_system.spectators.unsubscribe(player):
             player.message("You're not watching anything.")
             return
         
-        player.watching_war = False
         player.message("You stop watching the crystal screens.")
     
     def show_wars(self, player, params=None):
@@ -192,7 +212,7 @@ class WarCommands(BaseCommand):
                 if filename.endswith('.py'):
                     name = filename[:-3]
                     # Skip online players
-                    if any(p.name.lower() == name for p in self.game_state.list_players()):
+                    if self.game_state.find_player_by_name(name):
                         continue
                     
                     # Load player data
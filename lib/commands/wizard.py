@@ -1,6 +1,10 @@
 """Wizard/Implementor commands."""
 
 from .base import BaseCommand
+from lib.entity_registry import entities
+from lib.models.entity import Room
+from lib.models.objects import GameObject, Container
+import copy
 import os
 import time
 import json
@@ -64,8 +68,8 @@ class WizardCommands(BaseCommand):
         
         # Announce to target's room
         target_room = self.get_player_room(target)
-        for uuid, item in target_room.inventory.get_items():
-            if hasattr(item, 'message') and item != target:
+        for item in target_room.inventory.get_players():
+            if item != target:
                 item.message(f"{target.name} vanishes in a puff of smoke!")
         
         # Move target
@@ -99,7 +103,7 @@ class WizardCommands(BaseCommand):
         
         # Try to load the file
         filepath = f"lib/{params}"
-        if not filepath.endswith('.py'):
+        if not filepath.endswith(('.py', '.json')):
             filepath += '.py'
         
         if not os.path.exists(filepath):
@@ -107,16 +111,23 @@ class WizardCommands(BaseCommand):
             return
         
         try:
-            # Reload room if it's a room file
+            # Reload every room in it if it's a room file
             if 'rooms' in filepath or 'areas' in filepath:
-                room_name = os.path.basename(filepath)[:-3]  # Remove .py
                 if hasattr(self.game_state, 'room_loader'):
-                    if self.game_state.room_loader.reload_room(room_name):
+                    if self.game_state.room_loader.reload_file(filepath):
                         player.message(f"Successfully loaded {filepath}")
                     else:
                         player.message(f"Failed to load {filepath}")
                 else:
                     player.message("Room loader not available.")
+            elif 'objects' in filepath:
+                if hasattr(self.game_state, 'object_loader'):
+                    if self.game_state.object_loader.reload_file(filepath):
+                        player.message(f"Successfully loaded {filepath}")
+                    else:
+                        player.message(f"Failed to load {filepath}")
+                else:
+                    player.message("Object loader not available.")
             else:
                 player.message(f"Loading of {filepath} not implemented yet.")
         except Exception as e:
@@ -138,6 +149,14 @@ class WizardCommands(BaseCommand):
             player.message("Destroy what?")
             return
         
+        if params.startswith('#'):
+            item = self._find_object_by_id(player, params)
+            if item:
+                where = self._remove_from_holder(player, item)
+                player.message(f"You destroy {item.name} (#{item.id})"
+                               + (f" {where}." if where else ", which wasn't anywhere."))
+            return
+        
         # Find item in player's inventory
         item = player.inventory.get_item(params)
         if item:
@@ -147,14 +166,14 @@ class WizardCommands(BaseCommand):
         
         # Find item in room
         room = self.get_player_room(player)
-        for uuid, entity in room.inventory.get_items():
-            if hasattr(entity, 'name') and entity.name.lower() == params.lower():
-                room.inventory.remove_item(entity)
-                player.message(f"You destroy {entity.name}.")
-                
-                # Announce to room
-                self.broadcast_to_room(player, f"{player.name} destroys {entity.name}.")
-                return
+        entity = room.inventory.find_object(params)
+        if entity:
+            room.inventory.remove_item(entity)
+            player.message(f"You destroy {entity.name}.")
+            
+            # Announce to room
+            self.broadcast_to_room(player, f"{player.name} destroys {entity.name}.")
+            return
         
         player.message(f"Can't find '{params}' to destroy.")
 
@@ -168,16 +187,60 @@ class WizardCommands(BaseCommand):
             player.message("Clone what?")
             return
         
+        if params.startswith('#'):
+            original = self._find_object_by_id(player, params)
+            if original:
+                # the holder stays with the original, contents are copied
+                memo = {id(original.owner): None} if original.owner else {}
+                obj = copy.deepcopy(original, memo)
+                player.inventory.add_item(obj)
+                player.message(f"You clone {obj.name} (#{obj.id}) from #{original.id}.")
+            return
+        
         # Try to create object from template
         if hasattr(self.game_state, 'object_loader'):
             obj = self.game_state.object_loader.create_object(params)
             if obj:
                 player.inventory.add_item(obj)
-                player.message(f"You clone {obj.name}.")
+                player.message(f"You clone {obj.name} (#{obj.id}).")
                 return
         
         player.message(f"Can't find template for '{params}'.")
 
+    def _find_object_by_id(self, player, params):
+        """The object '#<id>' names, telling the player if there isn't one."""
+        try:
+            entity = entities.get(int(params[1:]))
+        except ValueError:
+            player.message(f"'{params}' isn't an id, ids look like #42.")
+            return None
+        if entity is None:
+            player.message(f"Nothing has the id {params}.")
+            return None
+        if not isinstance(entity, GameObject):
+            player.message(f"{entity.name} ({params}) isn't an object.")
+            return None
+        return entity
+
+    def _remove_from_holder(self, player, item):
+        """Take 'item' out of whatever holds it. Returns where it was."""
+        holder = item.owner
+        if holder is None:
+            return None
+        if isinstance(holder, Container):
+            holder.remove_item(item)
+            return f"from {holder.name}"
+        if isinstance(holder, Room):
+            holder.inventory.remove_item(item)
+            return f"in {holder.name}"
+        inventory = holder.inventory
+        if not inventory.remove_item(item):
+            for slot, equipped in inventory.equipment.items():
+                if equipped is item:
+                    inventory.equipment[slot] = None
+        item.owner = None
+        return f"from {holder.name}"
+
     def wizhelp(self, player, params=None):
         """wizhelp - Show implementor commands"""
         if player.implementor_level == 0:
@@ -188,8 +251,8 @@ class WizardCommands(BaseCommand):
         output.append("goto <room/player> - Teleport to a room or player")
         output.append("trans <player> - Transport player to you")
         output.append("load <file> - Load a code file")
-        output.append("dest <object> - Destroy an object")
-        output.append("clone <object> - Clone an object")
+        output.append("dest <object|#id> - Destroy an object")
+        output.append("clone <template|#id> - Clone an object")
         
         if player.implementor_level >= 3:
             output.append("\nLevel 3+ Commands:")
@@ -0,0 +1,63 @@
+"""Every entity in the game by a small integer id.
+
+Ids count up from 1 and are never reused while the mud runs, so an id
+a wizard was shown a minute ago either still finds the same entity or
+finds nothing. The registry only holds entities weakly: an object that
+has been destroyed or dropped from every inventory leaves it on its
+own.
+
+Ids belong to one run of the mud. A pickled room or a copied object
+drops its ids and gets new ones when they are next asked for.
+"""
+
+import itertools
+import weakref
+from typing import Optional
+
+
+class EntityRegistry(object):
+    """Hands out ids and finds entities by them."""
+
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self._entities = weakref.WeakValueDictionary()
+
+    def register(self, entity) -> int:
+        """A new id for 'entity'."""
+        entity_id = next(self._ids)
+        self._entities[entity_id] = entity
+        return entity_id
+
+    def get(self, entity_id: int) -> Optional[object]:
+        """The entity with this id, None if there is none any more."""
+        return self._entities.get(entity_id)
+
+    def __contains__(self, entity_id) -> bool:
+        return entity_id in self._entities
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+
+def state_without_id(entity) -> tuple:
+    """What pickle and copy keep of 'entity': its attribute dict and its
+    slots, as object.__getstate__ gives them, but with no id.
+
+    Built by hand as object.__getstate__ is only there from Python 3.11.
+    """
+    slots = {}
+    for klass in type(entity).__mro__:
+        names = vars(klass).get('__slots__', ())
+        for name in (names,) if isinstance(names, str) else names:
+            if name in ('__dict__', '__weakref__') or name in slots:
+                continue
+            try:
+                slots[name] = vars(klass)[name].__get__(entity, klass)
+            except AttributeError:
+                continue
+    slots['_id'] = None
+    return getattr(entity, '__dict__', None) or None, slots
+
+
+# the registry everything in the game is in
+entities = EntityRegistry()
@@ -0,0 +1,84 @@
+"""Notice room and object files being edited while the mud is running.
+
+The standard library has no inotify, so the watcher stats every file
+under its directories from a game timer and compares mtime and size with
+the last look. The callback runs between ticks like any other timer, so
+it can swap rooms and templates without any locking.
+"""
+
+import logging
+import os
+from typing import Callable, Dict, List, Tuple
+
+log = logging.getLogger(__name__)
+
+# seconds between looks at the files
+DEFAULT_INTERVAL = 2.0
+
+
+class FileWatcher(object):
+    """Calls 'callback(path)' for every file under 'directories' that has
+    been changed, added or deleted since the last poll.
+    """
+
+    def __init__(self, directories: List[str], callback: Callable[[str], object],
+                 suffixes: Tuple[str, ...] = ('.py', '.json'),
+                 interval: float = DEFAULT_INTERVAL):
+        self.directories = directories
+        self.callback = callback
+        self.suffixes = suffixes
+        self.interval = interval
+        # path -> (mtime_ns, size) at the last poll
+        self._files: Dict[str, Tuple[int, int]] = {}
+        self._timer = None
+
+    def scan(self) -> Dict[str, Tuple[int, int]]:
+        files = {}
+        for directory in self.directories:
+            self._scan(directory, files)
+        return files
+
+    def _scan(self, directory: str, files: Dict[str, Tuple[int, int]]):
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    if entry.name != '__pycache__' and not entry.name.startswith('.'):
+                        self._scan(entry.path, files)
+                elif entry.name.endswith(self.suffixes) and entry.name != '__init__.py':
+                    stat = entry.stat()
+                    files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                # deleted between the listing and the stat
+                continue
+
+    def poll(self) -> List[str]:
+        """The files that changed since the last poll, in no set order."""
+        files = self.scan()
+        changed = [path for path, state in files.items() if self._files.get(path) != state]
+        changed.extend(path for path in self._files if path not in files)
+        self._files = files
+        return changed
+
+    def start(self, scheduler):
+        """Take the current state of the files as unchanged and poll from
+        the game's scheduler from now on.
+        """
+        self._files = self.scan()
+        self._timer = scheduler.schedule(self.interval, self._check)
+
+    def stop(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+    def _check(self):
+        for path in self.poll():
+            try:
+                self.callback(path)
+            except Exception:
+                log.exception(f"Error reloading {path}")
+        self._timer.reschedule(self.interval)
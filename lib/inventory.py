@@ -1,12 +1,33 @@
 """Inventory management system for players"""
 
+from lib.keyword_index import KeywordIndex
+
 class InventoryManager:
-    """Manages player inventory and equipment."""
+    """Manages player inventory and equipment.
+    
+    Items are kept by entity id, with a KeywordIndex for finding them by
+    name and a count of how many of each name are carried and kept, so
+    looking an item up, taking one out and showing the inventory don't
+    walk every item a looter has picked up. Objects that stack (see
+    GameObject.stack_key) are merged into the one already carried, and
+    'take' splits units off again. Items carried or equipped have the
+    player as their 'owner'.
+    """
     
     def __init__(self, player):
         self.player = player
-        self.items = []  # List of items in inventory
-        self.kept_items = set()  # Set of item IDs that are kept
+        # entity id -> item, in the order they were picked up
+        self._items = {}
+        self.keywords = KeywordIndex()
+        # name -> how many units of that name are carried, and how many
+        # of the items carried under it are kept
+        self.stacks = {}
+        self.kept_stacks = {}
+        # entity id -> the name and stack key the item was filed under
+        self._filed = {}
+        # stack key -> the stack new units with that key are added to
+        self._by_stack = {}
+        self.kept_items = set()  # Entity ids of the items that are kept
         self.equipment = {
             'wielded': None,
             'head': None,
@@ -24,63 +45,125 @@ class InventoryManager:
         self.max_weight = 1000  # Base carrying capacity
         self.current_weight = 0
     
+    @property
+    def items(self):
+        """The items carried, in the order they were picked up."""
+        return list(self._items.values())
+    
+    def __iter__(self):
+        return iter(list(self._items.values()))
+    
+    def __len__(self):
+        return len(self._items)
+    
+    def __contains__(self, item):
+        return self._items.get(item.id) is item
+    
+    def get_all_items(self):
+        return self.items
+    
+    def get_current_weight(self):
+        return self.current_weight
+    
+    def get_max_weight(self):
+        return self.max_weight
+    
     def add_item(self, item):
         """Add an item to inventory."""
         if self.can_carry(item):
-            self.items.append(item)
-            self.current_weight += getattr(item, 'weight', 0)
-            
-            # Auto-combine heals and wands
-            self._auto_combine(item)
+            self.current_weight += self._weight(item)
+            # Stack heals, wands and blood with the ones already carried
+            stack = self._by_stack.get(self._stack_key(item))
+            if stack is not None and stack is not item:
+                self._count(self.stacks, self._filed[stack.id][0], item.quantity)
+                stack.merge(item)
+            else:
+                self._items[item.id] = item
+                self._index(item)
+                item.owner = self.player
             return True
         return False
     
     def remove_item(self, item):
-        """Remove an item from inventory."""
-        if item in self.items:
-            self.items.remove(item)
-            self.current_weight -= getattr(item, 'weight', 0)
+        """Remove an item, the whole stack if it is one, from inventory."""
+        if item in self:
+            del self._items[item.id]
+            self._unindex(item)
+            self.current_weight -= self._weight(item)
+            item.owner = None
             return True
         return False
     
+    def take(self, item, count=1):
+        """Take 'count' units of 'item' out of the inventory, splitting
+        them off if it's a bigger stack. Returns the object holding them,
+        None if 'item' isn't carried.
+        """
+        if item not in self:
+            return None
+        if count >= item.quantity:
+            self.remove_item(item)
+            return item
+        part = item.split(count)
+        part.owner = None
+        self._count(self.stacks, self._filed[item.id][0], -count)
+        self.current_weight -= self._weight(part)
+        return part
+    
+    def take_all(self):
+        """Empty the inventory, returning everything that was in it."""
+        items = self.items
+        for item in items:
+            item.owner = None
+        self._items.clear()
+        self.keywords = KeywordIndex()
+        self.stacks.clear()
+        self.kept_stacks.clear()
+        self._filed.clear()
+        self._by_stack.clear()
+        self.current_weight = 0
+        return items
+    
     def get_item(self, name):
-        """Find an item by name."""
-        name_lower = name.lower()
-        for item in self.items:
-            if (item.name.lower() == name_lower or 
-                name_lower in item.name.lower()):
-                return item
-        return None
+        """An item with a name or alias that is or starts with 'name',
+        found the same way as things in a room.
+        """
+        if not name:
+            return None
+        return self.keywords.find(name)
     
     def can_carry(self, item):
         """Check if player can carry this item."""
-        item_weight = getattr(item, 'weight', 0)
-        return self.current_weight + item_weight <= self.max_weight
+        return self.current_weight + self._weight(item) <= self.max_weight
     
     def keep_item(self, item):
         """Mark an item as kept (won't be sold)."""
-        if item in self.items:
-            self.kept_items.add(id(item))
+        if item in self:
+            if item.id not in self.kept_items:
+                self.kept_items.add(item.id)
+                self._count(self.kept_stacks, self._filed[item.id][0], 1)
             return True
         return False
     
     def unkeep_item(self, item):
         """Unmark an item as kept."""
-        if id(item) in self.kept_items:
-            self.kept_items.remove(id(item))
+        if item.id in self.kept_items:
+            self.kept_items.remove(item.id)
+            if item in self:
+                self._count(self.kept_stacks, self._filed[item.id][0], -1)
             return True
         return False
     
     def is_kept(self, item):
         """Check if item is marked as kept."""
-        return id(item) in self.kept_items
+        return item.id in self.kept_items
     
     def get_sellable_items(self):
         """Get items that can be sold (not kept, not blood)."""
         sellable = []
-        for item in self.items:
+        for item in self._items.values():
             if (not self.is_kept(item) and 
-                not getattr(item, 'is_blood', False)):
+                getattr(item, 'sellable', True)):
                 sellable.append(item)
         return sellable
     
@@ -97,6 +180,7 @@ class InventoryManager:
         # Equip new item
         self.equipment[slot] = item
         self.remove_item(item)
+        item.owner = self.player
         return True
     
     def unequip_item(self, slot):
@@ -104,6 +188,7 @@ class InventoryManager:
         if slot in self.equipment and self.equipment[slot]:
             item = self.equipment[slot]
             self.equipment[slot] = None
+            item.owner = None
             return self.add_item(item)
         return False
     
@@ -127,27 +212,9 @@ class InventoryManager:
         output.append("# Item")
         output.append("-" * 50)
         
-        # Group similar items
-        item_counts = {}
-        for item in self.items:
-            key = item.name
-            if key in item_counts:
-                item_counts[key] += 1
-            else:
-                item_counts[key] = 1
-        
-        for name, count in item_counts.items():
-            kept_marker = ""
-            # Check if any of this type are kept
-            for item in self.items:
-                if item.name == name and self.is_kept(item):
-                    kept_marker = " *"
-                    break
-            
-            if count > 1:
-                output.append(f"{count} {name}{kept_marker}")
-            else:
-                output.append(f"1 {name}{kept_marker}")
+        for name, count in self.stacks.items():
+            kept_marker = " *" if self.kept_stacks.get(name) else ""
+            output.append(f"{count} {name}{kept_marker}")
         
         # Add coins
         output.append(f"{self.player.coins} coins (weightless)")
@@ -175,22 +242,39 @@ class InventoryManager:
         
         return output
     
-    def _auto_combine(self, new_item):
-        """Automatically combine heals and wands."""
-        if not hasattr(new_item, 'combinable') or not new_item.combinable:
-            return
-        
-        # Find existing items of same type
-        for existing_item in self.items:
-            if (existing_item != new_item and 
-                existing_item.name.startswith(new_item.base_name) and
-                hasattr(existing_item, 'combinable') and existing_item.combinable):
-                
-                # Combine the items
-                existing_item.amount += new_item.amount
-                existing_item.name = f"{existing_item.base_name} [{existing_item.amount}]"
-                
-                # Remove the new item
-                self.items.remove(new_item)
-                self.current_weight -= getattr(new_item, 'weight', 0)
-                break
\ No newline at end of file
+    def _index(self, item):
+        name, key = item.name, self._stack_key(item)
+        self._filed[item.id] = (name, key)
+        self.keywords.add(item)
+        self._count(self.stacks, name, item.quantity)
+        if item.id in self.kept_items:
+            self._count(self.kept_stacks, name, 1)
+        if key is not None:
+            self._by_stack.setdefault(key, item)
+    
+    def _unindex(self, item):
+        name, key = self._filed.pop(item.id)
+        self.keywords.remove(item)
+        self._count(self.stacks, name, -item.quantity)
+        if item.id in self.kept_items:
+            self._count(self.kept_stacks, name, -1)
+        # anything with its key is merged into it, so it's the only one
+        if key is not None and self._by_stack.get(key) is item:
+            del self._by_stack[key]
+    
+    @staticmethod
+    def _stack_key(item):
+        stack_key = getattr(item, 'stack_key', None)
+        return stack_key() if stack_key else None
+    
+    @staticmethod
+    def _weight(item):
+        return getattr(item, 'weight', 0) * getattr(item, 'quantity', 1)
+    
+    @staticmethod
+    def _count(counts, name, change):
+        count = counts.get(name, 0) + change
+        if count > 0:
+            counts[name] = count
+        else:
+            counts.pop(name, None)
@@ -0,0 +1,88 @@
+"""Keyword lookup for things players refer to by name.
+
+Every entity is filed under its full name, each word of its name and any
+aliases, all lowercased. 'exact' is a dict lookup and 'prefix' a binary
+search over the sorted keywords, so finding "bob" or "sw" costs the same
+however crowded a room is.
+
+This is the one rule for finding things by name, in a room or in what a
+player carries: an exact keyword wins, otherwise the first keyword that
+starts with what was typed. Typing the middle of a word finds nothing,
+so "ord" doesn't find a sword.
+"""
+
+import re
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+_WORD = re.compile(r"\w+")
+
+
+def keywords_for(entity) -> Tuple[str, ...]:
+    """The lowercased keywords 'entity' can be found by."""
+    name = getattr(entity, 'name', None)
+    if not name:
+        return ()
+    name = str(name).lower()
+    keywords = {name}
+    keywords.update(_WORD.findall(name))
+    for alias in getattr(entity, 'aliases', None) or ():
+        keywords.add(alias.lower())
+    return tuple(keywords)
+
+
+class KeywordIndex(object):
+    """Entities by keyword, with prefix search."""
+    __slots__ = ('_entries', '_sorted', '_keys')
+
+    def __init__(self):
+        # keyword -> the entities filed under it, in the order they arrived
+        self._entries: Dict[str, Dict[object, None]] = {}
+        # every keyword in '_entries', kept sorted for prefix search
+        self._sorted: List[str] = []
+        # entity -> the keywords it was filed under, so it can still be
+        # removed if its name has changed since
+        self._keys: Dict[object, Tuple[str, ...]] = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, entity):
+        if entity in self._keys:
+            self.remove(entity)
+        keywords = keywords_for(entity)
+        self._keys[entity] = keywords
+        for keyword in keywords:
+            entries = self._entries.get(keyword)
+            if entries is None:
+                entries = self._entries[keyword] = {}
+                insort(self._sorted, keyword)
+            entries[entity] = None
+
+    def remove(self, entity):
+        for keyword in self._keys.pop(entity, ()):
+            entries = self._entries[keyword]
+            del entries[entity]
+            if not entries:
+                del self._entries[keyword]
+                del self._sorted[bisect_left(self._sorted, keyword)]
+
+    def exact(self, word: str) -> Optional[object]:
+        """The first entity with 'word' as a keyword."""
+        entries = self._entries.get(word.lower())
+        if entries:
+            return next(iter(entries))
+        return None
+
+    def prefix(self, word: str) -> Optional[object]:
+        """The first entity with a keyword starting with 'word'."""
+        word = word.lower()
+        index = bisect_left(self._sorted, word)
+        if index < len(self._sorted) and self._sorted[index].startswith(word):
+            return next(iter(self._entries[self._sorted[index]]))
+        return None
+
+    def find(self, word: str) -> Optional[object]:
+        """An exact keyword match if there is one, otherwise a prefix match."""
+        found = self.exact(word)
+        return found if found is not None else self.prefix(word)
@@ -100,10 +100,9 @@ class MailSystem:
             self.save_player_mail(recipient, mail_list)
             
             # Notify if online
-            for player in self.game_state.list_players():
-                if player.name.lower() == recipient.lower():
-                    player.message(f"\nYou have new mail from {sender}!")
-                    break
+            player = self.game_state.find_player_by_name(recipient)
+            if player:
+                player.message(f"\nYou have new mail from {sender}!")
         
         return True
     
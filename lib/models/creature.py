@@ -10,6 +10,9 @@ from lib.models.enums import Ability, Skill, Alignment
 
 class Creature(Entity):
 
+    # room inventories file anything with this set with the creatures
+    is_living = True
+
     _DEFAULT_LEVEL = 0
     _DEFAULT_XP = 0
     _DEFAULT_HP = 1
@@ -51,10 +54,11 @@ class Creature(Entity):
         self.inventory: Inventory = inventory
         self._location = ""
 
-        super().__init__()
+        super().__init__(name, description)
 
     def get_modifier(self, ability: Ability) -> int:
-        value = self.abilities.get(ability)
+        # players' abilities are saved and loaded by name
+        value = self.abilities.get(ability, self.abilities.get(ability.name, 10))
         return (value - 10) // 2
 
     def get_strength_modifier(self) -> int:
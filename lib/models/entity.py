@@ -1,24 +1,47 @@
-import uuid
-
-from typing import List, Dict
+from types import MappingProxyType
+from typing import List, Dict, Mapping, Optional
 
+from lib.entity_registry import entities, state_without_id
+from lib.keyword_index import KeywordIndex
 from lib.models.enums import ExitType, LightLevel, Obscuration
 
 
 class Entity(object):
+    # attributes every entity has live in slots rather than a per-instance
+    # dict. '__dict__' is still there for anything set on the fly, like
+    # special_type on a room, and only costs memory once something is
+    __slots__ = ('_id', 'name', 'description', '__dict__', '__weakref__')
+
     def __init__(self, name=None, description=None):
-        self.uuid = uuid.uuid4()
+        self._id = None
         self.name = name
         self.description = description
 
+    @property
+    def id(self) -> int:
+        """This entity's id in the entity registry, given out on first use
+        since exits and most rooms never need one.
+        """
+        if self._id is None:
+            self._id = entities.register(self)
+        return self._id
+
+    def __getstate__(self):
+        # ids belong to this run of the mud, a copy gets its own
+        return state_without_id(self)
+
 
 class Weapon(Entity):
+    __slots__ = ('damage',)
+
     def __init__(self, name: str, description: str, damage: int):
         self.damage = damage
         super().__init__(name, description)
 
 
 class Exit(Entity):
+    __slots__ = ('destination', 'type')
+
     def __init__(self, name, description, destination, exit_type: ExitType):
         self.destination = destination
         self.type = exit_type
@@ -30,13 +53,32 @@ class DescriptionItem():
     a description item. It exists just for flavour text. Every noun in a room's
     description should have a corresponding description item.
     '''
+    __slots__ = ('name', 'aliases', 'description')
+
     def __init__(self, name: str, aliases: List[str], description: str):
         self.name = name
         self.aliases = aliases
         self.description = description
 
 
+# what players can type instead of the full name of a standard direction
+EXIT_ABBREVIATIONS = {
+    'n': 'north',
+    's': 'south',
+    'e': 'east',
+    'w': 'west',
+    'u': 'up',
+    'd': 'down',
+    'ne': 'northeast',
+    'nw': 'northwest',
+    'se': 'southeast',
+    'sw': 'southwest',
+}
+
+
 class Room(Entity):
+    __slots__ = ('description_items', 'light_level', 'obscuration', 'exits',
+                 '_exit_map', '_inventory')
 
     def __init__(self, 
                  name: str, 
@@ -46,17 +88,56 @@ class Room(Entity):
                  light_level: LightLevel = LightLevel.BRIGHT,
                  obscuration: Obscuration = Obscuration.NONE,
                  ):
-        self.uuid = uuid.uuid4()
         self.description_items = description_items
         self.light_level = light_level
         self.obscuration = obscuration
-        self.exits = exits
-        self.inventory = Inventory()
+        self.exits = exits if exits is not None else []
+        # exit name or abbreviation -> Exit, built on first use. Exits must
+        # be added through 'add_exit' so it gets rebuilt
+        self._exit_map = None
+        # most rooms are empty most of the time, so the inventory is only
+        # made when something asks for it
+        self._inventory = None
 
         super().__init__(name, description)
 
+    def __getstate__(self):
+        # the exit map is a read-only proxy, which can't be pickled
+        state, slots = super().__getstate__()
+        slots['_exit_map'] = None
+        return state, slots
+
+    @property
+    def inventory(self) -> 'Inventory':
+        if self._inventory is None:
+            self._inventory = Inventory(self)
+        return self._inventory
+
+    @inventory.setter
+    def inventory(self, inventory: 'Inventory'):
+        # a reloaded room takes over the old one's inventory and all in it
+        inventory.holder = self
+        for item in inventory.objects.values():
+            item.owner = self
+        self._inventory = inventory
+
+    def is_empty(self) -> bool:
+        """True if nothing at all is in the room."""
+        return self._inventory is None or not self._inventory.inventory
+
     def add_exit(self, ex:Exit):
-        self.exits.add(ex)
+        self.exits.append(ex)
+        self._exit_map = None
+
+    @property
+    def exit_map(self) -> Mapping[str, Exit]:
+        if self._exit_map is None:
+            exits = {ex.name: ex for ex in self.exits}
+            for short, full in EXIT_ABBREVIATIONS.items():
+                if full in exits and short not in exits:
+                    exits[short] = exits[full]
+            self._exit_map = MappingProxyType(exits)
+        return self._exit_map
 
     def get_exits(self) -> Dict[str, Exit]:
         exits = {}
@@ -64,33 +145,122 @@ class Room(Entity):
             exits[ex.name] = ex
         return exits
 
-    def get_exit(self, ex) -> Exit:
-        return self.get_exits()[ex]
+    def get_exit(self, ex) -> Optional[Exit]:
+        """The exit called or abbreviated 'ex', None if there isn't one."""
+        return self.exit_map.get(ex)
 
     def has_exit(self, ex: str) -> bool:
-        if ex in self.get_exits().keys():
-            return True
-        return False
+        return ex in self.exit_map
 
 
 class Inventory(object):
-    def __init__(self):
+    """The entities in a room, also split into players, creatures and
+    objects, each with a KeywordIndex, so code that wants one kind or one
+    name doesn't have to walk everything in the room.
+
+    Objects put here have their 'owner' set to the room, like the items a
+    player carries or a container holds, so whatever has an object can be
+    found from the object.
+    """
+    __slots__ = ('holder', 'inventory', 'players', 'creatures', 'objects',
+                 'player_keywords', 'creature_keywords', 'object_keywords')
+
+    def __init__(self, holder: Optional[Entity] = None):
+        # the room this is the inventory of
+        self.holder = holder
+        # entity id -> entity, for everything here and for each kind
         self.inventory = {}
+        self.players = {}
+        self.creatures = {}
+        self.objects = {}
+        self.player_keywords = KeywordIndex()
+        self.creature_keywords = KeywordIndex()
+        self.object_keywords = KeywordIndex()
+
+    def __getstate__(self):
+        # the ids won't mean anything where the room is unpickled
+        return self.holder, list(self.inventory.values())
+
+    def __setstate__(self, state):
+        holder, items = state
+        self.__init__(holder)
+        for item in items:
+            self.add_item(item)
 
     def add_item(self, item: Entity) -> str:
-        self.inventory[item.uuid] = item
+        items, keywords = self._partition(item)
+        self.inventory[item.id] = item
+        items[item.id] = item
+        keywords.add(item)
+        if items is self.objects:
+            item.owner = self.holder
         return f"{item.name} added!"
 
     def remove_item(self, item: Entity) -> str:
-        i = self.inventory.get(item.uuid)
-        if i:
-            self.inventory.pop(item.uuid)
+        items, keywords = self._partition(item)
+        if items.pop(item.id, None) is not None:
+            del self.inventory[item.id]
+            keywords.remove(item)
+            if items is self.objects and item.owner is self.holder:
+                item.owner = None
             return f"{item.name} removed!"
         else:
             return f"Inventory does not contain {item.name}"
 
     def has_item(self, item: Entity) -> bool:
-        return self.inventory.get(item.uuid) != False
+        return self.inventory.get(item.id) is item
 
-    def get_items(self) -> Dict[str, Entity]:
+    def get_items(self) -> Dict[int, Entity]:
         return self.inventory.items()
+
+    def get_players(self):
+        return self.players.values()
+
+    def get_creatures(self):
+        return self.creatures.values()
+
+    def get_objects(self):
+        return self.objects.values()
+
+    def get_things(self) -> List[Entity]:
+        """Everything here that isn't a player."""
+        return [*self.creatures.values(), *self.objects.values()]
+
+    def find_player(self, name: str):
+        """A player here whose name is or starts with 'name'."""
+        return self._find(name, self.player_keywords)
+
+    def find_living(self, name: str):
+        """A player or creature here whose name is or starts with 'name'."""
+        return self._find(name, self.player_keywords, self.creature_keywords)
+
+    def find_object(self, name: str):
+        """An object here with a name or alias that is or starts with 'name'."""
+        return self._find(name, self.object_keywords)
+
+    def find(self, name: str):
+        """Anything here with a name or alias that is or starts with 'name'."""
+        return self._find(name, self.player_keywords, self.creature_keywords,
+                          self.object_keywords)
+
+    @staticmethod
+    def _find(name, *indexes):
+        if not name:
+            return None
+        # an exact match anywhere beats a prefix match
+        for index in indexes:
+            found = index.exact(name)
+            if found is not None:
+                return found
+        for index in indexes:
+            found = index.prefix(name)
+            if found is not None:
+                return found
+        return None
+
+    def _partition(self, item):
+        if getattr(item, 'is_player', False):
+            return self.players, self.player_keywords
+        if getattr(item, 'is_living', False):
+            return self.creatures, self.creature_keywords
+        return self.objects, self.object_keywords
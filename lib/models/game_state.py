@@ -4,6 +4,8 @@ from typing import Dict
 
 from mudserver import MudServer
 from lib.models.player import Player
+from lib.scheduler import TimerWheel
+from server.server_enums import MessagePriority
 
 # TODO: Is there too much in this class now?
 # The util didn't make sense anymore, because it was too tightly linked
@@ -14,16 +16,43 @@ class GameState(object):
     def __init__(self, server: MudServer):
         self.server = server
         self.players: Dict[str, Player] = {}
+        # the same players keyed by their connection's uuid and by
+        # lowercased name, so lookups don't have to scan every player.
+        # Linkdead players keep their name entry but lose their client one
+        self.players_by_client: Dict[str, Player] = {}
+        self.players_by_name: Dict[str, Player] = {}
         self.rooms = {}  # Initialize rooms dictionary
+        # timers run by the game loop between ticks
+        self.scheduler = TimerWheel()
 
-    def update(self):
-        self.server.update()
+    def update(self, timeout=0):
+        self.server.update(timeout)
 
     def add_player(self, player: Player):
+        if player.name and self.players_by_name.get(player.name.lower()) is player:
+            # a reconnecting player's uuid follows their new client, so drop
+            # the entry filed under the old one
+            for key, existing in list(self.players.items()):
+                if existing is player and key != player.uuid:
+                    del self.players[key]
         self.players[player.uuid] = player
+        if player.client:
+            self.players_by_client[player.client.uuid] = player
+        if player.name:
+            self.players_by_name[player.name.lower()] = player
 
     def remove_player(self, player: Player):
         del(self.players[player.uuid])
+        self.set_linkdead(player)
+        if player.name and self.players_by_name.get(player.name.lower()) is player:
+            del self.players_by_name[player.name.lower()]
+
+    def set_linkdead(self, player: Player):
+        """Forget the player's connection while they stay in the game.
+        'add_player' indexes the new one when they reconnect.
+        """
+        if player.client and self.players_by_client.get(player.client.uuid) is player:
+            del self.players_by_client[player.client.uuid]
 
     def list_players(self):
         for player in self.players.values():
@@ -53,23 +82,30 @@ class GameState(object):
 
             self.remove_player(disconnected_player)
 
-    def tell_player(self, player: Player, message: str):
+    def tell_player(self, player: Player, message: str, priority=MessagePriority.NORMAL):
         """Send a message to a specific player if they have a valid connection."""
         # Check if player has a valid client connection
         if player.client and hasattr(player.client, 'uuid'):
-            self.server.send_message(player.client.uuid, message)
+            self.server.send_message(player.client.uuid, message, priority)
         else:
             # Player has no active connection (e.g., linkdead or loading)
             log.debug(f"Cannot send message to {getattr(player, 'name', 'Unknown')} - no active client connection")
 
+    def tell_players(self, players, message: str, priority=MessagePriority.NORMAL):
+        """Send the same message to several players, encoding it once."""
+        self.server.broadcast(
+            [player.client.uuid for player in players
+             if player.client and hasattr(player.client, 'uuid')],
+            message, priority)
+
     def broadcast(self, message: str):
         """Broadcast a message to all connected players."""
-        for player in self.players.values():
-            self.tell_player(player, message)
+        self.tell_players(self.players.values(), message)
         log.info(message)
 
     def find_player_by_client_id(self, client_id: str) -> Player:
-        for player_id, player in self.players.items():
-            # Check if player has a client before accessing uuid
-            if player.client and hasattr(player.client, 'uuid') and player.client.uuid == client_id:
-                return player
\ No newline at end of file
+        return self.players_by_client.get(client_id)
+
+    def find_player_by_name(self, name: str) -> Player:
+        """Find a player in the game, linkdead or not, by name in any case."""
+        return self.players_by_name.get(name.lower())
\ No newline at end of file
@@ -1,9 +1,12 @@
 """Base classes for game objects"""
 
-import uuid
+import copy
+from types import MappingProxyType
 from typing import Optional, Dict, Any
 from enum import Enum
 
+from lib.entity_registry import entities, state_without_id
+
 class ObjectType(Enum):
     WEAPON = "weapon"
     ARMOR = "armor"
@@ -26,7 +29,28 @@ class ArmorSlot(Enum):
     OTHER = "other"
 
 class GameObject:
-    """Base class for all game objects."""
+    """Base class for all game objects.
+
+    An object made from an ObjectPrototype starts out with almost nothing
+    set. Reading an attribute it has no value for finds the one shared by
+    every object from the same template, and writing one gives this object
+    its own value.
+
+    Every kind of object is made that way unless its class sets
+    'prototype' to False, as one that sets things up differently for each
+    object, like the Spirit of Gerkin's random cooldown, has to.
+    """
+    # see Entity: slots for what every object has, '__dict__' for
+    # attributes set on the fly like takeable
+    __slots__ = ('_proto', '_id', 'name', 'description', 'weight', 'value',
+                 'object_type', 'kept', 'owner', '__dict__', '__weakref__')
+    
+    # how many identical units this object stands for. Only objects with a
+    # 'stack_key' ever have more than one, and keep it in a slot of their own
+    quantity = 1
+    
+    # objects of this class can come from a shared ObjectPrototype
+    prototype = True
     
     def __init__(self, 
                  name: str,
@@ -35,7 +59,8 @@ class GameObject:
                  value: int = 0,
                  object_type: ObjectType = ObjectType.MISC,
                  kept: bool = False):
-        self.uuid = uuid.uuid4()
+        self._proto = None
+        self._id = None
         self.name = name
         self.description = description
         self.weight = weight
@@ -43,12 +68,63 @@ class GameObject:
         self.object_type = object_type
         self.kept = kept  # Marked with * in inventory
         self.owner = None  # Player/container holding this
+    
+    def __getattr__(self, name):
+        # only called when the object has no value of its own
+        if name != '_proto' and self._proto is not None:
+            try:
+                return self._proto.fields[name]
+            except KeyError:
+                pass
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+    
+    @property
+    def id(self) -> int:
+        """This object's id in the entity registry, given out on first use."""
+        if self._id is None:
+            self._id = entities.register(self)
+        return self._id
+    
+    def __getstate__(self):
+        # see Entity, a copy gets its own id
+        return state_without_id(self)
         
     def get_display_name(self) -> str:
         """Get name as displayed in inventory."""
+        name = self.name
+        if self.quantity > 1:
+            name = f"{self.quantity} {name}"
         if self.kept:
-            return f"* {self.name}"
-        return self.name
+            return f"* {name}"
+        return name
+    
+    def stack_key(self) -> Optional[tuple]:
+        """Objects with the same key are interchangeable, and carrying more
+        than one makes them a single stack. None for objects that never
+        stack.
+        """
+        return None
+    
+    def split(self, count: int = 1) -> 'GameObject':
+        """Take 'count' units off this stack as an object of their own.
+        Asking for all of them returns the stack itself.
+        """
+        if count >= self.quantity:
+            return self
+        part = copy.copy(self)
+        part.quantity = count
+        self.quantity -= count
+        return part
+    
+    def merge(self, other: 'GameObject'):
+        """Add the units of 'other', which has the same stack key, to this
+        stack. 'other' shouldn't be used after.
+        """
+        self.quantity += other.quantity
+    
+    def used_up(self) -> bool:
+        """True once a successful 'use' has left nothing of this object."""
+        return False
     
     def examine(self) -> str:
         """Return detailed examination text."""
@@ -57,6 +133,8 @@ class GameObject:
 class Weapon(GameObject):
     """Weapon objects."""
     
+    __slots__ = ('damage', 'weapon_type', 'wielded')
+    
     def __init__(self,
                  name: str,
                  description: str,
@@ -76,6 +154,8 @@ class Weapon(GameObject):
 class Armor(GameObject):
     """Armor objects."""
     
+    __slots__ = ('armor_class', 'slot', 'worn')
+    
     def __init__(self,
                  name: str,
                  description: str,
@@ -93,7 +173,13 @@ class Armor(GameObject):
         return f"{self.description}\nArmor class: {self.armor_class}\nWorn on: {self.slot.value}"
 
 class Consumable(GameObject):
-    """Consumable items like heals and wands."""
+    """Consumable items like heals and wands.
+    
+    Consumables with the same name and charges left stack. Each unit has
+    its own 'charges', so using one means splitting it off first.
+    """
+    
+    __slots__ = ('charges', 'max_charges', 'quantity')
     
     def __init__(self,
                  name: str,
@@ -105,6 +191,10 @@ class Consumable(GameObject):
         super().__init__(name, description, weight, value, ObjectType.CONSUMABLE, **kwargs)
         self.charges = charges
         self.max_charges = charges
+        self.quantity = 1
+    
+    def stack_key(self) -> Optional[tuple]:
+        return (type(self), self.name, self.charges, self.max_charges)
     
     def use(self, user) -> tuple[bool, str]:
         """Use the consumable. Return (success, message)."""
@@ -114,6 +204,9 @@ class Consumable(GameObject):
         self.charges -= 1
         return True, f"You use the {self.name}."
     
+    def used_up(self) -> bool:
+        return self.charges <= 0
+    
     def combine_with(self, other: 'Consumable') -> bool:
         """Combine with another consumable of same type."""
         if self.name != other.name:
@@ -132,6 +225,8 @@ class Consumable(GameObject):
 class Heal(Consumable):
     """Healing items."""
     
+    __slots__ = ('heal_amount',)
+    
     def __init__(self,
                  amount: int,
                  **kwargs):
@@ -158,6 +253,8 @@ class Heal(Consumable):
 class Wand(Consumable):
     """Wand items with charges."""
     
+    __slots__ = ('sp_cost', 'damage')
+    
     def __init__(self,
                  charges: int = 10,
                  sp_cost: int = 5,
@@ -186,7 +283,13 @@ class Wand(Consumable):
         return True, f"You zap {target.name} with the wand! [{self.charges} charges left]"
 
 class Blood(GameObject):
-    """Blood items from kills - cannot be sold."""
+    """Blood items from kills - cannot be sold.
+    
+    Blood of the same victim stacks, so a killer carries one object per
+    player they have killed however often they killed them.
+    """
+    
+    __slots__ = ('victim_name', 'sellable', 'quantity')
     
     def __init__(self, victim_name: str, **kwargs):
         name = f"blood of {victim_name}"
@@ -194,6 +297,10 @@ class Blood(GameObject):
         super().__init__(name, description, weight=0, value=0, object_type=ObjectType.SPECIAL, **kwargs)
         self.victim_name = victim_name
         self.sellable = False
+        self.quantity = 1
+    
+    def stack_key(self) -> Optional[tuple]:
+        return (Blood, self.victim_name)
     
     def use(self, user) -> tuple[bool, str]:
         """Lick the blood for full heal (Kamikaze only)."""
@@ -206,13 +313,19 @@ class Blood(GameObject):
         
         # Remove the blood
         if self.owner:
-            self.owner.inventory.remove_item(self)
+            self.owner.inventory.take(self)
         
         return True, f"You lick the {self.name} and feel completely restored!"
+    
+    def used_up(self) -> bool:
+        # licking it finishes it
+        return True
 
 class Container(GameObject):
     """Container objects that can hold other items."""
     
+    __slots__ = ('capacity', 'contents')
+    
     def __init__(self,
                  name: str,
                  description: str,
@@ -248,4 +361,80 @@ class Container(GameObject):
                 text += f"\n  {item.get_display_name()}"
         else:
             text += "\nIt is empty."
-        return text
\ No newline at end of file
+        return text
+
+
+def _immutable(value) -> bool:
+    if isinstance(value, tuple):
+        return all(_immutable(item) for item in value)
+    return value is None or isinstance(value, (str, int, float, bytes, frozenset, Enum))
+
+
+def _slots(cls):
+    for klass in cls.__mro__:
+        slots = vars(klass).get('__slots__', ())
+        yield from ((slots,) if isinstance(slots, str) else slots)
+
+
+class ObjectPrototype:
+    """The fields every object from one template shares.
+
+    Made from one object built by the template. 'instantiate' then
+    allocates an object that reads everything from here until it is
+    changed, so a hundred iron swords share one name, description and
+    damage rating, and making one costs little more than the allocation.
+    """
+    __slots__ = ('cls', 'fields', 'fresh')
+    
+    def __init__(self, cls: type, fields: Dict[str, Any]):
+        self.cls = cls
+        self.fields = MappingProxyType(fields)
+        # lists and the like get changed in place, so each object needs its own
+        self.fresh = tuple((name, value) for name, value in fields.items()
+                           if isinstance(value, (list, dict, set)))
+    
+    @classmethod
+    def from_object(cls, obj: GameObject) -> Optional['ObjectPrototype']:
+        """A prototype with obj's fields, or None if its class doesn't
+        allow prototypes or any of its fields can't be shared or copied
+        for each new object.
+        """
+        if not type(obj).prototype:
+            return None
+        fields = {}
+        for name in _slots(type(obj)):
+            if name in ('_proto', '_id', '__dict__', '__weakref__'):
+                continue
+            try:
+                fields[name] = getattr(obj, name)
+            except AttributeError:
+                continue
+        fields.update(vars(obj))
+        
+        for value in fields.values():
+            if isinstance(value, dict):
+                value = tuple(value.items())
+            elif isinstance(value, (list, set)):
+                value = tuple(value)
+            if not _immutable(value):
+                return None
+        return cls(type(obj), fields)
+    
+    def __reduce__(self):
+        # the mapping proxy can't be pickled, the dict behind it can
+        return (type(self), (self.cls, dict(self.fields)))
+    
+    def __copy__(self):
+        return self
+    
+    def __deepcopy__(self, memo):
+        # nothing in a prototype changes, copies of an object can share it
+        return self
+    
+    def instantiate(self) -> GameObject:
+        obj = self.cls.__new__(self.cls)
+        obj._proto = self
+        obj._id = None
+        for name, value in self.fresh:
+            setattr(obj, name, type(value)(value))
+        return obj
@@ -6,6 +6,7 @@ from datetime import datetime
 
 from lib.models.creature import Creature
 from lib.inventory import InventoryManager
+from server.server_enums import MessagePriority
 
 log = logging.getLogger(__name__)
 
@@ -101,17 +102,9 @@ class Player(Creature, ABC):
         # Combat
         self.wimpy_percent = kwargs.get('wimpy_percent', 30)  # Default 30%
         self.has_gerkin = False
-        self.blood_inventory = []  # List of player names whose blood we carry
         self.following = None  # Who we're following
         self.wielded_weapon = None  # Current weapon
         
-        # Inventory system
-        self.inventory = kwargs.get('inventory', [])
-        if not isinstance(self.inventory, list):
-            self.inventory = InventoryManager(self)
-        else:
-            self.inventory = InventoryManager(self)
-        
         # Equipment
         self.equipment = kwargs.get('equipment', {})
         
@@ -119,7 +112,6 @@ class Player(Creature, ABC):
         self.plan = kwargs.get('plan', '')  # One-line plan for finger
         self.watched_by = set()  # Players watching this player
         self.watching = set()  # Players this player is watching
-        self.watching_war = False  # Watching war from observation room
         
         # Channels
         self.channels_on = {
@@ -212,6 +204,9 @@ class Player(Creature, ABC):
             self.current_hp = kwargs.get('health', kwargs.get('current_hp', self.max_hp))
             self.health = self.current_hp  # Alias for compatibility
             
+        # Inventory system. Set after Creature.__init__, which sets its own
+        self.inventory = InventoryManager(self)
+        
         # Set location - ghosts start in warroom
         if isinstance(location, str):
             self._location = location
@@ -235,14 +230,24 @@ class Player(Creature, ABC):
         """Get the player's UUID - prefer client_id if available."""
         if self.client_id:
             return self.client_id
-        # Fall back to the UUID set by Entity.__init__
-        return getattr(self, '_uuid_backup', None)
+        # Fall back to a UUID set on the player, or their entity id
+        backup = getattr(self, '_uuid_backup', None)
+        return backup if backup is not None else self.id
     
     @uuid.setter
     def uuid(self, value):
         """Set the UUID - store it as backup since we prefer client_id."""
         self._uuid_backup = value
 
+    @property
+    def blood_inventory(self):
+        """Names of the players whose blood we carry, once for each blood,
+        so a stack of three is the name three times.
+        """
+        return [item.victim_name for item in self.inventory.get_all_items()
+                if hasattr(item, 'victim_name')
+                for _ in range(item.quantity)]
+
     @property
     def location(self):
         """Get the player's location."""
@@ -253,10 +258,10 @@ class Player(Creature, ABC):
         """Set the player's location."""
         self._location = value
 
-    def message(self, message):
+    def message(self, message, priority=MessagePriority.NORMAL):
         """Send a message to this player."""
         if self.server and self.client and hasattr(self.client, 'uuid'):
-            self.server.send_message(self.client.uuid, message)
+            self.server.send_message(self.client.uuid, message, priority)
         else:
             # Player has no active connection
             log.debug(f"Cannot send message to {self.name} - no active client connection")
@@ -3,15 +3,42 @@
 import os
 import importlib.util
 import logging
-from typing import Dict, Optional, Type
+import marshal
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Type
+
+from lib.models.objects import GameObject, ObjectPrototype
 
 log = logging.getLogger(__name__)
 
+
+def _compile_in_worker(filepath: str):
+    """Runs in a pool worker. Returns the file's compiled code, marshalled,
+    and None, or None and the error if it doesn't compile.
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            source = f.read()
+        return marshal.dumps(compile(source, filepath, 'exec', dont_inherit=True)), None
+    except Exception as e:
+        return None, str(e)
+
 class ObjectLoader:
     """Loads objects from individual Python files."""
     
-    def __init__(self):
+    def __init__(self, workers: int = 0):
         self.object_templates = {}  # name -> object class/factory
+        # processes to compile object files in at boot. Templates are
+        # classes and factories that can't be pickled, so the modules are
+        # still run here
+        self.workers = workers
+        self._compiled = {}
+        # template name -> the fields every object it makes shares, made
+        # the first time the template is used. None for templates whose
+        # objects can't share one
+        self.prototypes: Dict[str, Optional[ObjectPrototype]] = {}
+        # object file -> the names of the templates it held when last loaded
+        self.file_templates: Dict[str, List[str]] = {}
         self.object_dirs = [
             'lib/objects/weapons',
             'lib/objects/armor',
@@ -28,15 +55,39 @@ class ObjectLoader:
         for obj_dir in self.object_dirs:
             os.makedirs(obj_dir, exist_ok=True)
         
+        if self.workers:
+            self._compile_all()
+        
         for obj_dir in self.object_dirs:
             if os.path.exists(obj_dir):
                 loaded = self._load_directory(obj_dir)
                 total_loaded += loaded
                 log.info(f"Loaded {loaded} objects from {obj_dir}")
         
+        self._compiled = {}
         log.info(f"Total object templates loaded: {len(self.object_templates)}")
         return self.object_templates
     
+    def _compile_all(self):
+        """Compile every object file across a pool of worker processes."""
+        files = []
+        for obj_dir in self.object_dirs:
+            for root, dirs, names in os.walk(obj_dir):
+                dirs[:] = [d for d in dirs if d != '__pycache__']
+                files.extend(os.path.join(root, name) for name in names
+                             if name.endswith('.py') and name != '__init__.py')
+        if len(files) < 2:
+            return
+        
+        with ProcessPoolExecutor(self.workers) as pool:
+            chunksize = max(1, len(files) // (self.workers * 4))
+            results = pool.map(_compile_in_worker, files, chunksize=chunksize)
+            for filepath, (payload, error) in zip(files, results):
+                # a file that didn't compile is loaded as usual, which
+                # logs the error
+                if error is None:
+                    self._compiled[filepath] = marshal.loads(payload)
+    
     def _load_directory(self, directory: str, recursive: bool = True) -> int:
         """Load all object files from a directory."""
         loaded = 0
@@ -53,23 +104,26 @@ class ObjectLoader:
             # Handle Python files
             elif item.endswith('.py') and item != '__init__.py':
                 try:
-                    obj_template = self._load_object_file(item_path)
-                    if obj_template:
-                        # Objects can register multiple templates
-                        if isinstance(obj_template, dict):
-                            for name, template in obj_template.items():
-                                self.object_templates[name] = template
-                                loaded += 1
-                        else:
-                            # Single object
-                            name = os.path.splitext(os.path.basename(item_path))[0]
-                            self.object_templates[name] = obj_template
-                            loaded += 1
+                    templates = self._templates_in(item_path, self._load_object_file(item_path))
+                    self._add_templates(templates)
+                    self.file_templates[item_path] = list(templates)
+                    loaded += len(templates)
                 except Exception as e:
                     log.error(f"Error loading object from {item_path}: {e}")
         
         return loaded
     
+    @staticmethod
+    def _templates_in(filepath: str, obj_template) -> Dict[str, Type]:
+        """The templates a file's load() returned, by name."""
+        if not obj_template:
+            return {}
+        # Objects can register multiple templates
+        if isinstance(obj_template, dict):
+            return dict(obj_template)
+        # Single object
+        return {os.path.splitext(os.path.basename(filepath))[0]: obj_template}
+    
     def _load_object_file(self, filepath: str):
         """Load object template(s) from a Python file."""
         module_name = os.path.splitext(os.path.basename(filepath))[0]
@@ -80,7 +134,11 @@ class ObjectLoader:
             return None
         
         module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
+        code = self._compiled.pop(filepath, None)
+        if code is not None:
+            exec(code, module.__dict__)
+        else:
+            spec.loader.exec_module(module)
         
         # Look for load() function
         if hasattr(module, 'load'):
@@ -89,6 +147,30 @@ class ObjectLoader:
             log.warning(f"{filepath} does not have a load() function")
             return None
     
+    def _add_templates(self, templates: Dict[str, Type]):
+        self.object_templates.update(templates)
+        for name in templates:
+            self.prototypes.pop(name, None)
+    
+    def _make_prototype(self, template) -> Optional[ObjectPrototype]:
+        """A prototype for the objects 'template' makes, or None if they
+        can't share one. The template is run twice, and a template that
+        doesn't make the same object both times, say one picking a random
+        damage, gets no prototype.
+        """
+        try:
+            first, second = template(), template()
+        except Exception:
+            # needs arguments, like a corpse
+            return None
+        if not isinstance(first, GameObject) or type(second) is not type(first):
+            return None
+        prototype = ObjectPrototype.from_object(first)
+        other = ObjectPrototype.from_object(second)
+        if prototype is None or other is None or dict(prototype.fields) != dict(other.fields):
+            return None
+        return prototype
+    
     def create_object(self, template_name: str, **kwargs):
         """Create an instance of an object from a template."""
         if template_name not in self.object_templates:
@@ -97,6 +179,13 @@ class ObjectLoader:
         
         template = self.object_templates[template_name]
         
+        if not kwargs:
+            if template_name not in self.prototypes:
+                self.prototypes[template_name] = self._make_prototype(template)
+            prototype = self.prototypes[template_name]
+            if prototype:
+                return prototype.instantiate()
+        
         # If template is a class, instantiate it
         if isinstance(template, type):
             return template(**kwargs)
@@ -110,25 +199,31 @@ class ObjectLoader:
     def reload_object(self, template_name: str) -> bool:
         """Reload a specific object template."""
         # Find which file contains this template
-        for obj_dir in self.object_dirs:
-            if not os.path.exists(obj_dir):
-                continue
-                
-            for item in os.listdir(obj_dir):
-                if item.endswith('.py') and item != '__init__.py':
-                    item_path = os.path.join(obj_dir, item)
-                    try:
-                        # Load and check if it contains our template
-                        obj_template = self._load_object_file(item_path)
-                        if isinstance(obj_template, dict) and template_name in obj_template:
-                            self.object_templates[template_name] = obj_template[template_name]
-                            log.info(f"Reloaded object template {template_name}")
-                            return True
-                        elif os.path.splitext(item)[0] == template_name:
-                            self.object_templates[template_name] = obj_template
-                            log.info(f"Reloaded object template {template_name}")
-                            return True
-                    except:
-                        pass
+        for filepath, names in self.file_templates.items():
+            if template_name in names:
+                return self.reload_file(filepath) and template_name in self.object_templates
+        return False
+    
+    def reload_file(self, filepath: str) -> bool:
+        """Bring the templates from a changed, new or deleted object file up
+        to date. Objects already made from the old templates are left as
+        they are.
+        """
+        filepath = os.path.normpath(filepath)
+        templates = {}
+        if os.path.exists(filepath):
+            try:
+                templates = self._templates_in(filepath, self._load_object_file(filepath))
+            except Exception as e:
+                log.error(f"Error reloading objects from {filepath}: {e}")
+                return False
         
-        return False
\ No newline at end of file
+        for name in self.file_templates.pop(filepath, []):
+            if name not in templates:
+                self.object_templates.pop(name, None)
+                self.prototypes.pop(name, None)
+        self._add_templates(templates)
+        if templates:
+            self.file_templates[filepath] = list(templates)
+        log.info(f"Reloaded {filepath} ({len(templates)} templates)")
+        return True
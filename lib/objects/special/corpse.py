@@ -5,6 +5,10 @@ from lib.models.objects import Container, GameObject
 
 class Corpse(Container):
     """A corpse that holds a dead player's inventory."""
+    __slots__ = ('player_name', 'player_level', 'decay_time', 'created_at', 'sellable',
+                 'takeable', 'decay_messages')
+    # each corpse is someone's, and decays from when it was made
+    prototype = False
     
     def __init__(self, player_name: str, player_level: int = 1, **kwargs):
         name = f"corpse of {player_name}"
@@ -61,15 +65,15 @@ class Corpse(Container):
     def loot_all(self, looter) -> list:
         """Loot all items from corpse."""
         looted = []
-        items_to_loot = self.contents.copy()
         
-        for item in items_to_loot:
+        for item in self.contents:
             if looter.inventory.add_item(item):
-                self.remove_item(item)
                 looted.append(item)
             else:
                 break  # Inventory full
         
+        # what was looted is always from the front, take it out in one go
+        del self.contents[:len(looted)]
         return looted
 
 def load():
@@ -8,6 +8,9 @@ from typing import Optional
 class SpiritOfGerkin(GameObject):
     """The Spirit of Gerkin - grants special powers during war."""
     
+    # each spirit rolls its own cooldown
+    prototype = False
+    
     def __init__(self, **kwargs):
         super().__init__(
             name="Spirit of Gerkin",
@@ -44,11 +47,9 @@ class SpiritOfGerkin(GameObject):
         
         # Find target
         from pkwar import game
-        target = None
-        for player in game.list_players():
-            if player.name.lower() == target_name.lower() and not player.is_ghost:
-                target = player
-                break
+        target = game.find_player_by_name(target_name)
+        if target and target.is_ghost:
+            target = None
         
         if not target:
             return False, f"Gerkin cannot find '{target_name}' among the living."
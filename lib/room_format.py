@@ -0,0 +1,118 @@
+"""JSON room files.
+
+A room file written in Python runs code to build its room. Rooms that are
+nothing but text, items and exits can instead go in a JSON area file,
+which holds any number of them and is parsed in one go:
+
+    {
+        "rooms": [
+            {
+                "name": "entrance",
+                "description": "Welcome to PKMUD! ...",
+                "light_level": "BRIGHT",
+                "obscuration": "NONE",
+                "description_items": [
+                    {"name": "torches", "aliases": ["torch"],
+                     "description": "The torches cast dancing shadows."}
+                ],
+                "exits": [
+                    {"name": "down", "description": "Down to the war room.",
+                     "destination": "warroom", "exit_type": "PATH"}
+                ],
+                "attributes": {"special_type": "shop"}
+            }
+        ]
+    }
+
+'light_level', 'obscuration', 'description_items', 'exits' and
+'attributes' can be left out. Enums are given by member name.
+'attributes' are set on the room as they are, for flags like
+'special_type' that commands look for.
+"""
+
+import json
+from typing import List
+
+from lib.models.entity import Room, Exit, DescriptionItem
+from lib.models.enums import ExitType, LightLevel, Obscuration
+
+
+def load_rooms(filepath: str) -> List[Room]:
+    """Every room in a JSON area file."""
+    with open(filepath, encoding='utf-8') as f:
+        data = json.load(f)
+    rooms = []
+    for entry in data['rooms']:
+        room = room_from_dict(entry)
+        room.source_file = filepath
+        rooms.append(room)
+    return rooms
+
+
+def room_from_dict(entry: dict) -> Room:
+    room = Room(
+        name=entry['name'],
+        description=entry['description'],
+        description_items=[
+            DescriptionItem(
+                name=item['name'],
+                aliases=item.get('aliases', []),
+                description=item['description']
+            )
+            for item in entry.get('description_items', [])
+        ],
+        light_level=LightLevel[entry.get('light_level', 'BRIGHT')],
+        obscuration=Obscuration[entry.get('obscuration', 'NONE')]
+    )
+    for ex in entry.get('exits', []):
+        room.add_exit(Exit(
+            name=ex['name'],
+            description=ex['description'],
+            destination=ex['destination'],
+            exit_type=ExitType[ex.get('exit_type', 'PATH')]
+        ))
+    for key, value in entry.get('attributes', {}).items():
+        setattr(room, key, value)
+    return room
+
+
+def room_to_dict(room: Room) -> dict:
+    """The JSON form of 'room'. Raises ValueError for a room that can't be
+    written as JSON, such as a Room subclass or one with attributes JSON
+    can't hold.
+    """
+    if type(room) is not Room:
+        raise ValueError(f"{room.name} is a {type(room).__name__}, not a plain Room")
+
+    entry = {'name': room.name, 'description': room.description}
+    if room.light_level is not LightLevel.BRIGHT:
+        entry['light_level'] = room.light_level.name
+    if room.obscuration is not Obscuration.NONE:
+        entry['obscuration'] = room.obscuration.name
+    if room.description_items:
+        entry['description_items'] = [
+            {'name': item.name, 'aliases': list(item.aliases or []),
+             'description': item.description}
+            for item in room.description_items
+        ]
+    # what Room and Exit always have lives in slots, so vars() is just
+    # what was set on top
+    for ex in room.exits:
+        if type(ex) is not Exit or vars(ex):
+            raise ValueError(f"{room.name} has an exit '{ex.name}' with custom behaviour")
+    if room.exits:
+        entry['exits'] = [
+            {'name': ex.name, 'description': ex.description,
+             'destination': ex.destination, 'exit_type': ex.type.name}
+            for ex in room.exits
+        ]
+
+    attributes = {key: value for key, value in vars(room).items()
+                  if key != 'source_file'}
+    if attributes:
+        try:
+            json.dumps(attributes)
+        except TypeError as e:
+            raise ValueError(f"{room.name} has attributes JSON can't hold: {e}")
+        entry['attributes'] = attributes
+    return entry
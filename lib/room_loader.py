@@ -3,67 +3,234 @@
 import os
 import importlib.util
 import logging
-from typing import Dict, Optional
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
 from lib.models.entity import Room
+from lib.room_format import load_rooms
+from lib.room_registry import DEFAULT_IDLE_TIMEOUT, Area, RoomRegistry
+from lib.world_snapshot import DEFAULT_SNAPSHOT, WorldSnapshot
 
 log = logging.getLogger(__name__)
 
+# stands in for a file that raised while loading
+_FAILED = object()
+
+
+def _load_room_in_worker(filepath: str):
+    """Runs in a pool worker. Returns the file's rooms pickled and None, or
+    None and the error if loading failed. Both are None when the rooms
+    loaded but can't be pickled, so the main process has to load them itself.
+    """
+    try:
+        rooms = RoomLoader(snapshot_path=None)._load_file(filepath)
+    except Exception as e:
+        return None, str(e)
+    try:
+        return pickle.dumps(rooms, pickle.HIGHEST_PROTOCOL), None
+    except Exception:
+        return None, None
+
+
 class RoomLoader:
-    """Loads rooms from individual Python files."""
+    """Loads rooms from individual Python files and JSON area files."""
     
-    def __init__(self):
-        self.rooms: Dict[str, Room] = {}
+    def __init__(self, snapshot_path: Optional[str] = DEFAULT_SNAPSHOT,
+                 idle_timeout: Optional[float] = DEFAULT_IDLE_TIMEOUT,
+                 workers: int = 0):
+        self.rooms = RoomRegistry(self, idle_timeout)
+        # processes to load changed room files in at boot, 0 loads them
+        # one at a time in this process
+        self.workers = workers
+        self._pool = None
+        # always loaded
         self.room_dirs = [
-            'lib/rooms',
+            'lib/rooms'
+        ]
+        # each subdirectory is an area, loaded when a player first gets there
+        self.area_dirs = [
             'lib/areas',
             'lib/wizrooms'
         ]
+        # room file -> the names of the rooms it held when last loaded
+        self.file_rooms: Dict[str, List[str]] = {}
+        # rooms from the last boot, used for any file that hasn't changed.
+        # None loads everything from source
+        self.snapshot = WorldSnapshot(snapshot_path) if snapshot_path else None
     
-    def load_all_rooms(self) -> Dict[str, Room]:
-        """Load all rooms from all directories."""
+    def load_all_rooms(self) -> RoomRegistry:
+        """Load the core rooms and the manifest of every area."""
         total_loaded = 0
         
-        for room_dir in self.room_dirs:
-            if os.path.exists(room_dir):
-                loaded = self._load_directory(room_dir)
-                total_loaded += loaded
-                log.info(f"Loaded {loaded} rooms from {room_dir}")
+        if self.snapshot:
+            self.snapshot.load()
+        if self.workers:
+            self._pool = ProcessPoolExecutor(self.workers)
         
-        # Load backbone rooms
-        self._create_backbone_rooms()
+        try:
+            for room_dir in self.room_dirs:
+                if os.path.exists(room_dir):
+                    loaded = self._load_directory(room_dir)
+                    total_loaded += loaded
+                    log.info(f"Loaded {loaded} rooms from {room_dir}")
+            
+            # Load backbone rooms
+            self._create_backbone_rooms()
+            
+            # Load arena rooms
+            self._create_arena_rooms()
+            
+            areas = []
+            for area_dir in self.area_dirs:
+                if os.path.exists(area_dir):
+                    areas.extend(self._find_areas(area_dir))
+            self._add_areas(areas)
+        finally:
+            if self._pool:
+                self._pool.shutdown()
+                self._pool = None
         
-        # Load arena rooms
-        self._create_arena_rooms()
+        if self.snapshot:
+            log.info(f"World snapshot: {self.snapshot.hits} files unchanged, "
+                     f"{self.snapshot.misses} loaded from source")
+            self.snapshot.save()
+            # areas load from source later on, don't keep their rooms
+            # in memory through the snapshot
+            self.snapshot.release()
         
-        log.info(f"Total rooms loaded: {len(self.rooms)}")
+        log.info(f"Total rooms: {len(self.rooms)}, "
+                 f"{len(self.rooms.loaded_rooms())} loaded")
         return self.rooms
     
-    def _load_directory(self, directory: str, recursive: bool = True) -> int:
+    def _find_areas(self, directory: str) -> List[Area]:
+        """Each subdirectory of 'directory' is an area. Loose room files in
+        'directory' make up an area of their own.
+        """
+        areas = []
+        loose = []
+        for item in sorted(os.listdir(directory)):
+            item_path = os.path.join(directory, item)
+            if os.path.isdir(item_path):
+                if item != '__pycache__' and not item.startswith('.'):
+                    areas.append(Area(item_path, self._room_files(item_path)))
+            elif self._is_room_file(item):
+                loose.append(item_path)
+        if loose:
+            areas.append(Area(directory, loose))
+        return areas
+    
+    def _add_areas(self, areas: List[Area]):
+        # the room names come from the snapshot where the file hasn't
+        # changed. The rooms themselves are let go until the area is used
+        rooms = self._load_files([filepath for area in areas for filepath in area.files])
+        for area in areas:
+            names = [room.name for filepath in area.files
+                     for room in rooms.get(filepath, [])]
+            self.rooms.add_area(area, names)
+            log.info(f"Found {len(names)} rooms in area {area.name}")
+    
+    def _room_files(self, directory: str) -> List[str]:
+        files = []
+        for item in sorted(os.listdir(directory)):
+            item_path = os.path.join(directory, item)
+            if os.path.isdir(item_path):
+                if item != '__pycache__':
+                    files.extend(self._room_files(item_path))
+            elif self._is_room_file(item):
+                files.append(item_path)
+        return files
+    
+    @staticmethod
+    def _is_room_file(filename: str) -> bool:
+        return (filename.endswith('.json') or
+                (filename.endswith('.py') and filename != '__init__.py'))
+    
+    def load_area_files(self, files: List[str]) -> List[Room]:
+        """The rooms in an area's files, loaded from source."""
+        rooms = []
+        for filepath in files:
+            try:
+                loaded = self._load_file(filepath)
+                self.file_rooms[filepath] = [room.name for room in loaded]
+                rooms.extend(loaded)
+            except Exception as e:
+                log.error(f"Error loading room from {filepath}: {e}")
+        return rooms
+    
+    def _load_directory(self, directory: str) -> int:
         """Load all room files from a directory."""
         loaded = 0
         
-        for item in os.listdir(directory):
-            item_path = os.path.join(directory, item)
-            
-            # Handle subdirectories
-            if os.path.isdir(item_path) and recursive:
-                # Skip __pycache__
-                if item == '__pycache__':
-                    continue
-                loaded += self._load_directory(item_path, recursive=True)
-            
-            # Handle Python files
-            elif item.endswith('.py') and item != '__init__.py':
-                try:
-                    room = self._load_room_file(item_path)
-                    if room:
-                        self.rooms[room.name] = room
-                        loaded += 1
-                except Exception as e:
-                    log.error(f"Error loading room from {item_path}: {e}")
+        for rooms in self._load_files(self._room_files(directory)).values():
+            for room in rooms:
+                self.rooms[room.name] = room
+                loaded += 1
         
         return loaded
     
+    def _load_files(self, files: List[str]) -> Dict[str, List[Room]]:
+        """The rooms in each of 'files', by path. Rooms come from the
+        snapshot where the file hasn't changed, the rest are loaded across
+        the worker pool if there is one. Files that fail to load are logged
+        and left out.
+        """
+        rooms = {}
+        changed = []
+        for filepath in files:
+            cached = self.snapshot.get(filepath) if self.snapshot else None
+            if cached is not None:
+                rooms[filepath] = cached
+                self.file_rooms[filepath] = [room.name for room in cached]
+            elif self._pool and filepath.endswith('.py'):
+                changed.append(filepath)
+            else:
+                # JSON parses faster here than it could be sent back
+                self._loaded(rooms, filepath, self._load_file_logged(filepath))
+        
+        if len(changed) > 1:
+            for filepath, result in self._load_in_pool(changed):
+                self._loaded(rooms, filepath, result)
+        else:
+            for filepath in changed:
+                self._loaded(rooms, filepath, self._load_file_logged(filepath))
+        return rooms
+    
+    def _loaded(self, rooms: Dict[str, List[Room]], filepath: str, result):
+        if result is _FAILED:
+            return
+        rooms[filepath] = result
+        self.file_rooms[filepath] = [room.name for room in result]
+        if self.snapshot:
+            self.snapshot.put(filepath, result)
+    
+    def _load_in_pool(self, files: List[str]):
+        chunksize = max(1, len(files) // (self.workers * 4))
+        results = self._pool.map(_load_room_in_worker, files, chunksize=chunksize)
+        for filepath, (payload, error) in zip(files, results):
+            if error is not None:
+                log.error(f"Error loading room from {filepath}: {error}")
+                yield filepath, _FAILED
+            elif payload is None:
+                # the room couldn't be sent back, most likely because its
+                # file defines its own Room subclass
+                yield filepath, self._load_file_logged(filepath)
+            else:
+                yield filepath, pickle.loads(payload)
+    
+    def _load_file_logged(self, filepath: str):
+        try:
+            return self._load_file(filepath)
+        except Exception as e:
+            log.error(f"Error loading room from {filepath}: {e}")
+            return _FAILED
+    
+    def _load_file(self, filepath: str) -> List[Room]:
+        """The rooms in a room file of either kind."""
+        if filepath.endswith('.json'):
+            return load_rooms(filepath)
+        room = self._load_room_file(filepath)
+        return [room] if room else []
+    
     def _load_room_file(self, filepath: str) -> Optional[Room]:
         """Load a single room from a Python file."""
         # Get module name from filepath
@@ -103,6 +270,14 @@ class RoomLoader:
         from lib.models.entity import Room, Exit, DescriptionItem
         from lib.models.enums import ExitType
         
+        # the arena only changes with this file, which the snapshot checks
+        cached = self.snapshot.get_generated('arena') if self.snapshot else None
+        if cached is not None:
+            for room in cached:
+                self.rooms[room.name] = room
+            return
+        
+        arena = []
         for size in range(1, 10):  # 1x1 up to 9x9
             for x in range(1, size + 1):
                 for y in range(1, size + 1):
@@ -129,7 +304,7 @@ Current arena size: {size}x{size}""",
                     
                     # Add exits within arena bounds
                     if x > 1:
-                        room.exits.append(Exit(
+                        room.add_exit(Exit(
                             name='west',
                             description='West in the arena.',
                             destination=f'arena_{x-1}_{y}',
@@ -137,7 +312,7 @@ Current arena size: {size}x{size}""",
                         ))
                     
                     if x < size:
-                        room.exits.append(Exit(
+                        room.add_exit(Exit(
                             name='east',
                             description='East in the arena.',
                             destination=f'arena_{x+1}_{y}',
@@ -145,7 +320,7 @@ Current arena size: {size}x{size}""",
                         ))
                     
                     if y > 1:
-                        room.exits.append(Exit(
+                        room.add_exit(Exit(
                             name='north',
                             description='North in the arena.',
                             destination=f'arena_{x}_{y-1}',
@@ -153,7 +328,7 @@ Current arena size: {size}x{size}""",
                         ))
                     
                     if y < size:
-                        room.exits.append(Exit(
+                        room.add_exit(Exit(
                             name='south',
                             description='South in the arena.',
                             destination=f'arena_{x}_{y+1}',
@@ -161,6 +336,10 @@ Current arena size: {size}x{size}""",
                         ))
                     
                     self.rooms[room.name] = room
+                    arena.append(room)
+        
+        if self.snapshot:
+            self.snapshot.put_generated('arena', arena)
     
     def reload_room(self, room_name: str) -> bool:
         """Reload a specific room from its source file."""
@@ -174,7 +353,9 @@ Current arena size: {size}x{size}""",
             return False
         
         try:
-            new_room = self._load_room_file(room.source_file)
+            # a JSON file can hold other rooms too
+            new_room = next((new_room for new_room in self._load_file(room.source_file)
+                             if new_room.name == room_name), None)
             if new_room:
                 # Preserve any runtime state
                 if hasattr(room, 'inventory'):
@@ -186,4 +367,45 @@ Current arena size: {size}x{size}""",
         except Exception as e:
             log.error(f"Error reloading room {room_name}: {e}")
         
-        return False
\ No newline at end of file
+        return False
+    
+    def reload_file(self, filepath: str) -> bool:
+        """Bring the rooms from a changed, new or deleted room file up to
+        date. Rooms that are still in it keep their inventories.
+        """
+        filepath = os.path.normpath(filepath)
+        area = self._area_for(filepath)
+        exists = os.path.exists(filepath)
+        try:
+            rooms = self._load_file(filepath) if exists else []
+        except Exception as e:
+            log.error(f"Error reloading rooms from {filepath}: {e}")
+            return False
+        
+        old_names = self.file_rooms.pop(filepath, [])
+        if exists:
+            self.file_rooms[filepath] = [room.name for room in rooms]
+        if area is not None:
+            if exists and filepath not in area.files:
+                area.files.append(filepath)
+            elif not exists and filepath in area.files:
+                area.files.remove(filepath)
+        self.rooms.replace_rooms(old_names, rooms, area)
+        log.info(f"Reloaded {filepath} ({len(rooms)} rooms)")
+        return True
+    
+    def _area_for(self, filepath: str) -> Optional[Area]:
+        """The area a room file belongs to, or None for a core room."""
+        for area_dir in self.area_dirs:
+            area_dir = os.path.normpath(area_dir)
+            if not filepath.startswith(area_dir + os.sep):
+                continue
+            parts = os.path.relpath(filepath, area_dir).split(os.sep)
+            name = os.path.join(area_dir, parts[0]) if len(parts) > 1 else area_dir
+            area = self.rooms.areas.get(name)
+            if area is None:
+                # a new area, which loads like the others once it's used
+                area = Area(name, [])
+                self.rooms.add_area(area, [])
+            return area
+        return None
@@ -0,0 +1,183 @@
+"""All the rooms in the world, with areas loaded on demand.
+
+The core rooms (lib/rooms and the arena) are always loaded. Every other
+area - a directory under lib/areas or lib/wizrooms - only has its room
+names in the manifest until someone looks one of them up, at which point
+the whole area is loaded. An area nobody has used for 'idle_timeout'
+seconds is dropped again, as long as its rooms are empty.
+
+The registry is a mapping from room name to Room, so 'name in rooms',
+'len(rooms)' and iterating over names all work from the manifest without
+loading anything. Anything that reads a room's values loads its area.
+"""
+
+import logging
+import time
+from collections.abc import MutableMapping
+from typing import Dict, List, Optional
+
+from lib.models.entity import Room
+
+log = logging.getLogger(__name__)
+
+# seconds an area stays loaded after its rooms were last looked up
+DEFAULT_IDLE_TIMEOUT = 600.0
+
+# how often idle areas are looked for, at most
+SWEEP_INTERVAL = 60.0
+
+
+class Area(object):
+    """A directory of room files that is loaded and dropped as a whole."""
+
+    def __init__(self, name: str, files: List[str]):
+        self.name = name
+        self.files = files
+        # the room names the files held when last loaded
+        self.rooms: List[str] = []
+        self.loaded = False
+        self.last_used = 0.0
+
+
+class RoomRegistry(MutableMapping):
+    """Room name -> Room, loading areas the first time they are needed."""
+
+    def __init__(self, loader, idle_timeout: Optional[float] = DEFAULT_IDLE_TIMEOUT):
+        self.loader = loader
+        # None keeps an area loaded once something has used it
+        self.idle_timeout = idle_timeout
+        self.areas: Dict[str, Area] = {}
+        # every room there is, mapped to the area it is loaded with.
+        # None for rooms that are always loaded
+        self._manifest: Dict[str, Optional[Area]] = {}
+        # the rooms actually in memory
+        self._rooms: Dict[str, Room] = {}
+        self.clock = time.monotonic
+        self._sweep_timer = None
+
+    def __getitem__(self, name: str) -> Room:
+        area = self._manifest[name]
+        if area is not None:
+            if not area.loaded:
+                self.load_area(area)
+            area.last_used = self.clock()
+        return self._rooms[name]
+
+    def __setitem__(self, name: str, room: Room):
+        self._rooms[name] = room
+        self._manifest.setdefault(name, None)
+
+    def __delitem__(self, name: str):
+        area = self._manifest.pop(name)
+        self._rooms.pop(name, None)
+        if area is not None and name in area.rooms:
+            area.rooms.remove(name)
+
+    def __contains__(self, name) -> bool:
+        return name in self._manifest
+
+    def __iter__(self):
+        return iter(self._manifest)
+
+    def __len__(self) -> int:
+        return len(self._manifest)
+
+    def loaded_rooms(self) -> List[Room]:
+        """The rooms in memory right now, without loading any more."""
+        return list(self._rooms.values())
+
+    def add_area(self, area: Area, rooms: List[str]):
+        """Put an area's room names in the manifest, without loading it."""
+        self.areas[area.name] = area
+        area.rooms = list(rooms)
+        for name in area.rooms:
+            self._manifest[name] = area
+
+    def load_area(self, area: Area):
+        rooms = self.loader.load_area_files(area.files)
+        # the files may have changed since the manifest was made. Only the
+        # rooms that are gone come out of it, so the names someone may be
+        # iterating over stay as they were
+        names = {room.name for room in rooms}
+        for name in area.rooms:
+            if name not in names and self._manifest.get(name) is area:
+                del self._manifest[name]
+        area.rooms = []
+        for room in rooms:
+            self._rooms[room.name] = room
+            self._manifest[room.name] = area
+            area.rooms.append(room.name)
+        area.loaded = True
+        area.last_used = self.clock()
+        log.info(f"Loaded area {area.name} ({len(rooms)} rooms)")
+
+    def replace_rooms(self, old_names: List[str], rooms: List[Room],
+                      area: Optional[Area] = None):
+        """Swap in the rooms a reloaded file now holds for the ones it held
+        before. A room that is still there keeps its inventory. One that has
+        gone is dropped unless something is still in it.
+        """
+        for room in rooms:
+            old = self._rooms.get(room.name)
+            if old is not None and not old.is_empty():
+                room.inventory = old.inventory
+            if area is None or area.loaded:
+                self._rooms[room.name] = room
+            self._manifest[room.name] = area
+            if area is not None and room.name not in area.rooms:
+                area.rooms.append(room.name)
+
+        names = {room.name for room in rooms}
+        for name in old_names:
+            if name in names:
+                continue
+            old = self._rooms.get(name)
+            if old is not None and not old.is_empty():
+                log.warning(f"Room {name} is gone from its file but still has "
+                            f"things in it, keeping it")
+                continue
+            if name in self._manifest:
+                del self[name]
+
+    def unload_area(self, area: Area) -> bool:
+        """Drop an area's rooms from memory. Refused while anything is in
+        them, since players, creatures and dropped objects only live there.
+        """
+        if not area.loaded:
+            return True
+        if self._in_use(area):
+            return False
+        for name in area.rooms:
+            self._rooms.pop(name, None)
+        area.loaded = False
+        log.info(f"Unloaded idle area {area.name}")
+        return True
+
+    def _in_use(self, area: Area) -> bool:
+        for name in area.rooms:
+            room = self._rooms.get(name)
+            if room is not None and not room.is_empty():
+                return True
+        return False
+
+    def start(self, scheduler):
+        """Look for idle areas to drop from the game's scheduler."""
+        self.clock = scheduler.clock
+        if self.idle_timeout is None:
+            return
+        self._sweep_timer = scheduler.schedule(self._sweep_interval(), self._sweep)
+
+    def stop(self):
+        if self._sweep_timer:
+            self._sweep_timer.cancel()
+            self._sweep_timer = None
+
+    def _sweep_interval(self) -> float:
+        return max(1.0, min(SWEEP_INTERVAL, self.idle_timeout))
+
+    def _sweep(self):
+        cutoff = self.clock() - self.idle_timeout
+        for area in self.areas.values():
+            if area.loaded and area.last_used <= cutoff:
+                self.unload_area(area)
+        self._sweep_timer.reschedule(self._sweep_interval())
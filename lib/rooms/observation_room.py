@@ -14,8 +14,9 @@ current war. You can watch the battles unfold in real-time from the
 safety of this mystical chamber.
 
 Commands: 'watch' to start watching the war
-          'stop' to stop watching
-          'screens' to see available views""",
+          'watch <player>' to follow one player's fights
+          'watch room <room>' to follow the fighting in one room
+          'stop' to stop watching""",
         description_items=[
             DescriptionItem(
                 name='screens',
@@ -131,7 +131,7 @@ class RoomLoader:
             
             # Add exits to connect rooms
             if i > 1:
-                room.exits.append(Exit(
+                room.add_exit(Exit(
                     name='west',
                     description='The backbone continues west.',
                     destination=f'backbone_{i-1}',
@@ -139,7 +139,7 @@ class RoomLoader:
                 ))
             
             if i < 30:
-                room.exits.append(Exit(
+                room.add_exit(Exit(
                     name='east',
                     description='The backbone continues east.',
                     destination=f'backbone_{i+1}',
@@ -148,7 +148,7 @@ class RoomLoader:
             
             # Connect first room to warroom
             if i == 1:
-                room.exits.append(Exit(
+                room.add_exit(Exit(
                     name='north',
                     description='Back to the war room.',
                     destination='warroom',
@@ -157,7 +157,7 @@ class RoomLoader:
             
             # Add shop connection
             if i == 15:
-                room.exits.append(Exit(
+                room.add_exit(Exit(
                     name='south',
                     description='Gerkin\'s shop is to the south.',
                     destination='shop',
@@ -166,7 +166,7 @@ class RoomLoader:
             
             # Add some random exits to future areas
             if i % 5 == 0 and i != 15:
-                room.exits.append(Exit(
+                room.add_exit(Exit(
                     name='south',
                     description='A path leads to a wizard area.',
                     destination=f'area_entrance_{i//5}',
@@ -206,7 +206,7 @@ Current arena size: {size}x{size}""",
                     
                     # Add exits within arena bounds
                     if x > 1:
-                        room.exits.append(Exit(
+                        room.add_exit(Exit(
                             name='west',
                             description='West in the arena.',
                             destination=f'arena_{x-1}_{y}',
@@ -214,7 +214,7 @@ Current arena size: {size}x{size}""",
                         ))
                     
                     if x < size:
-                        room.exits.append(Exit(
+                        room.add_exit(Exit(
                             name='east',
                             description='East in the arena.',
                             destination=f'arena_{x+1}_{y}',
@@ -222,7 +222,7 @@ Current arena size: {size}x{size}""",
                         ))
                     
                     if y > 1:
-                        room.exits.append(Exit(
+                        room.add_exit(Exit(
                             name='north',
                             description='North in the arena.',
                             destination=f'arena_{x}_{y-1}',
@@ -230,7 +230,7 @@ Current arena size: {size}x{size}""",
                         ))
                     
                     if y < size:
-                        room.exits.append(Exit(
+                        room.add_exit(Exit(
                             name='south',
                             description='South in the arena.',
                             destination=f'arena_{x}_{y+1}',
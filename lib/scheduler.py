@@ -0,0 +1,179 @@
+"""Game timer scheduler for PKMUD.
+
+Everything that has to happen later - war countdowns, arena shrinks, the
+Gerkin timeout, periodic updates - goes through one TimerWheel owned by
+the game loop. Callbacks run on the main thread between ticks, so they
+can touch game state exactly like a command can.
+"""
+
+import logging
+import math
+import time
+from typing import Callable, Optional
+
+log = logging.getLogger(__name__)
+
+
+class TimerHandle:
+    """A scheduled callback. Returned by TimerWheel.schedule."""
+
+    def __init__(self, wheel: 'TimerWheel', expires: int, callback: Callable, args: tuple):
+        self.wheel = wheel
+        self.expires = expires
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+        # the slot this handle currently sits in, None once it has fired
+        self._slot = None
+
+    @property
+    def active(self) -> bool:
+        """True until the timer fires or is cancelled."""
+        return self._slot is not None
+
+    @property
+    def remaining(self) -> float:
+        """Seconds left until the timer is due."""
+        return max(0.0, self.wheel.time_of_tick(self.expires) - self.wheel.clock())
+
+    def cancel(self):
+        """Stop the timer from firing. Safe to call more than once."""
+        self.wheel.cancel(self)
+
+    def reschedule(self, delay: float):
+        """Move the timer to fire 'delay' seconds from now, even if it has
+        already fired or been cancelled.
+        """
+        self.wheel.reschedule(self, delay)
+
+
+class TimerWheel:
+    """Hierarchical timing wheel.
+
+    Time is cut into ticks of 'resolution' seconds. The first level has a
+    slot per tick for the next 'slots' ticks, and each level above covers
+    'slots' times the span of the one below. A timer goes straight into
+    the slot for its expiry, so schedule and cancel are O(1). When the
+    lowest level wraps round, the next slot of the level above is emptied
+    and its timers are placed again, now with a finer slot.
+    """
+
+    def __init__(self, resolution: float = 0.1, slots: int = 64, levels: int = 4,
+                 clock: Callable[[], float] = time.monotonic):
+        self.resolution = resolution
+        self.slots = slots
+        self.levels = levels
+        self.clock = clock
+        self._bits = slots.bit_length() - 1
+        if 1 << self._bits != slots:
+            raise ValueError("slots must be a power of two")
+        self._mask = slots - 1
+        # a dict per slot keeps insertion order and gives O(1) removal
+        self._wheels = [[{} for _ in range(slots)] for _ in range(levels)]
+        # timers too far out for the top level wait here
+        self._overflow = {}
+        self._start = clock()
+        # the last tick that has been processed
+        self._tick = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def time_of_tick(self, tick: int) -> float:
+        return self._start + tick * self.resolution
+
+    def schedule(self, delay: float, callback: Callable, *args) -> TimerHandle:
+        """Call callback(*args) from 'run_due' once 'delay' seconds have
+        passed.
+        """
+        handle = TimerHandle(self, self._expiry(delay), callback, args)
+        self._insert(handle)
+        return handle
+
+    def cancel(self, handle: TimerHandle):
+        handle.cancelled = True
+        if handle._slot is not None:
+            del handle._slot[handle]
+            handle._slot = None
+            self._count -= 1
+
+    def reschedule(self, handle: TimerHandle, delay: float):
+        self.cancel(handle)
+        handle.cancelled = False
+        handle.expires = self._expiry(delay)
+        self._insert(handle)
+
+    def next_timeout(self) -> Optional[float]:
+        """Seconds until 'run_due' next has something to do, for use as a
+        poll timeout. None when nothing is scheduled at all.
+        """
+        if not self._count:
+            return None
+        # look ahead through the first level. If it is empty the next
+        # thing to happen is the cascade at the end of it
+        wheel = self._wheels[0]
+        ticks = self.slots - (self._tick & self._mask)
+        for offset in range(1, self.slots + 1):
+            if wheel[(self._tick + offset) & self._mask]:
+                ticks = offset
+                break
+        return max(0.0, self.time_of_tick(self._tick + ticks) - self.clock())
+
+    def run_due(self) -> int:
+        """Fire every timer that is due. Returns how many ran."""
+        target = int((self.clock() - self._start) / self.resolution + 1e-6)
+        fired = 0
+        while self._tick < target:
+            self._tick += 1
+            if not self._tick & self._mask:
+                self._cascade()
+
+            slot = self._wheels[0][self._tick & self._mask]
+            while slot:
+                handle = next(iter(slot))
+                del slot[handle]
+                handle._slot = None
+                self._count -= 1
+                fired += 1
+                try:
+                    handle.callback(*handle.args)
+                except Exception as e:
+                    log.error(f"Error in timer callback {handle.callback!r}: {e}", exc_info=True)
+        return fired
+
+    def _expiry(self, delay: float) -> int:
+        # round up so a timer never fires early, and never in the tick
+        # that is already being processed
+        due = self.clock() + max(0.0, delay) - self._start
+        return max(self._tick + 1, math.ceil(due / self.resolution - 1e-6))
+
+    def _insert(self, handle: TimerHandle):
+        delta = handle.expires - self._tick
+        for level in range(self.levels):
+            if delta < 1 << (self._bits * (level + 1)):
+                index = (handle.expires >> (self._bits * level)) & self._mask
+                slot = self._wheels[level][index]
+                break
+        else:
+            slot = self._overflow
+        slot[handle] = None
+        handle._slot = slot
+        self._count += 1
+
+    def _cascade(self):
+        # the first level has wrapped round, so pull the timers for the
+        # coming span down out of each level that has wrapped as well
+        for level in range(1, self.levels):
+            index = (self._tick >> (self._bits * level)) & self._mask
+            self._replace(self._wheels[level][index])
+            if index:
+                return
+        self._replace(self._overflow)
+
+    def _replace(self, slot: dict):
+        handles = list(slot)
+        slot.clear()
+        self._count -= len(handles)
+        for handle in handles:
+            self._insert(handle)
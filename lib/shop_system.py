@@ -136,8 +136,8 @@ class ShopInventory:
         # Calculate price
         sell_price = int(item.value * self.buy_multiplier)
         
-        # Remove from inventory
-        if not player.inventory.remove_item(item):
+        # Remove from inventory, one of a stack
+        if not player.inventory.take(item):
             return False, "Error selling item."
         
         # Give money
@@ -156,10 +156,10 @@ class ShopInventory:
         sold_count = 0
         
         for item in items_to_sell[:]:  # Copy list
-            sell_price = int(item.value * self.buy_multiplier)
+            sell_price = int(item.value * self.buy_multiplier) * item.quantity
             if player.inventory.remove_item(item):
                 total_value += sell_price
-                sold_count += 1
+                sold_count += item.quantity
         
         player.coins += total_value
         
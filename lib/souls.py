@@ -19,7 +19,8 @@ class Soul:
 class SoulManager:
     """Manages all soul/emote commands."""
     
-    def __init__(self):
+    def __init__(self, game_state):
+        self.game_state = game_state
         self.souls = self._init_souls()
     
     def _init_souls(self) -> Dict[str, Soul]:
@@ -436,8 +437,6 @@ class SoulManager:
     
     def execute_soul(self, player, soul_name: str, target_name: str = None) -> bool:
         """Execute a soul command."""
-        from pkwar import rooms
-        
         soul = self.souls.get(soul_name.lower())
         if not soul:
             return False
@@ -451,14 +450,13 @@ class SoulManager:
                 player.message(soul.no_target)
             return True
         
+        room = self.game_state.rooms[player._location]
+        
         # Find target if specified
         target = None
         if target_name:
             # Look in same room
-            for uuid, entity in rooms[player._location].inventory.get_items():
-                if hasattr(entity, 'name') and entity.name.lower() == target_name.lower():
-                    target = entity
-                    break
+            target = room.inventory.find(target_name)
             
             if not target:
                 player.message(f"You don't see '{target_name}' here.")
@@ -469,18 +467,14 @@ class SoulManager:
             # No target version
             player.message(soul.no_target)
             # Show to room
-            for uuid, entity in rooms[player._location].inventory.get_items():
-                if hasattr(entity, 'message') and entity != player:
-                    entity.message(f"{player.name} {soul.no_target[4:]}")  # Skip "You "
+            self._tell_room(room, f"{player.name} {soul.no_target[4:]}", player)  # Skip "You "
         
         elif target == player:
             # Self target
             if soul.self_target:
                 player.message(soul.self_target)
                 # Show to room
-                for uuid, entity in rooms[player._location].inventory.get_items():
-                    if hasattr(entity, 'message') and entity != player:
-                        entity.message(f"{player.name} {soul.self_target[4:]}")  # Skip "You "
+                self._tell_room(room, f"{player.name} {soul.self_target[4:]}", player)  # Skip "You "
             else:
                 player.message(soul.no_target)
         
@@ -489,19 +483,27 @@ class SoulManager:
             if soul.other_target and soul.other_see:
                 # Show to player
                 player.message(soul.other_target.replace("%s", target.name))
-                # Show to target
-                target.message(soul.other_see.replace("%s", player.name))
+                # Show to target, if it can be told anything
+                if hasattr(target, 'message'):
+                    target.message(soul.other_see.replace("%s", player.name))
                 # Show to room
-                for uuid, entity in rooms[player._location].inventory.get_items():
-                    if hasattr(entity, 'message') and entity != player and entity != target:
-                        msg = f"{player.name} {soul.other_target[4:]}".replace("%s", target.name)
-                        entity.message(msg)
+                msg = f"{player.name} {soul.other_target[4:]}".replace("%s", target.name)
+                self._tell_room(room, msg, player, target)
             else:
                 # Fallback to no target version
                 player.message(soul.no_target)
         
         return True
     
+    def _tell_room(self, room, message: str, *exclude):
+        """Send everyone in the room but 'exclude' the same text, encoded
+        once for all of them.
+        """
+        others = [entity for entity in room.inventory.get_players()
+                  if entity not in exclude]
+        if others:
+            self.game_state.tell_players(others, message)
+    
     def list_souls(self, letter: str = None) -> List[str]:
         """List all souls, optionally filtered by starting letter."""
         if letter:
@@ -0,0 +1,134 @@
+"""The war as seen from the observation room's crystal screens.
+
+Players who type 'watch' there are subscribed to the feed. The war's
+events are posted to it as they happen and go out to the watchers a
+frame at a time, every FRAME_INTERVAL seconds, so a war with hundreds
+of blows a round still reaches each watcher as one message. A watcher
+can follow a single room or a single player instead of the whole war,
+and gets at most 'max_lines' lines a frame, with a note of how many
+more there were.
+
+Watchers who have left the observation room or the game are dropped
+from the feed the next time a frame goes out.
+"""
+
+from typing import Dict, Optional
+
+from server.server_enums import MessagePriority
+
+# seconds between frames
+FRAME_INTERVAL = 1.0
+
+# lines a watcher is sent per frame, at most
+MAX_FRAME_LINES = 20
+
+# where the screens are
+OBSERVATION_ROOM = 'observation_room'
+
+
+class Subscription(object):
+    """What one watcher wants to see."""
+
+    def __init__(self, player, room: Optional[str] = None,
+                 name: Optional[str] = None, max_lines: int = MAX_FRAME_LINES):
+        self.player = player
+        # only events in this room, or involving this player
+        self.room = room
+        self.name = name.lower() if name else None
+        self.max_lines = max_lines
+
+    @property
+    def view(self) -> tuple:
+        """Watchers with the same view are sent the same frame."""
+        return (self.room, self.name, self.max_lines)
+
+    def describe(self) -> str:
+        if self.room:
+            return f"the fighting in {self.room}"
+        if self.name:
+            return f"{self.name.capitalize()}'s fights"
+        return "the war"
+
+
+class SpectatorFeed(object):
+    """War events, sent out to whoever is watching a frame at a time."""
+
+    def __init__(self, game_state):
+        self.game_state = game_state
+        self.subscribers: Dict[int, Subscription] = {}  # player id: subscription
+        # (room, names of those involved, line) for the frame being gathered
+        self._events = []
+        self._frame_timer = None
+
+    def __contains__(self, player) -> bool:
+        return player.id in self.subscribers
+
+    def __len__(self) -> int:
+        return len(self.subscribers)
+
+    def subscribe(self, player, room: Optional[str] = None, name: Optional[str] = None,
+                  max_lines: int = MAX_FRAME_LINES) -> Subscription:
+        """Start sending 'player' frames, replacing what they watched before."""
+        subscription = Subscription(player, room, name, max_lines)
+        self.subscribers[player.id] = subscription
+        return subscription
+
+    def unsubscribe(self, player) -> bool:
+        """Stop sending 'player' frames. False if they weren't watching."""
+        return self.subscribers.pop(player.id, None) is not None
+
+    def post(self, room: str, line: str, *names: str):
+        """Show 'line' from 'room' in the next frame. 'names' are the
+        players it involves, for watchers following one of them.
+        """
+        if not self.subscribers:
+            return
+        self._events.append((room, tuple(name.lower() for name in names), line))
+        if self._frame_timer is None:
+            self._frame_timer = self.game_state.scheduler.schedule(
+                FRAME_INTERVAL, self.send_frame)
+
+    def send_frame(self):
+        """Send every watcher what happened since the last frame."""
+        self._frame_timer = None
+        events, self._events = self._events, []
+
+        views = {}
+        for player_id, subscription in list(self.subscribers.items()):
+            if not self._can_watch(subscription.player):
+                del self.subscribers[player_id]
+                continue
+            views.setdefault(subscription.view, []).append(subscription.player)
+
+        # different views can still come to the same frame
+        frames = {}
+        for (room, name, max_lines), players in views.items():
+            lines = [line for location, names, line in events
+                     if (room is None or location == room)
+                     and (name is None or name in names)]
+            if not lines:
+                continue
+            if len(lines) > max_lines:
+                lines[max_lines:] = [f"... and {len(lines) - max_lines} more."]
+            frames.setdefault("\n".join(lines), []).extend(players)
+
+        for frame, players in frames.items():
+            # spectators are the first thing a lagging client can do without
+            self.game_state.tell_players(players, frame, MessagePriority.LOW)
+
+    def stop(self, message: Optional[str] = None):
+        """Send what is left, tell everyone watching 'message' and
+        unsubscribe them all.
+        """
+        if self._frame_timer is not None:
+            self._frame_timer.cancel()
+            self.send_frame()
+        if message:
+            self.game_state.tell_players(
+                [subscription.player for subscription in self.subscribers.values()],
+                message)
+        self.subscribers.clear()
+
+    def _can_watch(self, player) -> bool:
+        return (player._location == OBSERVATION_ROOM
+                and self.game_state.players.get(player.uuid) is player)
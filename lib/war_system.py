@@ -1,9 +1,10 @@
 import time
 import random
-import threading
 from typing import List, Dict, Optional
 from enum import Enum
 
+from lib.spectator_feed import SpectatorFeed
+
 class WarSystem:
     """Manages the war game mechanics."""
     
@@ -35,11 +36,21 @@ class WarSystem:
         self.war_history = []
         self.first_blood = False
         self.gerkin_holder = None
+        # who is watching from the observation room
+        self.spectators = SpectatorFeed(game_state)
         
-        # Timer threads
+        # Handles for timers on the game scheduler
         self.countdown_timer = None
         self.arena_timer = None
+        self.dogs_timer = None
         self.reboot_timer = None
+        # countdown and reboot announcements
+        self.announcement_timers = []
+    
+    @property
+    def war_active(self) -> bool:
+        """True while a war is being fought."""
+        return self.state in (self.WarState.ACTIVE, self.WarState.ARENA_SHRINKING)
     
     def can_start_war(self) -> tuple[bool, str]:
         """Check if war can be started."""
@@ -78,12 +89,14 @@ class WarSystem:
         self.game_state.broadcast("Set 'war on' to participate!")
         
         # Start countdown timer
-        self.countdown_timer = threading.Timer(60.0, self._start_war)
-        self.countdown_timer.start()
+        scheduler = self.game_state.scheduler
+        self.countdown_timer = scheduler.schedule(60.0, self._start_war)
         
         # Periodic countdown announcements
-        for seconds in [30, 10, 5, 3, 2, 1]:
-            threading.Timer(60 - seconds, self._announce_countdown, args=[seconds]).start()
+        self.announcement_timers = [
+            scheduler.schedule(60 - seconds, self._announce_countdown, seconds)
+            for seconds in [30, 10, 5, 3, 2, 1]
+        ]
         
         return True, ""
     
@@ -155,8 +168,7 @@ class WarSystem:
         
         # Start arena shrink timer
         shrink_time = 900 if len(self.participants) < 30 else 1800  # 15 or 30 minutes
-        self.arena_timer = threading.Timer(shrink_time, self._shrink_arena)
-        self.arena_timer.start()
+        self.arena_timer = self.game_state.scheduler.schedule(shrink_time, self._shrink_arena)
     
     def _setup_teams(self):
         """Set up teams for team war."""
@@ -221,12 +233,11 @@ class WarSystem:
         # Continue shrinking
         if self.arena_size > 1:
             shrink_interval = random.randint(120, 180)  # 2-3 minutes
-            self.arena_timer = threading.Timer(shrink_interval, self._shrink_arena)
-            self.arena_timer.start()
+            self.arena_timer = self.game_state.scheduler.schedule(shrink_interval, self._shrink_arena)
         else:
             # Release dogs of war after 2-3 minutes in 1x1
             dog_timer = random.randint(120, 180)
-            threading.Timer(dog_timer, self._release_dogs).start()
+            self.dogs_timer = self.game_state.scheduler.schedule(dog_timer, self._release_dogs)
         
         self.state = self.WarState.ACTIVE
     
@@ -244,9 +255,8 @@ class WarSystem:
         self.game_state.broadcast("DEATH releases the DOGS OF WAR!")
         
         alive_players = [p for p in self.participants if not p.is_ghost]
-        for player in alive_players:
-            # TODO: Spawn dog to attack player
-            player.message("A vicious war dog appears and attacks you!")
+        # TODO: Spawn dog to attack player
+        self.game_state.tell_players(alive_players, "A vicious war dog appears and attacks you!")
     
     def handle_kill(self, killer, victim):
         """Handle a player kill during war."""
@@ -274,8 +284,7 @@ class WarSystem:
             self.grant_gerkin(killer)
             self.game_state.broadcast(f"The spirit of Gerkin transfers to {killer.name}!")
         
-        # Add blood to killer's inventory
-        killer.blood_inventory.append(victim.name)
+        # The blood itself is added to the killer's inventory by combat
         killer.message(f"You collect the blood of {victim.name}.")
         
         # Update stats
@@ -328,8 +337,8 @@ class WarSystem:
         self.state = self.WarState.ENDING
         
         # Cancel timers
-        if self.arena_timer:
-            self.arena_timer.cancel()
+        self._cancel_timers()
+        self.spectators.stop("The crystal screens go dark as the war ends.")
         
         # Announce winner
         if winner:
@@ -369,19 +378,26 @@ class WarSystem:
         self.game_state.broadcast("The mud will reboot in 60 seconds!")
         
         # Schedule reboot
-        self.reboot_timer = threading.Timer(60.0, self._reboot_mud)
-        self.reboot_timer.start()
+        scheduler = self.game_state.scheduler
+        self.reboot_timer = scheduler.schedule(60.0, self._reboot_mud)
         
         # Countdown announcements
-        for seconds in [30, 10, 5, 3, 2, 1]:
-            threading.Timer(60 - seconds, lambda s=seconds: 
-                          self.game_state.broadcast(f"Rebooting in {s} seconds!")).start()
+        self.announcement_timers = [
+            scheduler.schedule(60 - seconds, self.game_state.broadcast,
+                               f"Rebooting in {seconds} seconds!")
+            for seconds in [30, 10, 5, 3, 2, 1]
+        ]
+    
+    def _cancel_timers(self):
+        """Stop every pending war timer."""
+        for timer in [self.countdown_timer, self.arena_timer, self.dogs_timer,
+                      *self.announcement_timers]:
+            if timer:
+                timer.cancel()
+        self.announcement_timers = []
     
     def _reboot_mud(self):
         """Perform the actual reboot."""
-        import os
-        import sys
-        
         self.game_state.broadcast("Rebooting NOW!")
         
         # Save all players
@@ -401,12 +417,19 @@ class WarSystem:
                     player.end_exploration_session()
         
         # Disconnect all players
-        for player in self.game_state.list_players():
-            player.message("=== MUD REBOOTING ===")
+        players = list(self.game_state.list_players())
+        self.game_state.tell_players(players, "=== MUD REBOOTING ===")
+        for player in players:
             self.game_state.server.disconnect(player.client)
         
-        # Give server time to send final messages
-        time.sleep(1)
+        # Give server time to send final messages, without stopping the
+        # game loop while we wait
+        self.reboot_timer = self.game_state.scheduler.schedule(1.0, self._exec_mud)
+    
+    def _exec_mud(self):
+        """Replace this process with a fresh copy of the mud."""
+        import os
+        import sys
         
         # Perform actual restart using execv
         python = sys.executable
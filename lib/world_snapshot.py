@@ -0,0 +1,269 @@
+"""Snapshot of the loaded world for fast boots.
+
+Loading the world means exec'ing every room file and building every
+generated room, and the mud reboots after each war. The snapshot is a
+pickle of the rooms from the last boot, each filed under the source file
+it came from along with that file's mtime, size and hash. A boot reads it
+in one go and only execs the files that have changed since.
+
+Anything that changes what a pickled room looks like (the model classes,
+the loader itself) throws the whole snapshot away, see SCHEMA_FILES. A
+room file's rooms are also loaded again when one of the mud's own modules
+it imports (a helper under lib/, say) has changed, directly or through
+another such module.
+"""
+
+import ast
+import hashlib
+import logging
+import os
+import pickle
+from typing import Dict, Optional, Set
+
+log = logging.getLogger(__name__)
+
+# bump to discard every snapshot written by older code
+SNAPSHOT_VERSION = 1
+
+DEFAULT_SNAPSHOT = 'lib/cache/world.snapshot'
+
+# source files that define the objects held in the snapshot
+SCHEMA_FILES = [
+    'lib/models/entity.py',
+    'lib/models/enums.py',
+    'lib/keyword_index.py',
+    'lib/special_rooms.py',
+    'lib/room_loader.py',
+    'lib/room_format.py',
+    'lib/world_snapshot.py',
+]
+
+
+def file_digest(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def schema_digest() -> str:
+    digest = hashlib.sha1(str(SNAPSHOT_VERSION).encode())
+    for path in SCHEMA_FILES:
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def module_path(name: str) -> Optional[str]:
+    """The source file in the mud's tree for module 'name', None for
+    modules from elsewhere like the standard library.
+    """
+    base = name.replace('.', '/')
+    for path in (base + '.py', base + '/__init__.py'):
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def imported_files(path: str) -> Set[str]:
+    """The mud's own source files that 'path' imports."""
+    try:
+        with open(path, 'rb') as f:
+            tree = ast.parse(f.read(), path)
+    except (OSError, SyntaxError, ValueError):
+        return set()
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module)
+            # 'from lib.models import entity' imports a module too
+            names.extend(f"{node.module}.{alias.name}" for alias in node.names)
+    files = set()
+    for name in names:
+        found = module_path(name)
+        if found:
+            files.add(found)
+    return files
+
+
+class FileRecord(object):
+    """What one source file produced, and how to tell if it has changed.
+    'rooms' is None for a file whose rooms could not be pickled.
+    'imports' holds the hash of each of the mud's modules the file
+    imports, directly or not.
+    """
+
+    def __init__(self, mtime_ns: int, size: int, digest: str, rooms: list,
+                 imports: Dict[str, str]):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.digest = digest
+        self.rooms = rooms
+        self.imports = imports
+
+
+class WorldSnapshot(object):
+    """Rooms from the last boot, keyed by the file they were loaded from."""
+
+    def __init__(self, path: str = DEFAULT_SNAPSHOT):
+        self.path = path
+        self.files: Dict[str, FileRecord] = {}
+        # rooms built in code rather than loaded from a file
+        self.generated: Dict[str, list] = {}
+        self._schema = None
+        # files looked up or stored this boot, the rest are dropped on save
+        self._seen = set()
+        # module path -> its hash and the modules it imports, worked out
+        # at most once a boot however many room files share a helper
+        self._digests: Dict[str, str] = {}
+        self._imports: Dict[str, Set[str]] = {}
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def load(self) -> bool:
+        """Read the snapshot file. Returns False if there wasn't a usable
+        one, in which case everything gets loaded from source.
+        """
+        self._schema = schema_digest()
+        try:
+            with open(self.path, 'rb') as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            log.warning(f"Ignoring unreadable world snapshot {self.path}: {e}")
+            return False
+
+        if data.get('schema') != self._schema:
+            log.info("World snapshot is from different code, rebuilding it")
+            return False
+        self.files = data['files']
+        self.generated = data['generated']
+        return True
+
+    def get(self, path: str) -> Optional[list]:
+        """The rooms 'path' produced last time, or None if it has changed
+        since or was never stored.
+        """
+        self._seen.add(path)
+        record = self.files.get(path)
+        if record is None or record.rooms is None:
+            self.misses += 1
+            return None
+
+        stat = os.stat(path)
+        if stat.st_mtime_ns != record.mtime_ns or stat.st_size != record.size:
+            # touched, but maybe not changed
+            if file_digest(path) != record.digest:
+                self.misses += 1
+                return None
+            record.mtime_ns = stat.st_mtime_ns
+            record.size = stat.st_size
+            self.dirty = True
+
+        for module, digest in record.imports.items():
+            if self._digest(module) != digest:
+                self.misses += 1
+                return None
+
+        self.hits += 1
+        return record.rooms
+
+    def put(self, path: str, rooms: list):
+        """Store what 'path' produced this boot."""
+        self._seen.add(path)
+        stat = os.stat(path)
+        digest = file_digest(path)
+        record = self.files.get(path)
+        if record is not None and record.rooms is None and record.digest == digest:
+            # still the same file that couldn't be pickled last time
+            return
+        self.files[path] = FileRecord(stat.st_mtime_ns, stat.st_size, digest, rooms,
+                                      self._import_digests(path))
+        self.dirty = True
+
+    def _digest(self, path: str) -> Optional[str]:
+        if path not in self._digests:
+            try:
+                self._digests[path] = file_digest(path)
+            except OSError:
+                self._digests[path] = None
+        return self._digests[path]
+
+    def _import_digests(self, path: str) -> Dict[str, str]:
+        """The hash of every module of the mud's that 'path' imports,
+        following imports from one module to the next.
+        """
+        found = {}
+        todo = [path]
+        while todo:
+            current = todo.pop()
+            if current not in self._imports:
+                self._imports[current] = imported_files(current)
+            for module in self._imports[current]:
+                if module not in found and module != path:
+                    found[module] = self._digest(module)
+                    todo.append(module)
+        return found
+
+    def get_generated(self, name: str) -> Optional[list]:
+        return self.generated.get(name)
+
+    def put_generated(self, name: str, rooms: list):
+        self.generated[name] = rooms
+        self.dirty = True
+
+    def save(self):
+        """Write the snapshot if anything changed this boot."""
+        for path in [path for path in self.files if path not in self._seen]:
+            del self.files[path]
+            self.dirty = True
+        if not self.dirty:
+            return
+
+        data = {'schema': self._schema or schema_digest(),
+                'files': self.files,
+                'generated': self.generated}
+        try:
+            payload = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # a room file can define its own classes, which pickle can't
+            # find again by module name. Those files just get exec'd every
+            # boot
+            data['files'] = self._picklable_files()
+            payload = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        # write then rename, so a crash never leaves half a snapshot behind
+        temp_path = self.path + '.tmp'
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            log.error(f"Could not save world snapshot {self.path}: {e}")
+            return
+        self.dirty = False
+        log.info(f"Saved world snapshot with {len(data['files'])} files to {self.path}")
+
+    def release(self):
+        """Let go of the loaded rooms once the boot is done with them."""
+        self.files = {}
+        self.generated = {}
+        self._seen = set()
+        self._digests = {}
+        self._imports = {}
+
+    def _picklable_files(self) -> Dict[str, FileRecord]:
+        files = {}
+        for path, record in self.files.items():
+            try:
+                pickle.dumps(record.rooms, pickle.HIGHEST_PROTOCOL)
+            except Exception as e:
+                log.debug(f"Not snapshotting {path}: {e}")
+                record = FileRecord(record.mtime_ns, record.size, record.digest, None,
+                                    record.imports)
+            files[path] = record
+        return files
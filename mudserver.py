@@ -10,11 +10,13 @@ author: Mark Frimston - mfrimston@gmail.com
 # TODO: Tests
 
 import socket
+import threading
 import time
 
 from lib.models.client import Client
-from server.event import Event
+from server.event import Event, command_event
 from server.server_enums import *
+from server.socket_client import telnet_bytes
 from server.socket_server import SocketServer
 
 from typing import List
@@ -36,7 +38,16 @@ class MudServer(object):
     # list of newly-added occurrences
     _new_events = []
 
-    def __init__(self, interface="0.0.0.0", port=1234):
+    # how many queued lines each player gets to run per turn
+    COMMANDS_PER_TICK = 4
+    # seconds between a player's turns, whether their lines came in one
+    # paste or one packet at a time
+    INPUT_INTERVAL = 0.1
+    # a player with this many lines waiting is not read from again until
+    # some of them have run, leaving the rest of a flood in the kernel
+    MAX_QUEUED_LINES = 100
+
+    def __init__(self, interface="0.0.0.0", port=1234, commands_per_tick=None):
         """Constructs the MudServer object and starts listening for
         new players.
         """
@@ -44,21 +55,52 @@ class MudServer(object):
         self._clients = {}
         self._events = []
         self._new_events = []
-        # socket used to listen for new clients
+        self.commands_per_tick = commands_per_tick or self.COMMANDS_PER_TICK
+        # clients with lines waiting in their input queue, in arrival order
+        self._queued_input = {}
+        # clients with output the socket has not accepted yet
+        self._backlogged = set()
+        # clients not being read from until their line queue drains
+        self._paused = set()
+        # clients sent messages since the last 'flush'
+        self._pending_output = {}
+        # sends avoided by batching each client's messages, for the last
+        # 'flush' and since startup
+        self.sends_saved = 0
+        self.total_sends_saved = 0
+        # socket used to listen for new clients, also owns the selector that
+        # every client socket is registered with
         self._server_socket = SocketServer(interface, port)
+        # when the last keepalive sweep over all clients happened
+        self._last_keepalive = time.time()
+        # messages sent from any other thread have to wake up 'update'
+        self._loop_thread = threading.get_ident()
 
-    def update(self):
+    def update(self, timeout=0):
         """Checks for new players, disconnected players, and new
         messages sent from players. This method must be called before
         up-to-date info can be obtained from the 'get_new_players',
         'get_disconnected_players' and 'get_commands' methods.
         It should be called in a loop to keep the game running.
+
+        Blocks for up to 'timeout' seconds until there is socket activity
+        or a player's queued input is due, so an idle server sleeps here.
         """
 
+        # ask the selector which sockets have something for us, so only
+        # connections with pending input get touched this tick
+        listener_ready, ready_clients, writable_clients = \
+            self._server_socket.poll(self._input_timeout(timeout))
+
+        # finish off output that slow clients could not take earlier
+        self._flush_backlogged(writable_clients)
+
         # check for new stuff
-        self._check_for_new_connections()
+        if listener_ready:
+            self._check_for_new_connections()
         self._check_for_disconnected()
-        self._check_for_messages()
+        self._check_for_messages(ready_clients)
+        self._run_queued_input()
 
         # move the new events into the main events list so that they can be
         # obtained with 'get_new_players', 'get_disconnected_players' and
@@ -100,26 +142,52 @@ class MudServer(object):
         # return the info list
         return retval
 
-    def send_message(self, to, message):
+    def send_message(self, to, message, priority=MessagePriority.NORMAL):
         """Sends the text in the 'message' parameter to the player with
         the id number given in the 'to' parameter. The text will be
         printed out in the player's terminal.
+
+        LOW priority messages are dropped for clients that are too far
+        behind on their output.
         """
-        # Fix line endings for proper telnet display
-        # Replace any single \n with \r\n for telnet compatibility
-        message = message.replace('\r\n', '\n')  # First normalize to just \n
-        message = message.replace('\n', '\r\n')  # Then convert all to \r\n
-        
         # we make sure to put a newline on the end so the client receives the
-        # message on its own line
-        if not message.endswith('\r\n'):
-            message += '\r\n'
-            
+        # message on its own line. Converting the line endings to telnet's
+        # \r\n waits until 'flush', where it runs once over everything the
+        # client was sent this tick
+        if not message.endswith('\n'):
+            message += '\n'
+
         # TODO: This isn't a nice interface
         if type(to) == Client:
-            self._attempt_send(to.uuid, message)
+            self._attempt_send(to.uuid, message, priority)
         else:
-            self._attempt_send(to, message)
+            self._attempt_send(to, message, priority)
+
+    def encode_message(self, message) -> bytes:
+        """Renders 'message' into the bytes 'send_message' would put on
+        the wire, so one message going to many players is only encoded once.
+        """
+        if not message.endswith('\n'):
+            message += '\n'
+        return telnet_bytes(message)
+
+    def send_encoded(self, to, data: bytes, priority=MessagePriority.NORMAL):
+        """Like 'send_message' for text already run through
+        'encode_message'. The same bytes object can be queued for any
+        number of clients.
+        """
+        if type(to) == Client:
+            self._attempt_send(to.uuid, data, priority)
+        else:
+            self._attempt_send(to, data, priority)
+
+    def broadcast(self, recipients, message, priority=MessagePriority.NORMAL):
+        """Sends 'message' to every client id in 'recipients', encoding it
+        just once.
+        """
+        data = self.encode_message(message)
+        for to in recipients:
+            self.send_encoded(to, data, priority)
 
     def disconnect_client(self, client_id):
         """Disconnect a specific client by ID."""
@@ -131,47 +199,113 @@ class MudServer(object):
         """Closes down the server, disconnecting all clients and
         closing the listen socket.
         """
+        self.flush()
         # for each client
         for cl in self._clients.values():
             # close the socket, disconnecting the client
-            cl.socket.shutdown(socket.SHUT_RDWR)
+            try:
+                cl.socket.shutdown()
+            except socket.error:
+                pass
             cl.socket.close()
         # stop listening for new clients
         self._server_socket.close()
 
     def disconnect(self, client: Client):
-        client.socket.socket.shutdown(socket.SHUT_RDWR)
+        """Disconnect a client, sending whatever was queued for it first."""
+        self._handle_disconnect(client)
 
-    def _attempt_send(self, clid, data):
-        # look up the client in the client map and use 'sendall' to send
-        # the message string on the socket. 'sendall' ensures that all of
-        # the data is sent in one go
+    def flush(self):
+        """Sends every client the messages queued for it since the last
+        call, joined into a single write. Call once at the end of each
+        game tick.
+        """
+        pending, self._pending_output = self._pending_output, {}
+        messages = 0
+        for client in pending.values():
+            messages += len(client.socket.pending)
+            self._write_pending(client)
+
+        self.sends_saved = messages - len(pending)
+        self.total_sends_saved += self.sends_saved
+
+    def _attempt_send(self, clid, data, priority=MessagePriority.NORMAL):
+        # look up the client in the client map and queue the message on
+        # it. Whatever the socket won't take right now is sent later when
+        # the selector reports it writable, so a slow client never blocks
+        # the game loop
         client = self._clients.get(clid)
         try:
             if client:
-                client.socket.send_to_client(data)
+                client.socket.send_to_client(data, priority)
+                self._pending_output[clid] = client
+                # a message sent from another thread has to wake up the
+                # game loop, which may be asleep in 'update'
+                if threading.get_ident() != self._loop_thread:
+                    self._wake()
         # If there is a connection problem with the client (e.g. they have
-        # disconnected) a socket error will be raised
+        # disconnected, or stopped reading altogether) a socket error will
+        # be raised
+        except socket.error:
+            self._handle_disconnect(client)
+
+    def _wake(self):
+        self._server_socket.wakeup()
+
+    def _update_interest(self, client: Client):
+        self._server_socket.watch(client,
+                                  reading=client.uuid not in self._paused,
+                                  writing=client.uuid in self._backlogged)
+
+    def _write_pending(self, client: Client):
+        if client.uuid not in self._clients:
+            return
+        try:
+            client.socket.write_pending()
+            self._watch_backlog(client)
         except socket.error:
             self._handle_disconnect(client)
 
+    def _watch_backlog(self, client: Client):
+        if client.socket.output and client.uuid not in self._backlogged:
+            self._backlogged.add(client.uuid)
+            self._update_interest(client)
+
+    def _flush_backlogged(self, writable_clients):
+        for client in writable_clients:
+            if client.uuid not in self._clients:
+                continue
+            try:
+                if client.socket.flush():
+                    self._backlogged.discard(client.uuid)
+                    self._update_interest(client)
+            except socket.error:
+                self._handle_disconnect(client)
+
     def _check_for_new_connections(self):
-        new_client_socket = self._server_socket.check_for_new_clients()
-        if new_client_socket:
+        for new_client_socket in self._server_socket.accept_new_clients():
             client = Client(new_client_socket)
             self._clients[client.uuid] = client
+            self._server_socket.register_client(client)
             self._new_events.append(
                 Event(ServerEvents.NEW_PLAYER, client)
             )
 
     def _check_for_disconnected(self):
 
+        # hangups are noticed by the selector as soon as they happen, so the
+        # keepalive sweep over every client only needs to run every 5 seconds
+        now = time.time()
+        if now - self._last_keepalive < 5.0:
+            return
+        self._last_keepalive = now
+
         # go through all the clients
         for player_id, cl in list(self._clients.items()):
 
             # if we last checked the client less than 5 seconds ago, skip this
             # client and move on to the next one
-            if time.time() - cl.socket.lastcheck < 5.0:
+            if now - cl.socket.lastcheck < 5.0:
                 continue
 
             # send the client an invisible character. It doesn't actually
@@ -181,24 +315,82 @@ class MudServer(object):
             self._attempt_send(player_id, "\x00")
 
             # update the last check time
-            cl.socket.lastcheck = time.time()
+            cl.socket.lastcheck = now
 
-    def _check_for_messages(self):
+    def _check_for_messages(self, ready_clients):
 
-        # go through all the clients
-        for uid, client in self._clients.items():
+        # go through only the clients the selector reported as readable
+        for client in ready_clients:
+            # an earlier send this tick may already have dropped the client
+            if client.uuid not in self._clients:
+                continue
             try:
-                message = client.socket.check_for_messages(client)
-                if message:
-                    self._new_events.append(message)
+                if client.socket.check_for_messages():
+                    self._queue_input(client)
+                if len(client.socket.lines) >= self.MAX_QUEUED_LINES:
+                    # the selector would otherwise keep waking us up for
+                    # input we are not ready to take
+                    self._paused.add(client.uuid)
+                    self._update_interest(client)
             # if there is a problem reading from the socket (e.g. the client
             # has disconnected) a socket error will be raised
             except socket.error:
                 self._handle_disconnect(client)
 
+    def _queue_input(self, client: Client):
+        self._queued_input[client.uuid] = client
+
+    def _input_timeout(self, timeout):
+        # shortens 'timeout' so we are awake when the next player with
+        # queued input is due their turn
+        if not self._queued_input:
+            return timeout
+        now = time.time()
+        for client in self._queued_input.values():
+            due = client.socket.next_turn - now
+            timeout = due if timeout is None else min(timeout, due)
+        return max(0, timeout)
+
+    def _run_queued_input(self):
+        # every client with waiting input gets up to 'commands_per_tick'
+        # of its lines turned into commands per turn, so a long paste still
+        # runs at a steady pace without holding up everyone else
+        now = time.time()
+        for clid, client in list(self._queued_input.items()):
+            if client.socket.next_turn > now:
+                continue
+            lines = client.socket.lines
+            for _ in range(min(self.commands_per_tick, len(lines))):
+                self._new_events.append(command_event(client, lines.popleft()))
+            client.socket.next_turn = now + self.INPUT_INTERVAL
+            if not lines:
+                del self._queued_input[clid]
+            if clid in self._paused and len(lines) < self.MAX_QUEUED_LINES:
+                self._paused.discard(clid)
+                self._update_interest(client)
+
     def _handle_disconnect(self, client: Client):
+        # a failed send and a failed read can both report the same client
+        if client is None or client.uuid not in self._clients:
+            return
+
         # remove the client from the clients map
         del(self._clients[client.uuid])
+        self._queued_input.pop(client.uuid, None)
+        self._backlogged.discard(client.uuid)
+        self._paused.discard(client.uuid)
+
+        # whatever was sent before the disconnect, like a goodbye, still
+        # goes out if the socket will take it
+        self._pending_output.pop(client.uuid, None)
+        try:
+            client.socket.write_pending()
+        except socket.error:
+            pass
+
+        # stop watching the socket before closing it
+        self._server_socket.unregister_client(client)
+        client.socket.close()
 
         # add a 'player left' occurence to the new events list, with the
         # player's id number
@@ -4,6 +4,8 @@
 Main game loop and initialization
 """
 
+import argparse
+import asyncio
 import logging
 import sys
 import time
@@ -37,7 +39,9 @@ from lib.war_system import WarSystem
 from lib.channels import ChannelManager
 from lib.ansi import AnsiManager
 from lib.room_loader import RoomLoader
+from lib.room_registry import DEFAULT_IDLE_TIMEOUT
 from lib.explorer_system import ExplorerSystem
+from lib.file_watcher import DEFAULT_INTERVAL, FileWatcher
 from lib.object_loader import ObjectLoader
 
 # Global dictionaries - initialize as empty
@@ -99,9 +103,12 @@ def init_game_data():
     
     # Load rooms
     log.info("Loading rooms...")
-    room_loader = RoomLoader()
+    room_loader = RoomLoader(idle_timeout=options.area_idle or None,
+                             workers=options.load_workers)
     rooms = room_loader.load_all_rooms()
     game.room_loader = room_loader
+    # drop areas nobody is using
+    rooms.start(game.scheduler)
     log.info(f"Loaded {len(rooms)} total rooms")
     
     # CRITICAL: Update game.rooms after loading!
@@ -110,14 +117,60 @@ def init_game_data():
     
     # Load objects
     log.info("Loading objects...")
-    object_loader = ObjectLoader()
+    object_loader = ObjectLoader(workers=options.load_workers)
     object_templates = object_loader.load_all_objects()
     game.object_loader = object_loader
     game.object_templates = object_templates
     log.info(f"Loaded {len(object_templates)} object templates")
+    
+    # pick up edited room and object files without a reboot
+    if options.reload_interval:
+        game.room_watcher = FileWatcher(room_loader.room_dirs + room_loader.area_dirs,
+                                        room_loader.reload_file,
+                                        interval=options.reload_interval)
+        game.room_watcher.start(game.scheduler)
+        game.object_watcher = FileWatcher(object_loader.object_dirs,
+                                          object_loader.reload_file, suffixes=('.py',),
+                                          interval=options.reload_interval)
+        game.object_watcher.start(game.scheduler)
+
+def parse_args():
+    """Startup options. Unknown arguments are left alone so wrappers can
+    pass their own."""
+    parser = argparse.ArgumentParser(description="PKMUD server")
+    parser.add_argument('--engine', choices=['select', 'asyncio'],
+                        default=os.environ.get('PKMUD_ENGINE', 'select'),
+                        help="network engine: 'select' uses the selectors module "
+                             "directly, 'asyncio' runs on an asyncio event loop")
+    parser.add_argument('--port', type=int,
+                        default=int(os.environ.get('PKMUD_PORT', 2222)))
+    parser.add_argument('--commands-per-tick', type=int,
+                        default=int(os.environ.get('PKMUD_COMMANDS_PER_TICK', 0)) or None,
+                        help="queued input lines each player may run per tick "
+                             f"(default {MudServer.COMMANDS_PER_TICK})")
+    parser.add_argument('--area-idle', type=float,
+                        default=float(os.environ.get('PKMUD_AREA_IDLE', DEFAULT_IDLE_TIMEOUT)),
+                        help="seconds an empty area stays loaded after it was last "
+                             "used, 0 keeps areas loaded once visited")
+    parser.add_argument('--reload-interval', type=float,
+                        default=float(os.environ.get('PKMUD_RELOAD_INTERVAL', DEFAULT_INTERVAL)),
+                        help="seconds between checks for edited room and object files, "
+                             "0 turns reloading off")
+    parser.add_argument('--load-workers', type=int,
+                        default=int(os.environ.get('PKMUD_LOAD_WORKERS', 0)),
+                        help="processes to load changed room and object files in at "
+                             "boot, 0 loads them one at a time")
+    options, _ = parser.parse_known_args()
+    return options
 
-# Create game instance on port 2222
-server = MudServer(port=2222)
+options = parse_args()
+
+# Create game instance on port 2222 unless told otherwise
+if options.engine == 'asyncio':
+    from server.async_server import AsyncMudServer
+    server = AsyncMudServer(port=options.port, commands_per_tick=options.commands_per_tick)
+else:
+    server = MudServer(port=options.port, commands_per_tick=options.commands_per_tick)
 game = GameState(server)
 # Store game instance in server for access from player objects
 server.game_instance = game
@@ -163,6 +216,7 @@ def handle_disconnected_players():
             
             # Mark as linkdead
             disconnected_player.linkdead = True
+            game.set_linkdead(disconnected_player)
             auth.linkdead_players[disconnected_player.name.lower()] = disconnected_player
             
             # Handle based on ghost/alive state
@@ -173,9 +227,8 @@ def handle_disconnected_players():
                     room.inventory.remove_item(disconnected_player)
                     
                     # Announce ghost disappearance
-                    for uuid, item in room.inventory.get_items():
-                        if hasattr(item, 'is_player') and item.is_player:
-                            item.message(f"{disconnected_player.get_display_name()} fades from existence.")
+                    for item in room.inventory.get_players():
+                        item.message(f"{disconnected_player.get_display_name()} fades from existence.")
                 
                 log.info(f"Ghost {disconnected_player.name} went linkdead and disappeared")
             else:
@@ -183,16 +236,16 @@ def handle_disconnected_players():
                 # Announce they've become a statue
                 if disconnected_player._location and disconnected_player._location in game.rooms:
                     room = game.rooms[disconnected_player._location]
-                    for uuid, item in room.inventory.get_items():
-                        if hasattr(item, 'is_player') and item.is_player and item != disconnected_player:
+                    for item in room.inventory.get_players():
+                        if item != disconnected_player:
                             item.message(f"{disconnected_player.name} has turned to stone!")
                 
                 log.info(f"Alive player {disconnected_player.name} went linkdead and became a statue")
             
             # General linkdead announcement
-            for p in game.list_players():
-                if p != disconnected_player:
-                    p.message(f"{disconnected_player.name} has gone linkdead.")
+            game.tell_players(
+                [p for p in game.list_players() if p != disconnected_player],
+                f"{disconnected_player.name} has gone linkdead.")
         
         # Clean up auth state
         if disconnected_client.uuid in auth.pending_logins:
@@ -356,7 +409,7 @@ def periodic_updates():
             war_system.gerkin_holder.message(random.choice(messages))
     
     # Shop keeper messages
-    if 'shop' in rooms and rooms['shop'].inventory.get_items():
+    if 'shop' in rooms and rooms['shop'].inventory.players:
         if random.random() < 0.005:  # 0.5% chance
             shop_messages = [
                 "Gerkin mutters: 'They think they can win... fools!'",
@@ -364,9 +417,56 @@ def periodic_updates():
                 "Gerkin cackles: 'Another war coming... I can smell it!'",
                 "Gerkin whispers: 'The spirit... it speaks to me...'"
             ]
-            for uuid, entity in rooms['shop'].inventory.get_items():
-                if isinstance(entity, Player):
-                    entity.message(random.choice(shop_messages))
+            for entity in rooms['shop'].inventory.get_players():
+                entity.message(random.choice(shop_messages))
+
+def run_tick():
+    """Everything the game does with the events gathered this tick."""
+    # Handle new connections
+    handle_new_player_events()
+
+    # Handle disconnections
+    handle_disconnected_players()
+
+    # Handle commands
+    handle_commands()
+
+def periodic_timer():
+    """Runs 'periodic_updates' and books the next run a second later."""
+    game.scheduler.schedule(1.0, periodic_timer)
+    periodic_updates()
+
+def run_select():
+    """Main loop for the select engine: sleep in the selector until a
+    socket has something for us or the next timer is due."""
+    game.scheduler.schedule(1.0, periodic_timer)
+    while True:
+        # Update server, waiting for input instead of spinning
+        game.update(game.scheduler.next_timeout())
+
+        run_tick()
+
+        # War announcements, periodic updates and anything else that is due
+        game.scheduler.run_due()
+
+        # Send everything this tick produced, one write per player
+        server.flush()
+
+async def run_async():
+    """Main loop for the asyncio engine: sleep until a connection reports
+    input or the next timer is due, then run a tick."""
+    await server.start()
+    game.scheduler.schedule(1.0, periodic_timer)
+    while True:
+        await server.wait_for_events(game.scheduler.next_timeout())
+
+        game.update()
+
+        run_tick()
+
+        game.scheduler.run_due()
+
+        server.flush()
 
 if __name__ == '__main__':
     # Initialize logging first
@@ -385,31 +485,14 @@ if __name__ == '__main__':
     
     log.info("PKMUD initialization complete")
     
-    last_update = time.time()
-    
+    log.info(f"Using the {options.engine} engine on port {options.port}")
+
     try:
-        # Main game loop
-        while True:
-            # Small delay to prevent CPU spinning
-            time.sleep(0.1)
-            
-            # Update server
-            game.update()
-            
-            # Handle new connections
-            handle_new_player_events()
-            
-            # Handle disconnections  
-            handle_disconnected_players()
-            
-            # Handle commands
-            handle_commands()
-            
-            # Periodic updates (every second)
-            if time.time() - last_update > 1.0:
-                periodic_updates()
-                last_update = time.time()
-                
+        if options.engine == 'asyncio':
+            asyncio.run(run_async())
+        else:
+            run_select()
+
     except KeyboardInterrupt:
         log.info("Shutdown signal received...")
         
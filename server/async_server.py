@@ -0,0 +1,257 @@
+"""asyncio based alternative to the MudServer/SocketServer polling stack.
+
+Each connection gets its own stream reader task. Input is parsed as soon
+as it arrives and the resulting Events are put on an asyncio.Queue, so the
+game loop can wake up the moment a player hits Enter instead of waiting
+for its next polling tick.
+
+AsyncMudServer keeps the MudServer interface (update, get_commands,
+send_message, ...) so the rest of the game does not care which engine
+is running.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+
+from lib.models.client import Client
+from mudserver import MudServer
+from server.event import Event
+from server.server_enums import MessagePriority, ServerEvents
+from server.socket_client import (
+    OUTPUT_HIGH_WATER, OUTPUT_LOW_WATER, OUTPUT_MAX_BUFFER, skipped_notice,
+    telnet_payload)
+from server.telnet_handler import TelnetParser
+
+log = logging.getLogger(__name__)
+
+
+class AsyncSocketClient(object):
+    """Network state for a player connected through the asyncio engine"""
+
+    def __init__(self, reader, writer, address, buffer, lastcheck):
+        self.reader = reader
+        self.writer = writer
+        self.address = address
+        self.buffer = buffer
+        self.lastcheck = lastcheck
+        self.parser = TelnetParser()
+        # complete lines waiting for the game to run them
+        self.lines = deque()
+        # when the game will next take lines from 'lines'
+        self.next_turn = 0.0
+        # messages sent during this tick, written together by 'write_pending'
+        self.pending = []
+        self.congested = False
+        self.dropped = 0
+        # cleared while the line queue is full to stop reading from the client
+        self.resume_reading = asyncio.Event()
+        self.socket = writer.get_extra_info('socket')
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+
+    def send_to_client(self, message, priority=MessagePriority.NORMAL):
+        """Queue 'message' to go out with the next 'write_pending'."""
+        if self.writer.is_closing():
+            raise ConnectionResetError("client connection is closing")
+        if self.congested and priority == MessagePriority.LOW:
+            self.dropped += 1
+            return
+        self.pending.append(message)
+
+    def write_pending(self) -> bool:
+        """Hands everything queued by 'send_to_client' to the transport
+        as one write.
+        """
+        pieces, self.pending = self.pending, []
+
+        # the transport buffers whatever the socket won't take, so its
+        # backlog drives the same congestion rules as SocketClient.output
+        backlog = self.writer.transport.get_write_buffer_size()
+        if backlog > OUTPUT_MAX_BUFFER:
+            raise ConnectionError(f"{backlog} bytes of output backed up")
+        if backlog > OUTPUT_HIGH_WATER:
+            self.congested = True
+        elif self.congested and backlog < OUTPUT_LOW_WATER:
+            self.congested = False
+            if self.dropped:
+                pieces.insert(0, skipped_notice(self.dropped))
+                self.dropped = 0
+        if not pieces:
+            return True
+
+        data = telnet_payload(pieces)
+        # stream writers must only be touched from the event loop's own
+        # thread, so a send from any other thread is handed over to it
+        if threading.get_ident() == self._loop_thread:
+            self.writer.write(data)
+        else:
+            self._loop.call_soon_threadsafe(self.writer.write, data)
+        return True
+
+    def shutdown(self):
+        self.close()
+
+    def close(self):
+        if threading.get_ident() == self._loop_thread:
+            self.writer.close()
+        else:
+            self._loop.call_soon_threadsafe(self.writer.close)
+
+
+class AsyncMudServer(MudServer):
+    """MudServer driven by asyncio.start_server instead of polling sockets.
+
+    Call 'start' from inside a running event loop, then await
+    'wait_for_events' before each 'update' to sleep until there is input.
+    """
+
+    def __init__(self, interface="0.0.0.0", port=1234, commands_per_tick=None):
+        # deliberately not calling MudServer.__init__, which would open a
+        # polling SocketServer on the same port
+        self._clients = {}
+        self._events = []
+        self._new_events = []
+        self.commands_per_tick = commands_per_tick or self.COMMANDS_PER_TICK
+        self._queued_input = {}
+        self._pending_output = {}
+        self.sends_saved = 0
+        self.total_sends_saved = 0
+        # clients whose reader is waiting for their line queue to drain
+        self._paused = set()
+        self._interface = interface
+        self._port = port
+        self._server = None
+        # created in 'start' so it belongs to the running loop
+        self._queue = None
+        self._loop = None
+        self._loop_thread = None
+
+    async def start(self):
+        """Start listening for new players."""
+        self._queue = asyncio.Queue()
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._server = await asyncio.start_server(
+            self._handle_connection, self._interface, self._port,
+            reuse_address=True
+        )
+        log.info(f"asyncio engine listening on {self._interface}:{self._port}")
+
+    async def wait_for_events(self, timeout=None):
+        """Sleep until at least one event is queued, a player's queued
+        input is due or 'timeout' seconds have passed.
+        """
+        if not self._queue.empty():
+            return
+        timeout = self._input_timeout(timeout)
+        if timeout == 0:
+            return
+        try:
+            event = await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return
+        if event is not None:
+            self._new_events.append(event)
+
+    def update(self, timeout=0):
+        """Moves everything the connection tasks have queued into the
+        events list read by 'get_new_player_events',
+        'get_disconnected_player_events' and 'get_commands'. Never blocks,
+        'timeout' is only accepted for compatibility; await
+        'wait_for_events' to sleep instead.
+        """
+        while not self._queue.empty():
+            event = self._queue.get_nowait()
+            if event is not None:
+                self._new_events.append(event)
+        self._run_queued_input()
+
+        self._events = list(self._new_events)
+        self._new_events = []
+
+    def _wake(self):
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, None)
+
+    def _update_interest(self, client: Client):
+        # the only thing that changes is whether the reader task is paused
+        if client.uuid not in self._paused:
+            client.socket.resume_reading.set()
+
+    def _watch_backlog(self, client: Client):
+        # the transport flushes its own buffer as the socket drains
+        pass
+
+    def shutdown(self):
+        """Closes down the server, disconnecting all clients and
+        closing the listen socket.
+        """
+        self.flush()
+        for cl in list(self._clients.values()):
+            try:
+                cl.socket.close()
+            except RuntimeError:
+                # the event loop has already been torn down
+                pass
+        if self._server:
+            self._server.close()
+
+    async def _handle_connection(self, reader, writer):
+        peer = writer.get_extra_info('peername') or ('', 0)
+        client = Client(AsyncSocketClient(reader, writer, peer[0], "", time.time()))
+        self._clients[client.uuid] = client
+        self._queue.put_nowait(Event(ServerEvents.NEW_PLAYER, client))
+
+        try:
+            while True:
+                data = await reader.read(4096)
+                # an empty read means the other end hung up
+                if not data:
+                    break
+                lines = client.socket.parser.feed(data)
+                if lines:
+                    client.socket.lines.extend(lines)
+                    fresh = client.uuid not in self._queued_input
+                    self._queue_input(client)
+                    # the lines themselves stay on the client, a None on
+                    # the queue just wakes up 'wait_for_events'
+                    if fresh:
+                        self._queue.put_nowait(None)
+                if len(client.socket.lines) >= self.MAX_QUEUED_LINES:
+                    # stop reading until the game catches up, the rest of a
+                    # flood waits in the kernel like it does for the select
+                    # engine
+                    client.socket.resume_reading.clear()
+                    self._paused.add(client.uuid)
+                    await client.socket.resume_reading.wait()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self._handle_disconnect(client)
+            writer.close()
+
+    def _handle_disconnect(self, client: Client):
+        # a failed send and the reader task can both report the same client
+        if client is None or client.uuid not in self._clients:
+            return
+
+        del(self._clients[client.uuid])
+        self._queued_input.pop(client.uuid, None)
+        self._paused.discard(client.uuid)
+        # whatever was sent before the disconnect goes out ahead of the
+        # close, if the connection is still there to take it
+        self._pending_output.pop(client.uuid, None)
+        try:
+            client.socket.write_pending()
+        except (OSError, RuntimeError):
+            pass
+        # let a paused reader task run on to notice the closed connection
+        client.socket.resume_reading.set()
+        client.socket.close()
+
+        # the reader task and failed sends both end up here, so go through
+        # the queue to wake up anyone waiting in 'wait_for_events'
+        self._queue.put_nowait(Event(ServerEvents.PLAYER_LEFT, client))
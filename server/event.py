@@ -9,3 +9,18 @@ class Event:
     client: Client
     command: str = ''
     params: str = ''
+
+
+def command_event(client: Client, message: str) -> Event:
+    """Turn a line of player input into a COMMAND event."""
+    # Handle empty input (just Enter key) as a valid command
+    # Important: preserve empty string for authentication defaults
+    if message == "" or message.strip() == "":
+        # Empty string means just Enter was pressed - this is valid input!
+        return Event(ServerEvents.COMMAND, client, "", "")
+
+    # Non-empty message - process normally
+    message = message.strip()
+    # Normal command with possible parameters
+    command, params = (message.split(" ", 1) + ["", ""])[:2]
+    return Event(ServerEvents.COMMAND, client, command.lower(), params)
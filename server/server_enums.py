@@ -32,3 +32,10 @@ TELNET_OPTION_CODES = (
     TelnetCodes.DO,
     TelnetCodes.DONT
 )
+
+
+# How much a message matters to the player receiving it. LOW messages are
+# the first thing thrown away when a client can't keep up with its output.
+class MessagePriority(Enum):
+    NORMAL = 1
+    LOW = 2
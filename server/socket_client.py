@@ -1,9 +1,47 @@
-import select
-from typing import Optional, Tuple
+import socket
+from collections import deque
 
-from server import telnet_handler
-from server.event import Event
-from server.server_enums import ServerEvents
+from server.server_enums import MessagePriority
+from server.telnet_handler import TelnetParser
+
+# once this much output is waiting the client counts as congested and
+# LOW priority messages are dropped
+OUTPUT_HIGH_WATER = 64 * 1024
+# congestion ends when the backlog drains below this
+OUTPUT_LOW_WATER = 16 * 1024
+# a client this far behind is not coming back, so it gets disconnected
+OUTPUT_MAX_BUFFER = 1024 * 1024
+
+
+def skipped_notice(count):
+    return f"[{count} messages were skipped while your connection caught up]\r\n"
+
+
+def telnet_bytes(text):
+    """Encodes text for the wire with every line ending in telnet's CR LF."""
+    # First normalize to just \n, then convert all to \r\n
+    return bytes(text.replace('\r\n', '\n').replace('\n', '\r\n'), "latin1")
+
+
+def telnet_payload(pieces):
+    """Joins a tick's worth of messages and gives every line a telnet
+    CR LF ending in one pass over the combined text. Pieces that are
+    already bytes came from a broadcast and were encoded up front, so they
+    are copied in as they are.
+    """
+    payload = []
+    text = []
+    for piece in pieces:
+        if type(piece) is bytes:
+            if text:
+                payload.append(telnet_bytes(''.join(text)))
+                text = []
+            payload.append(piece)
+        else:
+            text.append(piece)
+    if text:
+        payload.append(telnet_bytes(''.join(text)))
+    return b''.join(payload)
 
 
 class SocketClient(object):
@@ -14,26 +52,78 @@ class SocketClient(object):
         self.address = address
         self.buffer = buffer
         self.lastcheck = lastcheck
+        self.parser = TelnetParser()
+        # complete lines waiting for the game to run them
+        self.lines = deque()
+        # when the game will next take lines from 'lines'
+        self.next_turn = 0.0
+        # messages sent during this tick, written together by 'write_pending'
+        self.pending = []
+        # bytes the socket would not take yet, sent when it becomes writable
+        self.output = bytearray()
+        self.congested = False
+        # LOW priority messages thrown away while congested
+        self.dropped = 0
 
-    def send_to_client(self, message):
-        self.socket.sendall(bytearray(message, "latin1"))
-
-    def check_for_messages(self, client) -> Event:
-        rlist, wlist, xlist = select.select([self.socket], [], [], 0)
-        if self.socket not in rlist:
+    def send_to_client(self, message, priority=MessagePriority.NORMAL):
+        """Queue 'message' to go out with the next 'write_pending'."""
+        if self.congested and priority == MessagePriority.LOW:
+            self.dropped += 1
             return
-        data = self.socket.recv(4096).decode("latin1")
-        message = telnet_handler.process(data, self.socket.fileno())
-
-        if message is not None:
-            # Handle empty input (just Enter key) as a valid command
-            # Important: preserve empty string for authentication defaults
-            if message == "" or message.strip() == "":
-                # Empty string means just Enter was pressed - this is valid input!
-                return Event(ServerEvents.COMMAND, client, "", "")
-            else:
-                # Non-empty message - process normally
-                message = message.strip()
-                # Normal command with possible parameters
-                command, params = (message.split(" ", 1) + ["", ""])[:2]
-                return Event(ServerEvents.COMMAND, client, command.lower(), params)
\ No newline at end of file
+        self.pending.append(message)
+
+    def write_pending(self) -> bool:
+        """Sends everything queued by 'send_to_client' as one write.
+        Returns True once all output has been sent.
+        """
+        pieces, self.pending = self.pending, []
+        if pieces:
+            self.output += telnet_payload(pieces)
+        return self.flush()
+
+    def flush(self) -> bool:
+        """Writes queued output until the socket would block. Returns True
+        once everything has been sent.
+        """
+        if self.output:
+            try:
+                sent = self.socket.send(self.output)
+            except (BlockingIOError, InterruptedError):
+                sent = 0
+            del self.output[:sent]
+
+        pending = len(self.output)
+        if pending > OUTPUT_MAX_BUFFER:
+            raise ConnectionError(f"{pending} bytes of output backed up")
+        if pending > OUTPUT_HIGH_WATER:
+            self.congested = True
+        elif self.congested and pending < OUTPUT_LOW_WATER:
+            self.congested = False
+            if self.dropped:
+                self.output += bytes(skipped_notice(self.dropped), "latin1")
+                self.dropped = 0
+        return not self.output
+
+    def shutdown(self):
+        self.socket.shutdown(socket.SHUT_RDWR)
+
+    def close(self):
+        self.socket.close()
+
+    def check_for_messages(self) -> int:
+        # Only called once the selector has reported the socket readable,
+        # so there is no need to select() on it again here
+        try:
+            data = self.socket.recv(4096)
+        except (BlockingIOError, InterruptedError):
+            # Spurious wakeup, nothing to read after all
+            return 0
+        if not data:
+            # A readable socket with no data means the other end hung up
+            raise ConnectionResetError("client closed the connection")
+
+        # keep every line in the chunk, MudServer decides how many of them
+        # run each tick
+        lines = self.parser.feed(data)
+        self.lines.extend(lines)
+        return len(lines)
@@ -1,4 +1,4 @@
-import select
+import selectors
 import socket
 import time
 
@@ -7,21 +7,119 @@ from server.socket_client import SocketClient
 
 
 class SocketServer(object):
+    """Listening socket plus the readiness selector for every connection.
+
+    The listener and each client socket are registered with the selector
+    exactly once, so a poll only returns the sockets that actually have
+    pending I/O instead of probing every connection with select().
+    """
+
     def __init__(self, interface, port):
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.socket.bind((interface, port))
         self.socket.setblocking(False)
-        self.socket.listen(1)
+        self.socket.listen(16)
+
+        # epoll on Linux, kqueue on BSD, falls back to select elsewhere
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.socket, selectors.EVENT_READ, None)
+
+        # writing a byte to the other end of this pair interrupts a poll()
+        # that is blocked waiting, see 'wakeup'
+        self._wakeup_reader, self._wakeup_writer = socket.socketpair()
+        self._wakeup_reader.setblocking(False)
+        self._wakeup_writer.setblocking(False)
+        self.selector.register(self._wakeup_reader, selectors.EVENT_READ, self)
+
+    def register_client(self, client):
+        """Start watching a client's socket. The client is handed back by poll()."""
+        self.selector.register(client.socket.socket, selectors.EVENT_READ, client)
+
+    def watch(self, client, reading=True, writing=False):
+        """Choose what poll() reports a client for. Writes are only wanted
+        while the client has a send backlog, and reads are switched off
+        while it has more input queued than the game will take.
+        """
+        events = 0
+        if reading:
+            events |= selectors.EVENT_READ
+        if writing:
+            events |= selectors.EVENT_WRITE
+        sock = client.socket.socket
+        try:
+            if not events:
+                self.selector.unregister(sock)
+                return
+            try:
+                self.selector.modify(sock, events, client)
+            except KeyError:
+                self.selector.register(sock, events, client)
+        except (KeyError, ValueError):
+            # the socket was closed underneath us
+            pass
+
+    def wakeup(self):
+        """Makes a poll() blocked in another thread return straight away."""
+        try:
+            self._wakeup_writer.send(b'\0')
+        except (BlockingIOError, InterruptedError):
+            # a wakeup is already waiting to be read
+            pass
+
+    def unregister_client(self, client):
+        """Stop watching a client's socket."""
+        try:
+            self.selector.unregister(client.socket.socket)
+        except (KeyError, ValueError):
+            # Already unregistered or the socket was closed underneath us
+            pass
+
+    def poll(self, timeout=0):
+        """Wait up to 'timeout' seconds for socket activity.
+
+        Returns a tuple of (listener_ready, ready_clients, writable_clients)
+        where ready_clients only contains clients with data waiting to be
+        read and writable_clients the backlogged clients that can be sent
+        to again.
+        """
+        listener_ready = False
+        ready_clients = []
+        writable_clients = []
+        for key, events in self.selector.select(timeout):
+            if key.data is None:
+                listener_ready = True
+                continue
+            if key.data is self:
+                self._drain_wakeups()
+                continue
+            if events & selectors.EVENT_READ:
+                ready_clients.append(key.data)
+            if events & selectors.EVENT_WRITE:
+                writable_clients.append(key.data)
+        return listener_ready, ready_clients, writable_clients
 
-    def check_for_new_clients(self):
-        rlist, wlist, xlist = select.select([self.socket], [], [], 0)
-        if self.socket not in rlist:
-            return
+    def accept_new_clients(self):
+        """Accept every connection waiting on the listener."""
+        new_clients = []
+        while True:
+            try:
+                joined_socket, addr = self.socket.accept()
+            except (BlockingIOError, InterruptedError):
+                break
+            joined_socket.setblocking(False)
+            new_clients.append(SocketClient(joined_socket, addr[0], "", time.time()))
+        return new_clients
 
-        joined_socket, addr = self.socket.accept()
-        joined_socket.setblocking(False)
-        return SocketClient(joined_socket, addr[0], "", time.time())
+    def _drain_wakeups(self):
+        try:
+            while self._wakeup_reader.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
 
     def close(self):
+        self.selector.close()
+        self._wakeup_reader.close()
+        self._wakeup_writer.close()
         self.socket.close()
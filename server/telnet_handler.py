@@ -1,40 +1,127 @@
-from server.telnet_actions.actions import *
-
-_MAPPINGS = {
-    ReadState.NORMAL: normal_read_state,
-    ReadState.SUBNEG: subneg_read_state,
-    ReadState.COMMAND: command_read_state
-}
-
-# Store buffers per connection to handle partial messages
-_BUFFERS = {}
-
-def process(data, connection_id=None):
-    # the Telnet protocol allows special command codes to be inserted into
-    # messages. For our very simple server we don't need to response to
-    # any of these codes, but we must at least detect and skip over them
-    # so that we don't interpret them as text data.
-    # More info on the Telnet protocol can be found here:
-    # http://pcmicro.com/netfoss/telnet.html
-
-    # start with no message and in the normal state
-    message = None
-    state = ReadState.NORMAL
-
-    # Get or create buffer for this connection
-    if connection_id is None:
-        buffer = []
-    else:
-        if connection_id not in _BUFFERS:
-            _BUFFERS[connection_id] = []
-        buffer = _BUFFERS[connection_id]
-    
-    for character in data:
-        message, state, buffer = _MAPPINGS[state](message, state, buffer, character)
-        if message:
-            # Clear buffer when message is complete
-            if connection_id and connection_id in _BUFFERS:
-                _BUFFERS[connection_id] = []
-            break
-    
-    return message
+import re
+from typing import List
+
+from server.server_enums import TelnetCodes
+
+# the Telnet protocol allows special command codes to be inserted into
+# messages. For our very simple server we don't need to response to
+# any of these codes, but we must at least detect and skip over them
+# so that we don't interpret them as text data.
+# More info on the Telnet protocol can be found here:
+# http://pcmicro.com/netfoss/telnet.html
+
+IAC = TelnetCodes.INTERPRET_AS_COMMAND.value
+SB = TelnetCodes.SUBNEGOTIATION_START.value
+SE = TelnetCodes.SUBNEGOTIATION_END.value
+_OPTION_COMMANDS = frozenset(code.value for code in (
+    TelnetCodes.WILL, TelnetCodes.WONT, TelnetCodes.DO, TelnetCodes.DONT))
+
+_IAC = bytes([IAC])
+_IAC_SE = bytes([IAC, SE])
+
+# telnet clients end lines with CR LF or CR NUL, raw sockets often send a
+# bare LF and some old clients a bare CR. Each counts as one line ending.
+_END_OF_LINE = re.compile(rb'\r\n|\r\0|\r|\n')
+_BACKSPACE = re.compile(rb'[\x08\x7f]')
+
+# give up on a subnegotiation that never ends rather than buffer forever.
+# Its first this many bytes are dropped and what follows is read as usual
+_MAX_PENDING_COMMAND = 4096
+
+
+class TelnetParser(object):
+    """Turns raw bytes from one connection into complete lines of input.
+
+    Works on whole chunks at a time: telnet commands are located with
+    bytes.find and cut out in slices, and lines are split with a single
+    regex, so the cost per read is a handful of C calls rather than a
+    Python call per character. Anything left over at the end of a chunk
+    (an unfinished line or telnet command) is kept for the next 'feed'.
+    """
+
+    def __init__(self):
+        # text received since the last line ending
+        self._partial = b''
+        # the start of a telnet command split across two reads
+        self._pending_command = b''
+        # the last chunk ended in CR, so a leading LF/NUL belongs to it
+        self._after_cr = False
+
+    def feed(self, data: bytes) -> List[str]:
+        """Parse a chunk of input, returning every line it completes."""
+        if self._pending_command:
+            data = self._pending_command + data
+            self._pending_command = b''
+
+        if _IAC in data:
+            data = self._strip_commands(data)
+
+        if self._after_cr and data[:1] in (b'\n', b'\0'):
+            data = data[1:]
+        if data:
+            self._after_cr = data.endswith(b'\r')
+
+        parts = _END_OF_LINE.split(data)
+        if len(parts) == 1:
+            self._partial += data
+            return []
+
+        parts[0] = self._partial + parts[0]
+        self._partial = parts.pop()
+        return [self._clean_line(part) for part in parts]
+
+    def _strip_commands(self, data: bytes) -> bytes:
+        """Removes every IAC sequence from 'data'. An incomplete one at the
+        end is saved in '_pending_command' to be finished by the next read.
+        """
+        text = []
+        position = 0
+        length = len(data)
+        while True:
+            index = data.find(_IAC, position)
+            if index < 0:
+                text.append(data[position:])
+                break
+            text.append(data[position:index])
+
+            if index + 1 >= length:
+                self._pending_command = data[index:]
+                break
+            command = data[index + 1]
+
+            if command == IAC:
+                # an escaped 0xff data byte
+                text.append(_IAC)
+                position = index + 2
+            elif command in _OPTION_COMMANDS:
+                # WILL/WONT/DO/DONT are followed by a single option code
+                if index + 2 >= length:
+                    self._pending_command = data[index:]
+                    break
+                position = index + 3
+            elif command == SB:
+                # options run until IAC SE
+                end = data.find(_IAC_SE, index + 2)
+                if end >= 0:
+                    position = end + 2
+                elif length - index <= _MAX_PENDING_COMMAND:
+                    self._pending_command = data[index:]
+                    break
+                else:
+                    # too long to be real, so the rest is ordinary input
+                    position = index + _MAX_PENDING_COMMAND
+            else:
+                # any other command has no data with it
+                position = index + 2
+
+        return b''.join(text)
+
+    @staticmethod
+    def _clean_line(line: bytes) -> str:
+        if _BACKSPACE.search(line):
+            # apply each backspace to the text typed before it
+            pieces = _BACKSPACE.split(line)
+            line = pieces[0]
+            for piece in pieces[1:]:
+                line = line[:-1] + piece
+        return line.decode('latin1')
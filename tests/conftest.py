@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def in_repo(monkeypatch):
+    # the loaders find lib/ from the working directory, like the mud does
+    monkeypatch.chdir(ROOT)
+
+
+class RecordingServer(object):
+    """Keeps what would have been sent, by client id."""
+
+    def __init__(self):
+        self.sent = []
+
+    def send_message(self, client_id, message, priority=None):
+        self.sent.append((client_id, message))
+
+    def broadcast(self, client_ids, message, priority=None):
+        for client_id in client_ids:
+            self.sent.append((client_id, message))
+
+
+@pytest.fixture
+def game():
+    from lib.models.game_state import GameState
+    from lib.war_system import WarSystem
+    game = GameState(RecordingServer())
+    game.war_system = WarSystem(game)
+    return game
+
+
+@pytest.fixture
+def make_player(game):
+    from lib.models.client import Client
+    from lib.models.entity import Room
+    from lib.models.player import Player
+
+    def make_player(name, location='arena'):
+        if location not in game.rooms:
+            game.rooms[location] = Room(location, f"The {location}.")
+        client = Client(None)
+        player = Player(name=name, client_id=client.uuid)
+        player.client, player.server = client, game.server
+        player.is_ghost = False
+        player._location = location
+        game.rooms[location].inventory.add_item(player)
+        game.add_player(player)
+        return player
+    return make_player
@@ -0,0 +1,38 @@
+import time
+
+from lib.combat import CombatManager
+from lib.models.entity import Room
+
+
+def start_war(game, participants):
+    war = game.war_system
+    war.state = war.WarState.ACTIVE
+    war.war_type = war.WarType.FREE_FOR_ALL
+    war.war_start_time = time.time()
+    war.participants = list(participants)
+    # where the dead go
+    game.rooms['warroom'] = Room('warroom', "The war room.")
+
+
+def test_no_deaths_count_after_the_one_that_ends_the_war(game, make_player):
+    alpha, bravo, charlie, delta = (make_player(name) for name in
+                                    ['Alpha', 'Bravo', 'Charlie', 'Delta'])
+    # only Alpha and Bravo are in the war, so Bravo dying ends it
+    start_war(game, [alpha, bravo])
+    combat = CombatManager(game)
+    combat.engage(alpha, bravo)
+    combat.engage(charlie, delta)
+    for player in (alpha, charlie):
+        player.current_hp = player.max_hp = 10 ** 6
+    for player in (bravo, delta):
+        player.current_hp = 1
+
+    combat.combat_round()
+
+    assert not game.war_system.war_active
+    assert bravo.is_ghost
+    assert not delta.is_ghost
+    assert charlie.inventory.get_item('blood') is None
+    sent = [message for client_id, message in game.server.sent]
+    assert "Alpha has won the war!" in sent
+    assert not any("killed Delta" in message for message in sent)
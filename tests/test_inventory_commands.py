@@ -0,0 +1,48 @@
+from lib.commands.inventory import InventoryCommands
+from lib.models.objects import Blood, Heal
+
+
+def test_use_blood_uses_one_up(game, make_player):
+    player = make_player('Alpha')
+    player.war_class = 'kamikaze'
+    commands = InventoryCommands(game)
+    player.inventory.add_item(Blood('Bob'))
+    player.inventory.add_item(Blood('Bob'))
+
+    player.current_hp = 1
+    commands.use_item(player, 'blood')
+    assert player.current_hp == player.max_hp
+    assert player.inventory.get_item('blood').quantity == 1
+
+    player.current_hp = 1
+    commands.use_item(player, 'blood')
+    assert player.inventory.get_item('blood') is None
+
+    commands.use_item(player, 'blood')
+    assert player.current_hp == player.max_hp
+
+
+def test_blood_nobody_can_use_is_kept(game, make_player):
+    player = make_player('Alpha')
+    commands = InventoryCommands(game)
+    player.inventory.add_item(Blood('Bob'))
+    commands.use_item(player, 'blood')
+    assert player.inventory.get_item('blood').quantity == 1
+
+
+def test_used_heal_is_gone_and_the_rest_of_its_stack_kept(game, make_player):
+    player = make_player('Alpha')
+    commands = InventoryCommands(game)
+    player.inventory.add_item(Heal(50))
+    player.inventory.add_item(Heal(50))
+    commands.use_item(player, 'heal')
+    assert player.inventory.get_item('heal').quantity == 1
+    commands.use_item(player, 'heal')
+    assert player.inventory.get_item('heal') is None
+
+
+def test_blood_inventory_counts_every_blood(make_player):
+    player = make_player('Alpha')
+    for victim in ['Bob', 'Bob', 'Bob', 'Cid']:
+        player.inventory.add_item(Blood(victim))
+    assert sorted(player.blood_inventory) == ['Bob', 'Bob', 'Bob', 'Cid']
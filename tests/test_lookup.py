@@ -0,0 +1,27 @@
+from lib.models.creature import Creature
+from lib.models.objects import Weapon
+
+
+def test_carried_and_room_items_match_the_same_way(game, make_player):
+    player = make_player('Alpha')
+    room = game.rooms['arena']
+    room.inventory.add_item(Weapon('iron sword', 'An iron sword.', 10))
+    player.inventory.add_item(Weapon('iron sword', 'An iron sword.', 10))
+
+    for name in ['iron sword', 'sword', 'sw', 'IRON']:
+        assert room.inventory.find_object(name) is not None
+        assert player.inventory.get_item(name) is not None
+    for name in ['ord', 'n sw', '']:
+        assert room.inventory.find_object(name) is None
+        assert player.inventory.get_item(name) is None
+
+
+def test_creatures_are_filed_apart(game, make_player):
+    player = make_player('Alpha')
+    room = game.rooms['arena']
+    dog = Creature(name='dog')
+    room.inventory.add_item(dog)
+    assert list(room.inventory.get_creatures()) == [dog]
+    assert list(room.inventory.get_players()) == [player]
+    assert room.inventory.find_living('do') is dog
+    assert room.inventory.find_object('dog') is None
@@ -0,0 +1,82 @@
+import socket
+import time
+
+import pytest
+
+from mudserver import MudServer
+
+
+@pytest.fixture
+def server():
+    server = MudServer('127.0.0.1', 0)
+    yield server
+    server.shutdown()
+
+
+def connect(server):
+    """A telnet client connected to 'server', and its Client there."""
+    port = server._server_socket.socket.getsockname()[1]
+    sock = socket.create_connection(('127.0.0.1', port))
+    sock.settimeout(2)
+    deadline = time.time() + 2
+    while not server._clients and time.time() < deadline:
+        server.update(0.05)
+    client, = server._clients.values()
+    return sock, client
+
+
+def read_all(sock):
+    data = b''
+    while True:
+        chunk = sock.recv(4096)
+        if not chunk:
+            return data
+        data += chunk
+
+
+def test_message_sent_before_disconnect_client_is_delivered(server):
+    sock, client = connect(server)
+    server.send_message(client.uuid, "Too many failed attempts. Goodbye.")
+    server.disconnect_client(client.uuid)
+    assert read_all(sock) == b"Too many failed attempts. Goodbye.\r\n"
+    assert client.uuid not in server._clients
+
+
+def test_message_sent_before_disconnect_is_delivered(server):
+    sock, client = connect(server)
+    server.send_message(client.uuid, "Thanks for playing!")
+    server.disconnect(client)
+    assert read_all(sock) == b"Thanks for playing!\r\n"
+    # disconnecting again is harmless
+    server.disconnect(client)
+
+
+
+def test_disconnect_survives_a_failed_write(server):
+    sock, client = connect(server)
+
+    def write_pending():
+        raise ConnectionResetError("gone")
+    client.socket.write_pending = write_pending
+    server.send_message(client.uuid, "Goodbye.")
+    server.disconnect(client)
+    assert client.uuid not in server._clients
+    assert read_all(sock) == b""
+
+
+def test_one_command_a_packet_is_still_paced(server):
+    sock, client = connect(server)
+    commands = []
+    for n in range(3):
+        sock.sendall(f"say {n}\r\n".encode())
+        deadline = time.time() + 1
+        while len(commands) <= n and time.time() < deadline:
+            server.update(0.01)
+            commands.extend(event.command for event in server.get_commands())
+    assert len(commands) == 3
+    start = time.time()
+    sock.sendall(b"say again\r\n")
+    while len(commands) < 4:
+        server.update(1)
+        commands.extend(event.command for event in server.get_commands())
+    assert time.time() - start >= MudServer.INPUT_INTERVAL * 0.5
@@ -0,0 +1,69 @@
+from lib.models.objects import Weapon
+from lib.object_loader import ObjectLoader
+
+
+def make_loader():
+    loader = ObjectLoader()
+    loader.load_all_objects()
+    return loader
+
+
+def test_templates_are_not_run_at_load():
+    loader = make_loader()
+    assert loader.object_templates
+    assert loader.prototypes == {}
+
+
+def test_gerkins_get_their_own_cooldowns():
+    loader = make_loader()
+    cooldowns = {loader.create_object('spirit_of_gerkin').power_cooldown
+                 for _ in range(20)}
+    assert loader.prototypes['spirit_of_gerkin'] is None
+    assert len(cooldowns) > 1
+
+
+def test_random_factory_gets_no_prototype():
+    loader = make_loader()
+    damages = iter(range(1000))
+    loader.object_templates['odd sword'] = lambda: Weapon('sword', 'A sword.', next(damages))
+    swords = [loader.create_object('odd sword') for _ in range(3)]
+    assert loader.prototypes['odd sword'] is None
+    assert len({sword.damage for sword in swords}) == 3
+
+
+def test_plain_templates_share_a_prototype():
+    loader = make_loader()
+    first = loader.create_object('iron_sword')
+    second = loader.create_object('iron_sword')
+    assert loader.prototypes['iron_sword'] is not None
+    assert first._proto is second._proto
+    assert first.name == second.name
+
+
+def test_new_kinds_of_object_share_a_prototype_unless_they_opt_out():
+    from lib.models.objects import GameObject
+    from lib.objects.special.gerkin import SpiritOfGerkin
+
+    class Lantern(GameObject):
+        pass
+
+    loader = make_loader()
+    loader.object_templates['lantern'] = lambda: Lantern('lantern', 'A lantern.')
+    assert loader.create_object('lantern')._proto is not None
+    assert not SpiritOfGerkin.prototype
+
+
+def test_copies_keep_the_prototype_and_their_own_changes():
+    import copy
+    import pickle
+
+    loader = make_loader()
+    sword = loader.create_object('iron_sword')
+    sword.damage = 99
+    sword.id
+    for other in (copy.copy(sword), copy.deepcopy(sword),
+                  pickle.loads(pickle.dumps(sword))):
+        assert other._id is None
+        assert other.damage == 99
+        assert other.name == sword.name
+        assert other._proto is not None
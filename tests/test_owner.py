@@ -0,0 +1,65 @@
+import pickle
+
+from lib.commands.wizard import WizardCommands
+from lib.models.objects import Armor, ArmorSlot, Blood, Container, Weapon
+
+
+def test_owner_follows_the_item(game, make_player):
+    player = make_player('Alpha')
+    room = game.rooms['arena']
+    sword = Weapon('sword', 'A sword.', 10)
+
+    room.inventory.add_item(sword)
+    assert sword.owner is room
+    room.inventory.remove_item(sword)
+    player.inventory.add_item(sword)
+    assert sword.owner is player
+
+    bag = Container('bag', 'A bag.')
+    player.inventory.remove_item(sword)
+    assert sword.owner is None
+    bag.add_item(sword)
+    assert sword.owner is bag
+
+
+def test_unpickled_room_owns_its_objects(game, make_player):
+    make_player('Alpha')
+    room = game.rooms['arena']
+    room.inventory.add_item(Weapon('sword', 'A sword.', 10))
+    copy = pickle.loads(pickle.dumps(room))
+    sword = next(iter(copy.inventory.get_objects()))
+    assert sword.owner is copy
+
+
+def test_dest_by_id_finds_the_holder(game, make_player):
+    wizard = make_player('Wizard')
+    wizard.implementor_level = 5
+    victim = make_player('Victim', 'elsewhere')
+    commands = WizardCommands(game)
+
+    helmet = Armor('helmet', 'A helmet.', 2, ArmorSlot.HEAD)
+    victim.inventory.add_item(helmet)
+    victim.inventory.equip_item(helmet, 'head')
+    assert helmet.owner is victim
+    commands.wiz_dest(wizard, f"#{helmet.id}")
+    assert victim.inventory.equipment['head'] is None
+    assert helmet.owner is None
+
+    sword = Weapon('sword', 'A sword.', 10)
+    game.rooms['elsewhere'].inventory.add_item(sword)
+    commands.wiz_dest(wizard, f"#{sword.id}")
+    assert not game.rooms['elsewhere'].inventory.has_item(sword)
+
+
+def test_licked_blood_leaves_the_inventory(make_player):
+    player = make_player('Alpha')
+    player.war_class = 'kamikaze'
+    player.inventory.add_item(Blood('Bob'))
+    player.inventory.add_item(Blood('Bob'))
+    blood = player.inventory.get_item('blood')
+    assert blood.quantity == 2
+
+    ok, message = blood.use(player)
+    assert ok
+    assert blood.quantity == 1
+    assert player.inventory.stacks[blood.name] == 1
@@ -0,0 +1,34 @@
+from lib.models.entity import Room
+from lib.room_registry import Area, RoomRegistry
+
+
+class AreaLoader(object):
+    """Makes one room for each name an area's files list."""
+
+    def load_area_files(self, files):
+        return [Room(name, f"The {name}.") for name in files]
+
+
+def make_registry():
+    registry = RoomRegistry(AreaLoader())
+    registry['entrance'] = Room('entrance', "The entrance.")
+    for area_name in ['forest', 'caves']:
+        names = [f"{area_name}_{n}" for n in range(5)]
+        registry.add_area(Area(area_name, names), names)
+    return registry
+
+
+def test_reading_rooms_while_iterating_names():
+    registry = make_registry()
+    seen = [registry[name].name for name in registry]
+    assert sorted(seen) == sorted(registry)
+    assert len(seen) == 11
+
+
+def test_rooms_gone_from_the_files_leave_the_manifest():
+    registry = make_registry()
+    registry.areas['forest'].files = ['forest_0', 'forest_1']
+    registry['forest_0']
+    assert 'forest_0' in registry
+    assert 'forest_4' not in registry
+    assert registry.areas['forest'].rooms == ['forest_0', 'forest_1']
@@ -0,0 +1,27 @@
+from lib.models.creature import Creature
+from lib.models.objects import Weapon
+from lib.souls import SoulManager
+
+
+def sent_to(game, player):
+    return [message for client_id, message in game.server.sent
+            if client_id == player.client.uuid]
+
+
+def test_souls_reach_creatures_and_things_as_well_as_players(game, make_player):
+    alpha = make_player('Alpha')
+    bravo = make_player('Bravo')
+    room = game.rooms['arena']
+    room.inventory.add_item(Creature(name='dog'))
+    room.inventory.add_item(Weapon('iron sword', 'An iron sword.', 10))
+    souls = SoulManager(game)
+
+    souls.execute_soul(alpha, 'wink', 'bravo')
+    assert "You wink at Bravo." in sent_to(game, alpha)[-1]
+    souls.execute_soul(alpha, 'wink', 'dog')
+    assert "You wink at dog." in sent_to(game, alpha)[-1]
+    assert "at dog." in sent_to(game, bravo)[-1]
+    souls.execute_soul(alpha, 'wink', 'sword')
+    assert "You wink at iron sword." in sent_to(game, alpha)[-1]
+    souls.execute_soul(alpha, 'wink', 'cat')
+    assert "You don't see 'cat' here." in sent_to(game, alpha)[-1]
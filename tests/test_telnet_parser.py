@@ -0,0 +1,26 @@
+from server.telnet_handler import IAC, SB, SE, TelnetParser, _MAX_PENDING_COMMAND
+
+
+def test_subnegotiation_is_removed():
+    parser = TelnetParser()
+    data = b'lo' + bytes([IAC, SB, 24, 0]) + b'vt100' + bytes([IAC, SE]) + b'ok\r\n'
+    assert parser.feed(data) == ['look']
+
+
+def test_subnegotiation_split_across_reads():
+    parser = TelnetParser()
+    assert parser.feed(b'say hi' + bytes([IAC, SB, 24]) + b'vt') == []
+    assert parser.feed(b'100' + bytes([IAC, SE]) + b'\r\n') == ['say hi']
+
+
+def test_text_after_an_oversized_subnegotiation_is_kept():
+    parser = TelnetParser()
+    junk = bytes([IAC, SB]) + b'\0' * (_MAX_PENDING_COMMAND - 2)
+    assert parser.feed(b'north\r\n' + junk) == ['north']
+    assert parser.feed(b'look\r\nsay hi\r\n') == ['look', 'say hi']
+
+
+def test_oversized_subnegotiation_in_one_read():
+    parser = TelnetParser()
+    junk = bytes([IAC, SB]) + b'\0' * (_MAX_PENDING_COMMAND - 2)
+    assert parser.feed(junk + b'look\r\n') == ['look']
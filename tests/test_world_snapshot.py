@@ -0,0 +1,46 @@
+import os
+
+from lib.world_snapshot import WorldSnapshot
+
+ROOM_FILE = 'lib/rooms/square.py'
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+def boot(path='world.snapshot'):
+    snapshot = WorldSnapshot(path)
+    snapshot.load()
+    return snapshot
+
+
+def make_tree(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write('lib/__init__.py', '')
+    write('lib/util/__init__.py', '')
+    write('lib/util/text.py', 'BANNER = "Welcome"\n')
+    write('lib/util/rooms.py', 'from lib.util.text import BANNER\n')
+    write(ROOM_FILE, 'import os\nfrom lib.util import rooms\n\ndef load():\n    pass\n')
+    snapshot = boot()
+    snapshot.put(ROOM_FILE, ['square'])
+    snapshot.save()
+
+
+def test_unchanged_room_file_comes_from_the_snapshot(tmp_path, monkeypatch):
+    make_tree(tmp_path, monkeypatch)
+    assert boot().get(ROOM_FILE) == ['square']
+
+
+def test_changed_helper_reloads_the_room_file(tmp_path, monkeypatch):
+    make_tree(tmp_path, monkeypatch)
+    write('lib/util/rooms.py', 'from lib.util.text import BANNER\nEXTRA = 1\n')
+    assert boot().get(ROOM_FILE) is None
+
+
+def test_changed_helper_of_a_helper_reloads_the_room_file(tmp_path, monkeypatch):
+    make_tree(tmp_path, monkeypatch)
+    write('lib/util/text.py', 'BANNER = "Welcome back"\n')
+    assert boot().get(ROOM_FILE) is None
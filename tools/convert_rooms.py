@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""Convert Python room files to a JSON area file.
+
+Loads every room file in a directory and writes the plain ones - a Room
+with text, items, exits and simple attributes - into one JSON area file
+(see lib/room_format.py). Rooms with custom behaviour, such as their own
+Room subclass, are reported and left as Python. Each room is checked to
+come back out of JSON exactly as it went in before it is written.
+
+Run from the top of the tree:
+
+    python tools/convert_rooms.py [directory] [--output FILE] [--remove]
+
+The directory defaults to lib/rooms and the output to <directory>/<name>.json.
+Rooms already in the output file are kept unless a converted room has the
+same name. --remove deletes the Python files that were converted, without
+it the same rooms would be loaded twice.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lib.room_format import room_from_dict, room_to_dict  # noqa: E402
+from lib.room_loader import RoomLoader  # noqa: E402
+
+
+def convert(directory):
+    """Returns the JSON entries by room name and the files they came from."""
+    loader = RoomLoader(snapshot_path=None)
+    entries = {}
+    converted = []
+    for item in sorted(os.listdir(directory)):
+        filepath = os.path.join(directory, item)
+        if not item.endswith('.py') or item == '__init__.py' or not os.path.isfile(filepath):
+            continue
+        try:
+            rooms = loader._load_file(filepath)
+        except Exception as e:
+            print(f"  skipped {filepath}: does not load ({e})")
+            continue
+        if not rooms:
+            print(f"  skipped {filepath}: no room")
+            continue
+
+        try:
+            file_entries = [room_to_dict(room) for room in rooms]
+        except ValueError as e:
+            print(f"  kept {filepath}: {e}")
+            continue
+        if any(room_to_dict(room_from_dict(entry)) != entry for entry in file_entries):
+            print(f"  kept {filepath}: does not survive a round trip through JSON")
+            continue
+
+        for entry in file_entries:
+            entries[entry['name']] = entry
+        converted.append(filepath)
+        print(f"  converted {filepath}")
+    return entries, converted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert Python room files to a JSON area file")
+    parser.add_argument('directory', nargs='?', default='lib/rooms')
+    parser.add_argument('--output', help="JSON file to write (default <directory>/<name>.json)")
+    parser.add_argument('--remove', action='store_true',
+                        help="delete the Python files that were converted")
+    args = parser.parse_args()
+
+    directory = args.directory.rstrip('/')
+    output = args.output or os.path.join(
+        directory, os.path.basename(os.path.abspath(directory)) + '.json')
+    logging.basicConfig(level=logging.ERROR)
+
+    existing = {}
+    if os.path.exists(output):
+        with open(output, encoding='utf-8') as f:
+            existing = {entry['name']: entry for entry in json.load(f)['rooms']}
+
+    print(f"Converting {directory}")
+    entries, converted = convert(directory)
+    if not converted:
+        print("Nothing to convert")
+        return
+
+    existing.update(entries)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'rooms': list(existing.values())}, f, indent=4, ensure_ascii=False)
+        f.write('\n')
+    print(f"Wrote {len(existing)} rooms to {output}")
+
+    if args.remove:
+        for filepath in converted:
+            os.remove(filepath)
+        print(f"Removed {len(converted)} Python files")
+
+
+if __name__ == '__main__':
+    main()